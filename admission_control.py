@@ -0,0 +1,110 @@
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+# Relative cost of each kind of work, in "question units"
+COST_MODEL = {
+    'generate': {'base': 1, 'per_question': 1},
+    'page': {'base': 1, 'per_question': 1},
+    'summary': {'base': 2, 'per_question': 1},
+    'docx': {'base': 50, 'per_question': 0}
+}
+
+
+def estimate_cost(endpoint: str, count: int = 0) -> int:
+    """Estimate how much CPU work a request will take from its question count"""
+    model = COST_MODEL[endpoint]
+    return model['base'] + model['per_question'] * max(0, count)
+
+
+class RejectedRequest(Exception):
+    """Raised when a request is shed instead of queued"""
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Admits CPU-heavy work into a bounded worker pool or sheds it.
+
+    A request is rejected up front when its endpoint is already at its
+    concurrency limit, or when the cost already admitted (running plus
+    queued) would exceed max_pending_cost. Admitted work runs on a fixed
+    number of worker threads, so overload shows up as quick 429s with a
+    Retry-After estimate instead of every request slowing down together.
+    """
+    def __init__(self, max_workers: int = 4, max_pending_cost: int = 5000,
+                 endpoint_limits: Optional[Dict[str, int]] = None):
+        self.max_workers = max_workers
+        self.max_pending_cost = max_pending_cost
+        self.endpoint_limits = endpoint_limits or {'generate': 16, 'page': 32, 'summary': 8, 'docx': 2}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='admitted')
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.pending_cost = 0
+        self.rejected = {}
+        self.completed = 0
+        # Smoothed throughput in cost units per second, used for Retry-After
+        self.cost_per_second = None
+
+    def _retry_after(self) -> int:
+        rate = self.cost_per_second or self.max_workers * 100
+        return max(1, math.ceil(self.pending_cost / rate))
+
+    def _reject(self, endpoint: str, reason: str):
+        self.rejected[endpoint] = self.rejected.get(endpoint, 0) + 1
+        raise RejectedRequest(reason, self._retry_after())
+
+    def run(self, endpoint: str, cost: int, fn, *args, **kwargs):
+        """Run fn on the worker pool if admitted, or raise RejectedRequest"""
+        with self.lock:
+            limit = self.endpoint_limits.get(endpoint)
+            if limit is not None and self.in_flight.get(endpoint, 0) >= limit:
+                self._reject(endpoint, f"Too many concurrent {endpoint} requests")
+            # A single request larger than the whole budget still runs when idle
+            if self.pending_cost and self.pending_cost + cost > self.max_pending_cost:
+                self._reject(endpoint, "Server is at capacity")
+            self.in_flight[endpoint] = self.in_flight.get(endpoint, 0) + 1
+            self.pending_cost += cost
+
+        def timed():
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = max(time.perf_counter() - start, 1e-6)
+                with self.lock:
+                    rate = cost / elapsed * self.max_workers
+                    if self.cost_per_second is None:
+                        self.cost_per_second = rate
+                    else:
+                        self.cost_per_second = 0.8 * self.cost_per_second + 0.2 * rate
+
+        try:
+            return self.executor.submit(timed).result()
+        finally:
+            with self.lock:
+                self.in_flight[endpoint] -= 1
+                self.pending_cost -= cost
+                self.completed += 1
+
+    def busy(self) -> bool:
+        """True while any admitted work is running or queued"""
+        with self.lock:
+            return self.pending_cost > 0
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                'max_workers': self.max_workers,
+                'pending_cost': self.pending_cost,
+                'max_pending_cost': self.max_pending_cost,
+                'in_flight': {k: v for k, v in self.in_flight.items() if v},
+                'endpoint_limits': dict(self.endpoint_limits),
+                'rejected': dict(self.rejected),
+                'completed': self.completed,
+                'cost_per_second': self.cost_per_second
+            }
@@ -0,0 +1,107 @@
+"""
+Persistent memoization of per-question quality analyses.
+
+    cache = AnalysisCache()
+    report = generate_analytics_report(questions, cache=cache)
+
+Analyses are stored in a SQLite file keyed by a hash of the question's
+content, so re-running a report over an unchanged bank only looks them
+up; new or edited questions are analyzed and added. Each row records the
+ANALYTICS_VERSION it was computed under, and rows from other versions are
+dropped when the cache is opened.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from question_analytics import ANALYTICS_VERSION, QuestionAnalytics
+
+# Volatile fields that don't change what a question is
+_IGNORED_FIELDS = ('timestamp',)
+
+# Keys per SELECT, under SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+
+
+def analysis_key(q_data: Dict) -> str:
+    """Content hash of a question, ignoring timestamps"""
+    if any(field in q_data for field in _IGNORED_FIELDS):
+        q_data = {k: v for k, v in q_data.items() if k not in _IGNORED_FIELDS}
+    # ASCII escapes keep the encoder on its fastest path; the key only has to be stable
+    encoded = json.dumps(q_data, sort_keys=True, separators=(',', ':'), default=str).encode('ascii')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class AnalysisCache:
+    """Per-question analyses persisted in SQLite, invalidated by ANALYTICS_VERSION"""
+    def __init__(self, path: str = 'analysis_cache.sqlite', version: int = ANALYTICS_VERSION):
+        self.path = path
+        self.version = version
+        self.analyzer = QuestionAnalytics()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.db:
+            self.db.execute('CREATE TABLE IF NOT EXISTS analyses '
+                            '(key TEXT PRIMARY KEY, version INTEGER NOT NULL, analysis TEXT NOT NULL)')
+            self.db.execute('DELETE FROM analyses WHERE version != ?', (version,))
+
+    def _lookup(self, keys: List[str]) -> Dict[str, str]:
+        found = {}
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start:start + _LOOKUP_CHUNK]
+            rows = self.db.execute(
+                f"SELECT key, analysis FROM analyses WHERE version = ? AND key IN ({','.join('?' * len(chunk))})",
+                [self.version] + chunk)
+            found.update(rows)
+        return found
+
+    def analyze(self, q_data: Dict) -> Dict:
+        """Quality analysis of one question, from the cache when possible"""
+        return self.analyze_many([q_data])[0]
+
+    def analyze_many(self, questions: Iterable[Dict]) -> List[Dict]:
+        """Quality analyses for a batch, computing and storing only the misses"""
+        questions = list(questions)
+        keys = [analysis_key(q) for q in questions]
+        with self.lock:
+            stored = self._lookup(list(set(keys)))
+            added = {}
+            for q, key in zip(questions, keys):
+                if key in stored:
+                    continue
+                analysis = self.analyzer.analyze_question_quality(q)
+                analysis.pop('timestamp')
+                stored[key] = added[key] = json.dumps(analysis)
+            if added:
+                with self.db:
+                    self.db.executemany('INSERT OR REPLACE INTO analyses VALUES (?, ?, ?)',
+                                        [(key, self.version, text) for key, text in added.items()])
+            self.misses += len(added)
+            self.hits += len(keys) - len(added)
+
+        # Cached analyses are stamped like fresh ones; each caller gets its own dicts
+        timestamp = datetime.now().isoformat()
+        analyses = []
+        for key in keys:
+            analysis = json.loads(stored[key])
+            analysis['timestamp'] = timestamp
+            analyses.append(analysis)
+        return analyses
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.db.execute('SELECT COUNT(*) FROM analyses').fetchone()[0]
+
+    def clear(self):
+        with self.lock, self.db:
+            self.db.execute('DELETE FROM analyses')
+
+    def close(self):
+        with self.lock:
+            self.db.close()
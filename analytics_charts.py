@@ -0,0 +1,257 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+# Larger banks are cut down for the heatmap; a bigger grid is unreadable anyway
+MAX_HEATMAP_QUESTIONS = 50
+
+CHART_NAMES = ('similarity_heatmap', 'readability_histogram', 'engagement_histogram',
+               'difficulty_distribution')
+
+_MANIFEST = 'charts.json'
+_KEY_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+
+def chart_payload(analytics: Dict, similarity_report: Optional[Dict] = None,
+                  questions: Optional[List[Dict]] = None) -> Dict:
+    """Extract the data the charts are drawn from.
+
+    Timestamps are left out, so re-running a report over the same bank
+    produces the same payload and hits the cache. Without a similarity
+    report, the questions are passed along and compared in the worker.
+    """
+    analyses = analytics['individual_analyses']
+    payload = {
+        'readability': [a['readability_score'] for a in analyses],
+        'engagement': [a['engagement_score'] for a in analyses],
+        'difficulty_distribution': analytics['summary']['difficulty_distribution'],
+        'similarity_matrix': None,
+        'questions': None
+    }
+
+    n = min(analytics['summary']['total_questions'], MAX_HEATMAP_QUESTIONS)
+    if similarity_report is not None:
+        matrix = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+        for r in similarity_report['individual_comparisons']:
+            i, j = r['question_pair']
+            if i <= n and j <= n:
+                matrix[i - 1][j - 1] = matrix[j - 1][i - 1] = r['overall_similarity']
+        payload['similarity_matrix'] = matrix
+    elif questions is not None:
+        keys = ('question', 'table', 'difficulty', 'topic', 'options')
+        payload['questions'] = [{k: q[k] for k in keys if k in q} for q in questions[:n]]
+    return payload
+
+
+def payload_key(payload: Dict) -> str:
+    """Content hash identifying a chart set"""
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _save(fig, path: str):
+    tmp_path = path + '.tmp'
+    fig.savefig(tmp_path, format='png', dpi=100, bbox_inches='tight')
+    os.replace(tmp_path, path)
+
+
+def render_chart_set(payload: Dict, out_dir: str) -> Dict[str, str]:
+    """Render every chart for a payload into out_dir (runs in a worker process)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    os.makedirs(out_dir, exist_ok=True)
+    charts = {}
+
+    matrix = payload['similarity_matrix']
+    if matrix is None and payload['questions'] is not None:
+        from similarity_checker import QuestionSimilarityChecker
+        questions = payload['questions']
+        report = QuestionSimilarityChecker().batch_similarity_check(questions)
+        n = len(questions)
+        matrix = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+        for r in report['individual_comparisons']:
+            i, j = r['question_pair']
+            matrix[i - 1][j - 1] = matrix[j - 1][i - 1] = r['overall_similarity']
+    if matrix and len(matrix) >= 2:
+        fig, ax = plt.subplots(figsize=(6, 5))
+        image = ax.imshow(matrix, cmap='Reds', vmin=0, vmax=1)
+        fig.colorbar(image, ax=ax, label='Overall similarity')
+        ticks = range(len(matrix))
+        ax.set_xticks(ticks, [str(t + 1) for t in ticks], fontsize=7)
+        ax.set_yticks(ticks, [str(t + 1) for t in ticks], fontsize=7)
+        ax.set_title('Question Similarity')
+        charts['similarity_heatmap'] = os.path.join(out_dir, 'similarity_heatmap.png')
+        _save(fig, charts['similarity_heatmap'])
+        plt.close(fig)
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.hist(payload['readability'], bins=10, range=(0, 100), color='#22c55e', edgecolor='white')
+    ax.set_xlabel('Flesch Reading Ease')
+    ax.set_ylabel('Questions')
+    ax.set_title('Readability')
+    charts['readability_histogram'] = os.path.join(out_dir, 'readability_histogram.png')
+    _save(fig, charts['readability_histogram'])
+    plt.close(fig)
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.hist(payload['engagement'], bins=10, range=(0, 1), color='#a855f7', edgecolor='white')
+    ax.set_xlabel('Engagement score')
+    ax.set_ylabel('Questions')
+    ax.set_title('Engagement')
+    charts['engagement_histogram'] = os.path.join(out_dir, 'engagement_histogram.png')
+    _save(fig, charts['engagement_histogram'])
+    plt.close(fig)
+
+    levels = ['easy', 'moderate', 'hard']
+    distribution = payload['difficulty_distribution']
+    levels += sorted(d for d in distribution if d not in levels)
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.bar(levels, [distribution.get(d, 0) for d in levels], color='#3b82f6')
+    ax.set_ylabel('Questions')
+    ax.set_title('Difficulty Distribution')
+    charts['difficulty_distribution'] = os.path.join(out_dir, 'difficulty_distribution.png')
+    _save(fig, charts['difficulty_distribution'])
+    plt.close(fig)
+
+    # The manifest is written last, so its presence marks a complete chart set
+    with open(os.path.join(out_dir, _MANIFEST + '.tmp'), 'w') as f:
+        json.dump(sorted(charts), f)
+    os.replace(os.path.join(out_dir, _MANIFEST + '.tmp'), os.path.join(out_dir, _MANIFEST))
+    return charts
+
+
+class ChartQueueFull(RuntimeError):
+    """Raised when too many chart sets are already waiting to render"""
+
+
+class ChartRenderer:
+    """Renders analytics charts in a worker process pool, cached by content hash.
+
+    The cache keeps the max_cached_sets most recently rendered or viewed
+    chart sets on disk, at most max_pending renders are queued at once
+    and only the latest max_failures errors are remembered.
+    """
+    def __init__(self, cache_dir: str = 'chart_cache', max_workers: int = 2, max_cached_sets: int = 500,
+                 max_pending: int = 32, max_failures: int = 256):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.max_cached_sets = max_cached_sets
+        self.max_pending = max_pending
+        self.max_failures = max_failures
+        self.executor = None
+        self.pending = {}
+        self.failed = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            # Spawned workers don't inherit the web server's threads and locks
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                mp_context=multiprocessing.get_context('spawn'))
+        return self.executor
+
+    def chart_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def cached_charts(self, key: str) -> Optional[Dict[str, str]]:
+        """Return the chart paths for a key if the set has been rendered"""
+        out_dir = self.chart_dir(key)
+        try:
+            with open(os.path.join(out_dir, _MANIFEST)) as f:
+                names = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return {name: os.path.join(out_dir, f"{name}.png") for name in names}
+
+    def _submit(self, payload: Dict):
+        key = payload_key(payload)
+        with self.lock:
+            future = self.pending.get(key)
+            if future is not None:
+                return key, future
+            if self.cached_charts(key) is not None:
+                self._touch(key)
+                return key, None
+            if len(self.pending) >= self.max_pending:
+                raise ChartQueueFull(f"{len(self.pending)} chart sets already queued")
+            self.failed.pop(key, None)
+            future = self._get_executor().submit(render_chart_set, payload, self.chart_dir(key))
+            self.pending[key] = future
+        future.add_done_callback(lambda f: self._finished(key, f))
+        return key, future
+
+    def submit(self, payload: Dict) -> str:
+        """Queue a chart set for rendering and return its key without waiting.
+
+        Raises ChartQueueFull when max_pending renders are already queued.
+        """
+        return self._submit(payload)[0]
+
+    def _finished(self, key: str, future):
+        with self.lock:
+            self.pending.pop(key, None)
+            # A cancelled render leaves the key 'unknown' so it can be resubmitted
+            if not future.cancelled() and future.exception() is not None:
+                self.failed[key] = str(future.exception())
+                while len(self.failed) > self.max_failures:
+                    self.failed.popitem(last=False)
+            self._evict()
+
+    def _touch(self, key: str):
+        # A viewed set counts as recently used for eviction
+        try:
+            os.utime(os.path.join(self.chart_dir(key), _MANIFEST))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Remove the least recently used chart sets beyond max_cached_sets"""
+        try:
+            names = [name for name in os.listdir(self.cache_dir)
+                     if _KEY_PATTERN.fullmatch(name) and name not in self.pending]
+        except OSError:
+            return
+        if len(names) <= self.max_cached_sets:
+            return
+        used = {}
+        for name in names:
+            out_dir = self.chart_dir(name)
+            try:
+                used[name] = os.path.getmtime(os.path.join(out_dir, _MANIFEST))
+            except OSError:
+                # Left behind by a failed or interrupted render
+                used[name] = os.path.getmtime(out_dir) if os.path.exists(out_dir) else 0
+        for name in sorted(used, key=used.get)[:len(used) - self.max_cached_sets]:
+            shutil.rmtree(self.chart_dir(name), ignore_errors=True)
+
+    def status(self, key: str) -> str:
+        """Return 'ready', 'pending', 'failed' or 'unknown' for a chart set"""
+        if self.cached_charts(key) is not None:
+            return 'ready'
+        with self.lock:
+            if key in self.pending:
+                return 'pending'
+            if key in self.failed:
+                return 'failed'
+        return 'unknown'
+
+    def render(self, payload: Dict, timeout: float = 120) -> Dict[str, str]:
+        """Render a chart set (or reuse the cached one) and wait for the paths"""
+        key, future = self._submit(payload)
+        if future is not None:
+            future.result(timeout=timeout)
+        return self.cached_charts(key) or {}
+
+    def shutdown(self, cancel_pending: bool = False):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=cancel_pending)
+            self.executor = None
@@ -0,0 +1,479 @@
+import re
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def _parse_number(text: str) -> float:
+    """Parse a plain numeric option, returning NaN when it is not a number"""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _parse_fraction(text: str) -> Tuple[float, float]:
+    """Parse "a/b", a decimal or a whole number as (numerator, denominator).
+
+    A written fraction keeps its terms as given, so 25/100 and 1/4 differ;
+    decimals and whole numbers are reduced.
+    """
+    text = str(text).strip().rstrip('%')
+    try:
+        if '/' in text:
+            num, den = text.split('/')
+            return (float(int(num)), float(int(den)))
+        value = Fraction(text)
+        return (float(value.numerator), float(value.denominator))
+    except (ValueError, ZeroDivisionError):
+        return (float('nan'),) * 2
+
+
+def _parse_dimensions(text: str) -> Tuple[float, float, float]:
+    """Parse an "L × W × H" option into three floats (NaN when malformed)"""
+    parts = str(text).split('×')
+    if len(parts) != 3:
+        return (float('nan'),) * 3
+    return tuple(_parse_number(p.strip()) for p in parts)
+
+
+class TopicSolver(ABC):
+    """Re-solves every question of one topic from its parameters.
+
+    Subclasses compile their patterns once at construction time, pull the
+    parameters out of each question in ``extract`` and compute the answers
+    for the whole batch at once in ``solve``.
+    """
+    topic = ''
+    answer_width = 1
+
+    def cache_key(self, question: Dict) -> str:
+        """Return the question text the parameters are read from"""
+        return question.get('question', '')
+
+    @abstractmethod
+    def extract(self, question: Dict) -> Optional[Tuple]:
+        """Return the solver parameters of a question, or None if unreadable"""
+
+    @abstractmethod
+    def solve(self, params: np.ndarray) -> np.ndarray:
+        """Compute answers of shape (N, answer_width) from stacked parameters"""
+
+    def parse_option(self, text: str) -> Tuple:
+        return (_parse_number(text),)
+
+    def explanation_values(self, question: Dict) -> Optional[Tuple]:
+        """Return the answer the explanation states, or None if not stated"""
+        return None
+
+    def verify(self, questions: List[Dict]) -> List[List[str]]:
+        """Return the list of issues found for each question in the batch"""
+        issues = [[] for _ in questions]
+        params, rows = [], []
+        extracted = {}
+        for i, q in enumerate(questions):
+            key = self.cache_key(q)
+            if key not in extracted:
+                extracted[key] = self.extract(q)
+            p = extracted[key]
+            if p is None:
+                issues[i].append('parameters could not be extracted')
+            else:
+                params.append(p)
+                rows.append(i)
+        if not rows:
+            return issues
+
+        answers = self.solve(np.array(params, dtype=float))
+        batch = [questions[i] for i in rows]
+        n, width = len(batch), self.answer_width
+
+        # Option values, flattened and padded with NaN so ragged option lists
+        # still stack; banks repeat option texts heavily, so each distinct
+        # text is parsed once
+        max_options = max(1, max(len(q.get('options', [])) for q in batch))
+        missing = (float('nan'),) * width
+        parsed = {}
+        values, marked, stated = [], [], []
+        for q in batch:
+            options = q.get('options', [])
+            correct = q.get('correct')
+            index = -1
+            for j, (letter, option) in enumerate(options):
+                v = parsed.get(option)
+                if v is None:
+                    v = parsed[option] = self.parse_option(option)
+                values.extend(v)
+                if letter == correct:
+                    index = j
+            values.extend(missing * (max_options - len(options)))
+            marked.append(index)
+            explanation = q.get('explanation', '')
+            v = parsed.get(explanation)
+            if v is None:
+                v = parsed[explanation] = self.explanation_values(q) or missing
+            stated.append(v)
+
+        values = np.array(values, dtype=float).reshape(n, max_options, width)
+        marked = np.array(marked)
+        stated = np.array(stated, dtype=float)
+
+        matches = np.all(np.isclose(values, answers[:, None, :]), axis=2)
+        has_marked = marked >= 0
+        marked_ok = np.zeros(n, dtype=bool)
+        marked_ok[has_marked] = matches[has_marked, marked[has_marked]]
+        distractor_hits = matches.sum(axis=1) - marked_ok
+        explanation_ok = np.all(np.isnan(stated) | np.isclose(stated, answers), axis=1)
+
+        bad = np.flatnonzero(~marked_ok | (distractor_hits > 0) | ~explanation_ok)
+        for r in bad:
+            i = rows[r]
+            if not has_marked[r]:
+                issues[i].append('correct letter does not match any option')
+            elif not marked_ok[r]:
+                issues[i].append('marked option disagrees with computed answer')
+            if distractor_hits[r]:
+                issues[i].append('distractor equals computed answer')
+            if not explanation_ok[r]:
+                issues[i].append('explanation disagrees with computed answer')
+        return issues
+
+
+class CountingSolver(TopicSolver):
+    """Multiplication principle over the two columns of the options table"""
+    topic = "Counting & Arrangement Problems"
+
+    def __init__(self):
+        self.explanation_pattern = re.compile(
+            r'(\d+) .+? options × (\d+) .+? options = (\d+) total')
+
+    def cache_key(self, question: Dict) -> str:
+        return question.get('table', '')
+
+    def extract(self, question: Dict) -> Optional[Tuple]:
+        table = question.get('table')
+        if not table:
+            return None
+        counts = [0, 0]
+        for line in table.split('\n')[2:]:
+            cells = [c.strip() for c in line.strip().strip('|').split('|')]
+            if len(cells) != 2:
+                return None
+            for col, cell in enumerate(cells):
+                if cell:
+                    counts[col] += 1
+        return tuple(counts)
+
+    def solve(self, params: np.ndarray) -> np.ndarray:
+        return (params[:, 0] * params[:, 1])[:, None]
+
+    def explanation_values(self, question: Dict) -> Optional[Tuple]:
+        match = self.explanation_pattern.search(question.get('explanation', ''))
+        if not match:
+            return None
+        n1, n2, total = (int(g) for g in match.groups())
+        # Inconsistent arithmetic can never match, whatever the total says
+        return (total if n1 * n2 == total else float('inf'),)
+
+
+class SolidFiguresSolver(TopicSolver):
+    """Container dimensions for a grid of identical solids"""
+    topic = "Solid Figures (Volume of Cubes)"
+    answer_width = 3
+
+    def __init__(self):
+        self.question_pattern = re.compile(
+            r'holds \d+ \w+ in an? (\d+)×(\d+)(?:×(\d+))? (?:grid|arrangement)'
+            r'.*?radius of ([\d.]+) centimeters')
+        self.explanation_pattern = re.compile(
+            r'has diameter ([\d.]+) cm\. The arrangement requires (.+?) cm dimensions')
+
+    def extract(self, question: Dict) -> Optional[Tuple]:
+        match = self.question_pattern.search(question.get('question', ''))
+        if not match:
+            return None
+        nx, ny, nz, r = match.groups()
+        # A flat grid is a single layer
+        return (int(nx), int(ny), int(nz or 1), float(r))
+
+    def solve(self, params: np.ndarray) -> np.ndarray:
+        diameter = 2 * params[:, 3:4]
+        return params[:, :3] * diameter
+
+    def parse_option(self, text: str) -> Tuple:
+        return _parse_dimensions(text)
+
+    def explanation_values(self, question: Dict) -> Optional[Tuple]:
+        match = self.explanation_pattern.search(question.get('explanation', ''))
+        if not match:
+            return None
+        return _parse_dimensions(match.group(2))
+
+
+class ProbabilitySolver(TopicSolver):
+    """Single draws and independent draws with replacement from a bag of marbles"""
+    topic = "Probability (Basic, Compound Events)"
+
+    def __init__(self):
+        self.question_pattern = re.compile(r'contains (\d+) red, (\d+) blue, and (\d+) green marbles')
+        self.explanation_pattern = re.compile(r'= (\d+(?:/\d+)?)\.$')
+
+    def extract(self, question: Dict) -> Optional[Tuple]:
+        text = question.get('question', '')
+        match = self.question_pattern.search(text)
+        if not match:
+            return None
+        red, blue, green = (int(g) for g in match.groups())
+        return (red, blue, green, int('second is blue' in text))
+
+    def solve(self, params: np.ndarray) -> np.ndarray:
+        red, blue, total = params[:, 0], params[:, 1], params[:, :3].sum(axis=1)
+        return np.where(params[:, 3] == 1, red * blue / (total * total), red / total)[:, None]
+
+    def parse_option(self, text: str) -> Tuple:
+        num, den = _parse_fraction(text)
+        return (num / den,)
+
+    def explanation_values(self, question: Dict) -> Optional[Tuple]:
+        match = self.explanation_pattern.search(question.get('explanation', ''))
+        return self.parse_option(match.group(1)) if match else None
+
+
+class StatisticsSolver(TopicSolver):
+    """Mean (to the nearest tenth), median, mode and range of seven values"""
+    topic = "Mean, Median, Mode, & Range"
+    measures = ('mean', 'median', 'mode', 'range')
+    size = 7
+
+    def __init__(self):
+        self.question_pattern = re.compile(r': (-?\d+(?:, -?\d+)*)\. What is the (mean|median|mode|range) of the data')
+        self.explanation_pattern = re.compile(r'(?:≈|is|=) (-?[\d.]+)\.$')
+
+    def extract(self, question: Dict) -> Optional[Tuple]:
+        match = self.question_pattern.search(question.get('question', ''))
+        if not match:
+            return None
+        values = [int(v) for v in match.group(1).split(', ')]
+        if len(values) != self.size:
+            return None
+        return (self.measures.index(match.group(2)), *values)
+
+    def solve(self, params: np.ndarray) -> np.ndarray:
+        values = np.sort(params[:, 1:], axis=1)
+        rows = np.arange(len(values))
+        # The mode is the value with the most copies
+        copies = (values[:, :, None] == values[:, None, :]).sum(axis=2)
+        answers = np.stack([np.rint(values.sum(axis=1) * 10 / self.size) / 10,
+                            values[:, self.size // 2],
+                            values[rows, np.argmax(copies, axis=1)],
+                            values[:, -1] - values[:, 0]], axis=1)
+        return answers[rows, params[:, 0].astype(np.int64)][:, None]
+
+    def explanation_values(self, question: Dict) -> Optional[Tuple]:
+        match = self.explanation_pattern.search(question.get('explanation', ''))
+        return (_parse_number(match.group(1)),) if match else None
+
+
+class AreaVolumeSolver(TopicSolver):
+    """Rectangle and triangle areas and rectangular prism volumes"""
+    topic = "Area & Volume"
+
+    def __init__(self):
+        self.question_patterns = [re.compile(p) for p in (
+            r'rectangular garden is (\d+) \w+ long and (\d+) \w+ wide',
+            r'triangular sail has a base of (\d+) \w+ and a height of (\d+) \w+',
+            r'storage box measures (\d+) \w+ by (\d+) \w+ by (\d+) \w+')]
+        self.explanation_pattern = re.compile(r'= (\d+) (?:square|cubic) \w+\.$')
+
+    def extract(self, question: Dict) -> Optional[Tuple]:
+        text = question.get('question', '')
+        for kind, pattern in enumerate(self.question_patterns):
+            match = pattern.search(text)
+            if match:
+                a, b, c = (int(g) for g in match.groups() + ('1',) * (3 - len(match.groups())))
+                return (kind, a, b, c)
+        return None
+
+    def solve(self, params: np.ndarray) -> np.ndarray:
+        kind, a, b, c = params.T
+        return np.choose(kind.astype(np.int64), [a * b, a * b / 2, a * b * c])[:, None]
+
+    def explanation_values(self, question: Dict) -> Optional[Tuple]:
+        match = self.explanation_pattern.search(question.get('explanation', ''))
+        return (int(match.group(1)),) if match else None
+
+
+class CoordinateGeometrySolver(TopicSolver):
+    """Midpoints and distances between two points.
+
+    Answers are (x, y) pairs; a distance d is compared as (d, 0).
+    """
+    topic = "Coordinate Geometry"
+    answer_width = 2
+
+    def __init__(self):
+        self.point_pattern = re.compile(r'\((-?\d+), (-?\d+)\)')
+        self.explanation_patterns = (re.compile(r'= (\(-?\d+, -?\d+\))\.$'), re.compile(r'= (\d+)\.$'))
+
+    def extract(self, question: Dict) -> Optional[Tuple]:
+        text = question.get('question', '')
+        points = self.point_pattern.findall(text)
+        if len(points) != 2:
+            return None
+        (x1, y1), (x2, y2) = points
+        return (int('midpoint' in text), int(x1), int(y1), int(x2), int(y2))
+
+    def solve(self, params: np.ndarray) -> np.ndarray:
+        midpoint, x1, y1, x2, y2 = params.T
+        midpoint = midpoint[:, None] == 1
+        return np.where(midpoint, np.stack([(x1 + x2) / 2, (y1 + y2) / 2], axis=1),
+                        np.stack([np.hypot(x2 - x1, y2 - y1), np.zeros(len(params))], axis=1))
+
+    def parse_option(self, text: str) -> Tuple:
+        match = self.point_pattern.fullmatch(str(text).strip())
+        if match:
+            return tuple(float(v) for v in match.groups())
+        return (_parse_number(text), 0.0)
+
+    def explanation_values(self, question: Dict) -> Optional[Tuple]:
+        explanation = question.get('explanation', '')
+        for pattern in self.explanation_patterns:
+            match = pattern.search(explanation)
+            if match:
+                return self.parse_option(match.group(1))
+        return None
+
+
+class FractionsDecimalsPercentsSolver(TopicSolver):
+    """Percents of a number and conversions between fractions, decimals and percents.
+
+    Answers are (numerator, denominator) pairs, so a fraction answer must
+    also be in simplest form to match.
+    """
+    topic = "Fractions, Decimals, & Percents"
+    answer_width = 2
+
+    def __init__(self):
+        self.question_patterns = [re.compile(p) for p in (
+            r'What is (\d+)% of (\d+)\?',
+            r'What is (\d+)/(\d+) written as a percent\?',
+            r'What is (\d*\.\d+) written as a fraction',
+            r'What is (\d+)/(\d+) written as a decimal\?')]
+        self.explanation_pattern = re.compile(r'(?:=|gives) ([\d./]+%?)\.$')
+
+    def extract(self, question: Dict) -> Optional[Tuple]:
+        text = question.get('question', '')
+        for kind, pattern in enumerate(self.question_patterns):
+            match = pattern.search(text)
+            if match:
+                if kind == 2:
+                    return (kind, *_parse_fraction(match.group(1)))
+                return (kind, *(int(g) for g in match.groups()))
+        return None
+
+    def solve(self, params: np.ndarray) -> np.ndarray:
+        kind = params[:, 0].astype(np.int64)
+        x, y = params[:, 1].astype(np.int64), params[:, 2].astype(np.int64)
+        divisor = np.gcd(x, y)
+        num = np.choose(kind, [x * y / 100, 100 * x / y, x // divisor, x // divisor])
+        den = np.choose(kind, [np.ones_like(x), np.ones_like(x), y // divisor, y // divisor])
+        return np.stack([num, den], axis=1)
+
+    def parse_option(self, text: str) -> Tuple:
+        return _parse_fraction(text)
+
+    def explanation_values(self, question: Dict) -> Optional[Tuple]:
+        match = self.explanation_pattern.search(question.get('explanation', ''))
+        return _parse_fraction(match.group(1)) if match else None
+
+
+class NumberTheorySolver(TopicSolver):
+    """Greatest common factors and least common multiples of two numbers"""
+    topic = "Basic Number Theory"
+
+    def __init__(self):
+        self.question_pattern = re.compile(
+            r'What is the (greatest common factor|least common multiple) of (\d+) and (\d+)\?')
+        self.explanation_pattern = re.compile(r'(?:is|=) (\d+)\.$')
+
+    def extract(self, question: Dict) -> Optional[Tuple]:
+        match = self.question_pattern.search(question.get('question', ''))
+        if not match:
+            return None
+        kind, a, b = match.groups()
+        return (int(kind == 'greatest common factor'), int(a), int(b))
+
+    def solve(self, params: np.ndarray) -> np.ndarray:
+        a, b = params[:, 1].astype(np.int64), params[:, 2].astype(np.int64)
+        return np.where(params[:, 0] == 1, np.gcd(a, b), np.lcm(a, b))[:, None]
+
+    def explanation_values(self, question: Dict) -> Optional[Tuple]:
+        match = self.explanation_pattern.search(question.get('explanation', ''))
+        return (int(match.group(1)),) if match else None
+
+
+class AnswerVerifier:
+    def __init__(self):
+        self.solvers = {s.topic: s for s in (
+            CountingSolver(), ProbabilitySolver(), StatisticsSolver(), AreaVolumeSolver(),
+            SolidFiguresSolver(), CoordinateGeometrySolver(), FractionsDecimalsPercentsSolver(),
+            NumberTheorySolver())}
+
+    def verify_question(self, question: Dict) -> List[str]:
+        """Verify a single question, returning its issues"""
+        solver = self.solvers.get(question.get('topic'))
+        if solver is None:
+            return []
+        return solver.verify([question])[0]
+
+    def verify_batch(self, questions: List[Dict]) -> Dict:
+        """Re-solve every question and flag those whose answers disagree"""
+        by_topic = {}
+        for i, q in enumerate(questions):
+            by_topic.setdefault(q.get('topic'), []).append(i)
+
+        flagged = []
+        verified = 0
+        unverified = 0
+        for topic, indices in by_topic.items():
+            solver = self.solvers.get(topic)
+            if solver is None:
+                unverified += len(indices)
+                continue
+            verified += len(indices)
+            issues = solver.verify([questions[i] for i in indices])
+            for i, question_issues in zip(indices, issues):
+                if question_issues:
+                    flagged.append({'question': i + 1, 'topic': topic, 'issues': question_issues})
+
+        flagged.sort(key=lambda f: f['question'])
+        return {
+            'flagged_questions': flagged,
+            'summary': {
+                'total_questions': len(questions),
+                'verified': verified,
+                'unverified': unverified,
+                'flagged': len(flagged)
+            }
+        }
+
+
+def benchmark(count: int = 1000000) -> Dict:
+    """Seconds to verify a mixed bank of count batch-generated questions"""
+    import time
+    from batch_generators import BatchQuestionGenerator
+
+    questions = BatchQuestionGenerator(seed=0).generate_mixed(count)
+    start = time.perf_counter()
+    report = AnswerVerifier().verify_batch(questions)
+    seconds = time.perf_counter() - start
+    return {'question_count': count, 'seconds': seconds, 'rate': count / seconds,
+            'flagged': report['summary']['flagged']}
+
+
+if __name__ == "__main__":
+    result = benchmark()
+    print(f"[BENCHMARK] {result['question_count']:,} questions verified in {result['seconds']:.1f} s "
+          f"({result['rate']:,.0f} questions/s, {result['flagged']} flagged)")
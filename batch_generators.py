@@ -0,0 +1,681 @@
+"""
+Vectorized question generators for every curriculum topic.
+
+    from batch_generators import BatchQuestionGenerator
+    questions = BatchQuestionGenerator(seed=1).generate_mixed(100000)
+
+Each topic draws its parameters, answers and distractor candidates for
+the whole batch as NumPy arrays. Text is formatted in a final pass: option
+labels and numbers once per distinct value, question text once per
+distinct parameter set where there are few, and otherwise with one
+f-string per question from those labels. Questions have the
+same dict shape as MathQuestionGenerator's, so format_question, the
+analytics, the answer verifier and the bank formats all work on them
+unchanged.
+"""
+
+import functools
+import itertools
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from question_generator import MathQuestionGenerator
+
+LETTERS = ('A', 'B', 'C', 'D', 'E')
+OPTION_COUNT = len(LETTERS)
+DIFFICULTY_LEVELS = ('easy', 'moderate', 'hard')
+
+LATEX = MathQuestionGenerator.BATCH_LATEX_FORMULAS
+
+# Same scenarios as MathQuestionGenerator, so the answer verifier applies
+COUNTING_SCENARIOS = [
+    {"context": "school cafeteria menu",
+     "item1": "sandwich", "item1_options": ["Turkey", "Ham", "Veggie", "Chicken"],
+     "item2": "drink", "item2_options": ["Water", "Juice", "Milk"],
+     "question": "How many different lunch combinations are possible?",
+     "real_world": "This applies to menu planning in restaurants and cafeterias."},
+    {"context": "art class supplies",
+     "item1": "paintbrush", "item1_options": ["Small", "Medium", "Large"],
+     "item2": "paint color", "item2_options": ["Red", "Blue", "Green", "Yellow", "Purple"],
+     "question": "How many different painting setups are possible?",
+     "real_world": "Artists use this principle when planning color palettes and tool combinations."},
+    {"context": "computer password creation",
+     "item1": "letter", "item1_options": ["A", "B", "C", "D"],
+     "item2": "number", "item2_options": ["1", "2", "3"],
+     "question": "How many different 2-character passwords (1 letter + 1 number) are possible?",
+     "real_world": "This concept is fundamental in cybersecurity and password strength analysis."}
+]
+
+SOLID_SCENARIOS = [
+    {"shape": "cylinder", "radius": 3, "arrangement": "4 cylinders in a 2×2 grid", "dims": (4, 4, 2),
+     "context": "cylindrical cans",
+     "real_world": "Used in warehouse storage optimization and shipping container design."},
+    {"shape": "sphere", "radius": 1.5, "arrangement": "8 spheres in a 2×2×2 arrangement", "dims": (4, 4, 4),
+     "context": "spherical ornaments",
+     "real_world": "Applied in molecular chemistry and crystal structure analysis."},
+    {"shape": "cube", "radius": 2, "arrangement": "6 cubes in a 2×3×1 arrangement", "dims": (4, 6, 2),
+     "context": "cubic boxes",
+     "real_world": "Essential for logistics and 3D printing space optimization."}
+]
+
+DATA_CONTEXTS = ['books they read last month', 'minutes they spent walking to school',
+                 'points they scored on a quiz', 'hours they spent practicing an instrument']
+
+PYTHAGOREAN_TRIPLES = np.array([(3, 4, 5), (6, 8, 10), (5, 12, 13), (8, 15, 17), (7, 24, 25), (9, 12, 15)])
+
+COPRIME_PAIRS = np.array([(2, 3), (2, 5), (3, 4), (3, 5), (4, 5), (2, 7), (3, 7), (4, 7), (5, 6),
+                          (5, 7), (6, 7), (3, 8), (5, 8), (7, 8), (2, 9), (4, 9), (5, 9), (7, 9), (8, 9)])
+
+PERCENT_DENOMINATORS = np.array([2, 4, 5, 10, 20, 25, 50])
+# Denominators dividing 100 and 1000, so the decimals terminate within two and three places
+HUNDREDTHS_DENOMINATORS = np.array([2, 4, 5, 10, 20, 25, 50, 100])
+THOUSANDTHS_DENOMINATORS = np.array([2, 4, 5, 10, 8, 20, 25, 40, 50])
+
+# Option keys are integers. Topics that mix kinds of answer offset each
+# kind into its own band of KEY_BAND keys so the label can tell them apart.
+KEY_BAND = 1 << 16
+PERCENT_KEY, DECIMAL_KEY, FRACTION_KEY = KEY_BAND, 2 * KEY_BAND, 3 * KEY_BAND
+POINT_KEY = KEY_BAND
+# Fractions pack as numerator * FRACTION_BASE + denominator; points as (x, y) offset by POINT_BASE // 2
+FRACTION_BASE = 1 << 11
+POINT_BASE = 1 << 8
+
+
+@functools.lru_cache(maxsize=None)
+def _permutations(size: int) -> np.ndarray:
+    """Every ordering of range(size), one per row; a random row shuffles a whole batch cheaply"""
+    return np.array(list(itertools.permutations(range(size))), dtype=np.int64).reshape(-1, size)
+
+
+def _choose_options(keys: np.ndarray, rng: np.random.Generator, fallback: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Pick the correct answer plus four distinct distractors per row, shuffled.
+
+    keys holds one comparable integer per candidate: column 0 is the
+    correct answer, then the distractors, then `fallback` columns that
+    are distinct from the answer and from each other by construction.
+    Candidates marked -1 are invalid. Distractors are tried in random
+    order and fallbacks last. Returns the chosen keys and the position of
+    the correct answer in each row.
+    """
+    n, c = keys.shape
+    primary = c - fallback
+    shuffles = _permutations(primary - 1)
+    order = np.empty((n, c), dtype=np.int64)
+    order[:, 0] = 0
+    order[:, 1:primary] = 1 + shuffles[rng.integers(0, len(shuffles), n)]
+    order[:, primary:] = np.arange(primary, c)
+    # Candidate-major, so each comparison runs over one contiguous row
+    ordered = np.take_along_axis(keys, order, axis=1).T.copy()
+    accepted = ordered >= 0
+    for j in range(1, c):
+        for i in range(min(j, primary)):
+            accepted[j] &= ordered[i] != ordered[j]
+    accepted &= np.cumsum(accepted, axis=0, dtype=np.int8) <= OPTION_COUNT
+    chosen = order[accepted.T].reshape(n, OPTION_COUNT)
+    shuffles = _permutations(OPTION_COUNT)
+    chosen = np.take_along_axis(chosen, shuffles[rng.integers(0, len(shuffles), n)], axis=1)
+    return np.take_along_axis(keys, chosen, axis=1), np.argmax(chosen == 0, axis=1)
+
+
+def _object_array(items: List) -> np.ndarray:
+    """1-D object array holding the items as they are, tuples included"""
+    return np.fromiter(items, dtype=object, count=len(items))
+
+
+def _distinct(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Distinct keys, one flat position holding each, and every key's index into them.
+
+    Narrow key ranges are resolved with dense lookup tables in linear
+    time; anything else falls back to sorting with np.unique.
+    """
+    flat = keys.ravel()
+    low, high = (int(flat.min()), int(flat.max())) if len(flat) else (0, 0)
+    if high - low < 16 * len(flat) + KEY_BAND:
+        shifted = flat - low
+        slot = np.full(high - low + 1, -1, dtype=np.int32)
+        slot[shifted] = 0
+        distinct = np.flatnonzero(slot == 0)
+        slot[distinct] = np.arange(len(distinct))
+        inverse = slot[shifted]
+        holder = np.empty(len(distinct), dtype=np.int64)
+        holder[inverse] = np.arange(len(flat))
+        return distinct + low, holder, inverse
+    return np.unique(flat, return_index=True, return_inverse=True)
+
+
+def _option_rows(keys: np.ndarray, label: Callable[[int], str] = str) -> List[List[Tuple[str, str]]]:
+    """Options lists for the chosen keys, labelling each distinct key once.
+
+    The (letter, label) tuples are shared between questions; they are
+    immutable, and every question still gets its own list.
+    """
+    distinct, _, inverse = _distinct(keys)
+    labels = [label(key) for key in distinct.tolist()]
+    table = np.empty((len(labels), OPTION_COUNT), dtype=object)
+    for j, letter in enumerate(LETTERS):
+        table[:, j] = _object_array(list(zip(itertools.repeat(letter), labels)))
+    return table[inverse.reshape(keys.shape), np.arange(OPTION_COUNT)].tolist()
+
+
+def _render_distinct(keys: np.ndarray, render: Callable[[int], Tuple[str, str, str]]) -> np.ndarray:
+    """render(row) for one row per distinct key, shared by every row with that key.
+
+    Returns the question texts, explanations and formulas as the three
+    rows of an object array.
+    """
+    _, rows, inverse = _distinct(keys)
+    rendered = np.empty((len(rows), 3), dtype=object)
+    rendered[:] = [render(row) for row in rows.tolist()]
+    return rendered[inverse].T
+
+
+def _strings(values: np.ndarray, label: Callable[[int], str] = str) -> List:
+    """label(value) for integer values as (nested) lists, labelling each distinct value once"""
+    distinct, _, inverse = _distinct(values)
+    return _object_array([label(value) for value in distinct.tolist()])[inverse].reshape(values.shape).tolist()
+
+
+def _fraction_label(key: int) -> str:
+    num, den = divmod(key, FRACTION_BASE)
+    return str(num) if den == 1 else f"{num}/{den}"
+
+
+def _tenths_label(key: int) -> str:
+    return f"{key / 10:g}"
+
+
+def _number_label(key: int) -> str:
+    band, value = divmod(key, KEY_BAND)
+    if band == 0:
+        return str(value)
+    if band == 1:
+        return f"{value}%"
+    if band == 2:
+        return f"{value / 1000:g}"
+    return _fraction_label(key - FRACTION_KEY)
+
+
+def _point_key(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    return POINT_KEY + (x + POINT_BASE // 2) * POINT_BASE + (y + POINT_BASE // 2)
+
+
+def _point_label(key: int) -> str:
+    if key < POINT_KEY:
+        return str(key)
+    x, y = divmod(key - POINT_KEY, POINT_BASE)
+    return f"({x - POINT_BASE // 2}, {y - POINT_BASE // 2})"
+
+
+class BatchQuestionGenerator:
+    """Generates questions N at a time for every curriculum topic"""
+    TOPIC_GENERATORS = {
+        "Counting & Arrangement Problems": "counting_batch",
+        "Probability (Basic, Compound Events)": "probability_batch",
+        "Mean, Median, Mode, & Range": "statistics_batch",
+        "Area & Volume": "area_volume_batch",
+        "Solid Figures (Volume of Cubes)": "solid_figures_batch",
+        "Coordinate Geometry": "coordinate_geometry_batch",
+        "Fractions, Decimals, & Percents": "fractions_decimals_percents_batch",
+        "Basic Number Theory": "number_theory_batch"
+    }
+
+    def __init__(self, latex_support: bool = True, seed: Optional[int] = None,
+                 difficulty_weights: Optional[Dict[str, float]] = None):
+        self.latex_support = latex_support
+        self.rng = np.random.default_rng(seed)
+        weights = difficulty_weights or {'easy': 0.4, 'moderate': 0.4, 'hard': 0.2}
+        self.difficulty_p = np.array([weights[level] for level in DIFFICULTY_LEVELS], dtype=float)
+        self.difficulty_p /= self.difficulty_p.sum()
+        self.units = {topic: (subject, unit)
+                      for subject, units in MathQuestionGenerator.CURRICULUM.items()
+                      for unit, topics in units.items() for topic in topics}
+
+    def generate(self, topic: str, count: int, difficulties: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Generate count questions for one topic.
+
+        Difficulties are drawn from the difficulty weights unless a
+        sequence of labels is given; they scale the number ranges.
+        """
+        if topic not in self.TOPIC_GENERATORS:
+            raise ValueError(f"No generator for topic: {topic}")
+        if difficulties is None:
+            levels = self.rng.choice(len(DIFFICULTY_LEVELS), size=count, p=self.difficulty_p)
+        else:
+            if len(difficulties) != count:
+                raise ValueError("difficulties must have one label per question")
+            levels = np.array([DIFFICULTY_LEVELS.index(d) for d in difficulties], dtype=np.int64)
+        if count == 0:
+            return []
+        return getattr(self, self.TOPIC_GENERATORS[topic])(topic, levels)
+
+    def generate_mixed(self, count: int, topics: Optional[Sequence[str]] = None,
+                       difficulties: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Generate count questions cycling through the topics (all of them by default).
+
+        difficulties, if given, labels the questions in output order.
+        """
+        topics = list(topics or self.TOPIC_GENERATORS)
+        if difficulties is not None and len(difficulties) != count:
+            raise ValueError("difficulties must have one label per question")
+        questions = [None] * count
+        for i, topic in enumerate(topics):
+            questions[i::len(topics)] = self.generate(topic, len(range(i, count, len(topics))),
+                                                      None if difficulties is None else difficulties[i::len(topics)])
+        return questions
+
+    def _assemble(self, topic: str, levels: np.ndarray, texts: np.ndarray, explanations: np.ndarray,
+                  formulas: np.ndarray, options: List[List[Tuple[str, str]]], position: np.ndarray,
+                  tables: Optional[np.ndarray] = None, extras: Optional[Dict[str, Sequence]] = None) -> List[Dict]:
+        """Final per-question pass building the question dicts.
+
+        Every question starts as a copy of one template dict, so keys come
+        out in MathQuestionGenerator's order, and the per-question fields
+        are then filled in one column at a time.
+        """
+        subject, unit = self.units[topic]
+        template = {'question': None}
+        if tables is not None:
+            template['table'] = None
+        template.update({'options': None, 'correct': None, 'explanation': None, 'latex_formula': None,
+                         'subject': subject, 'unit': unit, 'topic': topic, 'difficulty': None})
+        template.update(dict.fromkeys(extras or {}))
+        columns = {'question': texts, 'table': tables, 'options': options,
+                   'correct': np.array(LETTERS, dtype=object)[position], 'explanation': explanations,
+                   'latex_formula': formulas if self.latex_support else None,
+                   'difficulty': np.array(DIFFICULTY_LEVELS, dtype=object)[levels], **(extras or {})}
+
+        questions = [template.copy() for _ in range(len(levels))]
+        for key, values in columns.items():
+            if values is None:
+                continue
+            if isinstance(values, np.ndarray):
+                values = values.tolist()
+            for q, value in zip(questions, values):
+                q[key] = value
+        return questions
+
+    def _integer_options(self, correct: np.ndarray, *distractors: np.ndarray,
+                         label: Callable[[int], str] = str, offset=0, step=1) -> Tuple[List, np.ndarray]:
+        """Options from positive integer candidates, with correct + k * step (k = 1..4) as fallbacks.
+
+        offset (per row) is added to every valid key so the label can tell
+        rows apart, e.g. percents from plain numbers.
+        """
+        fallbacks = [correct + k * step for k in range(1, OPTION_COUNT)]
+        candidates = np.stack([correct, *distractors, *fallbacks], axis=1).astype(np.int64)
+        candidates = np.where(candidates > 0, candidates + offset, -1)
+        keys, position = _choose_options(candidates, self.rng, len(fallbacks))
+        return _option_rows(keys, label), position
+
+    def counting_batch(self, topic: str, levels: np.ndarray) -> List[Dict]:
+        n = len(levels)
+        scenario = self.rng.integers(0, len(COUNTING_SCENARIOS), n)
+        n1 = np.array([len(s['item1_options']) for s in COUNTING_SCENARIOS])[scenario]
+        n2 = np.array([len(s['item2_options']) for s in COUNTING_SCENARIOS])[scenario]
+        total = n1 * n2
+        # The distractor rules of generate_counting_question
+        options, position = self._integer_options(
+            total, n1 + n2, n1, n2, total + self.rng.integers(1, 6, n),
+            np.where(total > 3, total - self.rng.integers(1, 4, n), total + 2))
+
+        formula = MathQuestionGenerator().generate_latex_formula('combination')
+        rendered, tables, loads = [], [], []
+        for s in COUNTING_SCENARIOS:
+            rows = max(len(s['item1_options']), len(s['item2_options']))
+            product = len(s['item1_options']) * len(s['item2_options'])
+            rendered.append((
+                f"Each student choosing from the {s['context']} selects 1 {s['item1']} and 1 {s['item2']}. "
+                f"The table shows the options available. {s['question']}",
+                f"Using the multiplication principle: {len(s['item1_options'])} {s['item1']} options × "
+                f"{len(s['item2_options'])} {s['item2']} options = {product} total combinations.\n\n"
+                f"**Real-world application:** {s['real_world']}\n\n"
+                f"**Formula:** For independent choices, total combinations = n₁ × n₂",
+                formula))
+            tables.append(f"| {s['item1'].title()} | {s['item2'].title()} |\n|:---:|:---:|\n" + "\n".join(
+                f"| {s['item1_options'][i] if i < len(s['item1_options']) else ''} | "
+                f"{s['item2_options'][i] if i < len(s['item2_options']) else ''} |" for i in range(rows)))
+            loads.append("low" if product <= 12 else "medium")
+        texts, explanations, formulas = np.array(rendered, dtype=object)[scenario].T
+        return self._assemble(topic, levels, texts, explanations, formulas, options, position,
+                              tables=_object_array(tables)[scenario],
+                              extras={'cognitive_load': _object_array(loads)[scenario]})
+
+    def solid_figures_batch(self, topic: str, levels: np.ndarray) -> List[Dict]:
+        n = len(levels)
+        generator = MathQuestionGenerator()
+        rendered, labels = [], []
+        for s in SOLID_SCENARIOS:
+            r = s['radius']
+            length, width, height = (d * r for d in s['dims'])
+            correct = generator.format_dimensions(length, width, height)
+            # The four variations generate_geometry_question offers, correct first
+            labels += [correct,
+                       generator.format_dimensions(length / 2, width, height),
+                       generator.format_dimensions(length, width / 2, height),
+                       generator.format_dimensions(length + 2, width + 2, height + 2),
+                       generator.format_dimensions(length - 1, width - 1, height)]
+            formula = generator.generate_latex_formula('volume_' + s['shape'])
+            rendered.append((
+                f"A rectangular container holds {s['arrangement']} of {s['context']}. If each {s['shape']} "
+                f"has a radius of {r} centimeters, what are the closest dimensions, in centimeters, "
+                f"of the rectangular container?",
+                f"Each {s['shape']} has diameter {2*r} cm. The arrangement requires {correct} cm "
+                f"dimensions.\n\n**Real-world application:** {s['real_world']}\n\n"
+                f"**Volume calculation:** {formula if s['shape'] != 'cube' else 'V = s³'}",
+                formula))
+
+        scenario = self.rng.integers(0, len(SOLID_SCENARIOS), n)
+        keys, position = _choose_options(scenario[:, None] * OPTION_COUNT + np.arange(OPTION_COUNT), self.rng, 0)
+        texts, explanations, formulas = np.array(rendered, dtype=object)[scenario].T
+        return self._assemble(topic, levels, texts, explanations, formulas,
+                              _option_rows(keys, labels.__getitem__), position,
+                              extras={'spatial_reasoning': ['high'] * n})
+
+    def probability_batch(self, topic: str, levels: np.ndarray) -> List[Dict]:
+        n = len(levels)
+        high = np.array([6, 10, 15])[levels]
+        red, blue, green = (self.rng.integers(1, high + 1) for _ in range(3))
+        total = red + blue + green
+        compound = self.rng.random(n) < 0.5
+
+        num = np.stack([np.where(compound, red * blue, red),
+                        np.where(compound, red + blue, red),
+                        np.where(compound, red * blue, total - red),
+                        np.where(compound, red, blue),
+                        np.where(compound, 2 * red * blue, 1),
+                        np.where(compound, blue, red)], axis=1)
+        den = np.stack([np.where(compound, total * total, total),
+                        np.where(compound, total, total - red),
+                        np.where(compound, total * (total - 1), total),
+                        np.where(compound, total, total),
+                        np.where(compound, total * total, 3),
+                        np.where(compound, total, total + 1)], axis=1)
+        fallback = OPTION_COUNT - 1
+        num = np.concatenate([num, np.repeat(num[:, :1], fallback, axis=1)], axis=1)
+        den = np.concatenate([den, den[:, :1] + np.arange(1, fallback + 1)], axis=1)
+        # Reduced fractions, packed into one comparable key
+        divisor = np.gcd(num, den)
+        fractions = (num // divisor) * FRACTION_BASE + den // divisor
+        keys, position = _choose_options(fractions, self.rng, fallback)
+
+        r, b, g, t, both, answers = (red.tolist(), blue.tolist(), green.tolist(), total.tolist(),
+                                     compound.tolist(), fractions[:, 0].tolist())
+
+        def render(i):
+            answer = _fraction_label(answers[i])
+            bag = f"A bag contains {r[i]} red, {b[i]} blue, and {g[i]} green marbles."
+            if both[i]:
+                return (f"{bag} Two marbles are drawn one at a time, and the first is put back before the "
+                        f"second is drawn. What is the probability that the first marble is red and the "
+                        f"second is blue?",
+                        f"Because the first marble is replaced, the draws are independent: "
+                        f"P(red) × P(blue) = {r[i]}/{t[i]} × {b[i]}/{t[i]} = {answer}.",
+                        LATEX['independent'])
+            return (f"{bag} One marble is drawn at random. What is the probability that it is red?",
+                    f"There are {r[i]} red marbles out of {t[i]} in total, so P(red) = {r[i]}/{t[i]} = {answer}.",
+                    LATEX['probability'])
+
+        texts, explanations, formulas = _render_distinct(
+            np.ravel_multi_index((compound, red, blue, green), (2, 16, 16, 16)), render)
+        return self._assemble(topic, levels, texts, explanations, formulas,
+                              _option_rows(keys, _fraction_label), position)
+
+    def statistics_batch(self, topic: str, levels: np.ndarray) -> List[Dict]:
+        n = len(levels)
+        size = 7
+        # Six distinct values from increasing gaps, plus a repeat of one of them for a unique mode
+        start = np.array([0, 5, 10])[levels] + self.rng.integers(0, 6, n)
+        gaps = self.rng.integers(1, np.array([3, 6, 12])[levels][:, None] + 1, (n, size - 1))
+        distinct = start[:, None] + np.cumsum(gaps, axis=1)
+        mode = distinct[np.arange(n), self.rng.integers(0, size - 1, n)]
+        ordered = np.sort(np.concatenate([distinct, mode[:, None]], axis=1), axis=1)
+        shown = np.take_along_axis(ordered, np.argsort(self.rng.random((n, size)), axis=1), axis=1)
+
+        total = ordered.sum(axis=1)
+        median = ordered[:, size // 2]
+        spread = ordered[:, -1] - ordered[:, 0]
+        # Keys are tenths so rounded means compare exactly
+        stats10 = np.stack([np.rint(total * 10 / size).astype(np.int64), median * 10, mode * 10, spread * 10], axis=1)
+        stat = self.rng.integers(0, 4, n)  # mean, median, mode, range
+        correct = stats10[np.arange(n), stat]
+        distractors = [stats10[np.arange(n), (stat + k) % 4] for k in (1, 2, 3)]
+        distractors += [shown[:, size // 2] * 10, np.rint(total * 10 / (size - 1)).astype(np.int64),
+                        ordered[:, -1] * 10]
+        fallbacks = [correct + 10 * k for k in range(1, OPTION_COUNT)]
+        keys, position = _choose_options(np.stack([correct, *distractors, *fallbacks], axis=1),
+                                         self.rng, len(fallbacks))
+
+        heads = [f"Seven students recorded the number of {c}: " for c in DATA_CONTEXTS]
+        tails = [f". What is the {name} of the data?{rounding}" for name, rounding in
+                 (('mean', " Round to the nearest tenth."), ('median', ''), ('mode', ''), ('range', ''))]
+        stats = stat.tolist()
+        texts = [f"{heads[c]}{', '.join(values)}{tails[s]}" for c, values, s in
+                 zip(self.rng.integers(0, len(DATA_CONTEXTS), n).tolist(), _strings(shown), stats)]
+        explanations = [
+            f"Add the values to get {total}, then divide by the {size} values: {total} ÷ {size} ≈ {answer}."
+            if s == 0 else
+            f"In order the values are {', '.join(values)}. The middle (4th) value is {answer}."
+            if s == 1 else
+            f"{answer} appears twice and every other value appears once, so the mode is {answer}."
+            if s == 2 else
+            f"Subtract the smallest value from the largest: {values[-1]} − {values[0]} = {answer}."
+            for s, values, total, answer in zip(stats, _strings(ordered), _strings(total), _strings(correct, _tenths_label))]
+        formulas = _object_array([LATEX['mean'], '', '', LATEX['range']])[stat]
+        return self._assemble(topic, levels, texts, explanations, formulas,
+                              _option_rows(keys, _tenths_label), position)
+
+    def area_volume_batch(self, topic: str, levels: np.ndarray) -> List[Dict]:
+        n = len(levels)
+        low, high = np.array([2, 3, 5])[levels], np.array([10, 20, 40])[levels]
+        a, b, c = (self.rng.integers(low, high + 1) for _ in range(3))
+        kind = self.rng.integers(0, 3, n)  # rectangle area, triangle area, prism volume
+        b = np.where(kind == 1, 2 * (b // 2 + 1), b)  # even triangle bases keep areas whole
+        c = np.where(kind == 2, c, 0)
+        area = a * b
+        correct = np.choose(kind, [area, area // 2, area * c])
+        options, position = self._integer_options(
+            correct,
+            np.choose(kind, [2 * (a + b), area, 2 * (area + a * c + b * c)]),
+            np.choose(kind, [a + b, a + b, area]),
+            np.choose(kind, [2 * area, 2 * (a + b), a + b + c]),
+            correct + np.where(kind == 1, b, a))
+
+        units = ['feet', 'meters', 'inches', 'centimeters']
+        rows = list(zip(kind.tolist(), self.rng.integers(0, len(units), n).tolist(),
+                        *_strings(np.stack([a, b, c, correct]))))
+        texts = [
+            f"A rectangular garden is {x} {units[u]} long and {y} {units[u]} wide. "
+            f"What is its area, in square {units[u]}?"
+            if k == 0 else
+            f"A triangular sail has a base of {y} {units[u]} and a height of {x} {units[u]}. "
+            f"What is its area, in square {units[u]}?"
+            if k == 1 else
+            f"A rectangular storage box measures {x} {units[u]} by {y} {units[u]} by {z} {units[u]}. "
+            f"What is its volume, in cubic {units[u]}?"
+            for k, u, x, y, z, _ in rows]
+        explanations = [
+            f"Area of a rectangle = length × width = {x} × {y} = {v} square {units[u]}."
+            if k == 0 else
+            f"Area of a triangle = ½ × base × height = ½ × {y} × {x} = {v} square {units[u]}."
+            if k == 1 else
+            f"Volume of a rectangular prism = length × width × height = {x} × {y} × {z} = {v} cubic {units[u]}."
+            for k, u, x, y, z, v in rows]
+        formulas = _object_array([LATEX['area_rectangle'], LATEX['area_triangle'], LATEX['volume_prism']])[kind]
+        return self._assemble(topic, levels, texts, explanations, formulas, options, position)
+
+    def coordinate_geometry_batch(self, topic: str, levels: np.ndarray) -> List[Dict]:
+        n = len(levels)
+        span = np.array([5, 10, 20])[levels]
+        x1 = self.rng.integers(-span, span + 1)
+        y1 = self.rng.integers(-span, span + 1)
+        midpoint = self.rng.random(n) < 0.5
+
+        # Even changes keep midpoints whole; a segment needs two different endpoints
+        mid_dx = 2 * self.rng.integers(-span, span + 1)
+        mid_dy = 2 * self.rng.integers(-span, span + 1)
+        same = (mid_dx == 0) & (mid_dy == 0)
+        mid_dx[same] = 2 * self.rng.choice([-1, 1], size=same.sum()) * self.rng.integers(1, span[same] + 1)
+        # Distance questions use Pythagorean triples so the answer is whole
+        triple = PYTHAGOREAN_TRIPLES[self.rng.integers(0, len(PYTHAGOREAN_TRIPLES), n)]
+        sign = self.rng.choice([-1, 1], size=(n, 2))
+        dx = np.where(midpoint, mid_dx, triple[:, 0] * sign[:, 0])
+        dy = np.where(midpoint, mid_dy, triple[:, 1] * sign[:, 1])
+        x2, y2 = x1 + dx, y1 + dy
+        mx, my = (x1 + x2) // 2, (y1 + y2) // 2
+        distance = triple[:, 2]
+
+        candidates = np.stack([
+            np.where(midpoint, _point_key(mx, my), distance),
+            np.where(midpoint, _point_key(dx // 2, dy // 2), np.abs(dx) + np.abs(dy)),
+            np.where(midpoint, _point_key(x1 + x2, y1 + y2), distance * distance),
+            np.where(midpoint, _point_key(my, mx), np.abs(np.abs(dx) - np.abs(dy))),
+            np.where(midpoint, _point_key(mx, -my), distance + 2),
+            *[np.where(midpoint, _point_key(mx + k, my), distance + k) for k in range(1, OPTION_COUNT)]
+        ], axis=1)
+        keys, position = _choose_options(np.where(candidates > 0, candidates, -1), self.rng, OPTION_COUNT - 1)
+
+        rows = list(zip(midpoint.tolist(), *_strings(np.stack([
+            x1, y1, x2, y2, np.abs(dx), np.abs(dy), distance * distance, distance])),
+            _strings(_point_key(mx, my), _point_label)))
+        texts = [f"What is the midpoint of the segment joining ({a}, {b}) and ({c}, {d})?" if mid else
+                 f"What is the distance between the points ({a}, {b}) and ({c}, {d})?"
+                 for mid, a, b, c, d, *_ in rows]
+        explanations = [
+            f"Average the coordinates: (({a} + {c}) ÷ 2, ({b} + {d}) ÷ 2) = {middle}." if mid else
+            f"The horizontal change is {across} and the vertical change is {up}, "
+            f"so the distance is √({across}² + {up}²) = √{squared} = {length}."
+            for mid, a, b, c, d, across, up, squared, length, middle in rows]
+        formulas = _object_array([LATEX['distance'], LATEX['midpoint']])[midpoint.astype(np.int64)]
+        return self._assemble(topic, levels, texts, explanations, formulas,
+                              _option_rows(keys, _point_label), position)
+
+    def fractions_decimals_percents_batch(self, topic: str, levels: np.ndarray) -> List[Dict]:
+        n = len(levels)
+        # p% of n, a fraction as a percent, a decimal as a fraction, a fraction as a decimal
+        kind = self.rng.integers(0, 4, n)
+        # p% of n with p a multiple of 5 and n of 20 is always whole
+        p = 5 * self.rng.integers(1, np.array([10, 19, 19])[levels] + 1)
+        whole = 20 * self.rng.integers(1, np.array([5, 10, 25])[levels] + 1)
+        part = p * whole // 100
+        # Denominators dividing 100 give whole percents
+        b = np.choose(kind, [PERCENT_DENOMINATORS[self.rng.integers(0, np.array([3, 5, 7])[levels])],
+                             PERCENT_DENOMINATORS[self.rng.integers(0, np.array([3, 5, 7])[levels])],
+                             HUNDREDTHS_DENOMINATORS[self.rng.integers(0, np.array([4, 6, 8])[levels])],
+                             THOUSANDTHS_DENOMINATORS[self.rng.integers(0, np.array([4, 6, 9])[levels])]])
+        a = self.rng.integers(1, b)
+        # Decimal and fraction questions state the fraction in lowest terms
+        divisor = np.where(kind >= 2, np.gcd(a, b), 1)
+        a, b = a // divisor, b // divisor
+        percent = a * 100 // b
+        thousandths = a * 1000 // b
+
+        def fraction(num, den):
+            return np.where((num > 0) & (den > 0), num * FRACTION_BASE + den, -1)
+
+        # The "a.b" slip, reading 3/8 as 3.8
+        misread = a * 1000 + np.where(b < 10, b * 100, b * 10)
+        options, position = self._integer_options(
+            np.choose(kind, [part, percent, fraction(a, b), thousandths]),
+            np.choose(kind, [part * 10, 100 - percent, fraction(percent, 100), 10 * thousandths]),
+            np.choose(kind, [whole - part, a * 10, fraction(b, a), 1000 - thousandths]),
+            np.choose(kind, [part + p, a + b, fraction(a, 10 * b), misread]),
+            np.choose(kind, [2 * part, np.where(percent % 2 == 0, percent // 2, -1), fraction(b - a, b),
+                             np.where(thousandths % 10 == 0, thousandths // 10, -1)]),
+            label=_number_label, offset=np.choose(kind, [0, PERCENT_KEY, FRACTION_KEY, DECIMAL_KEY])[:, None],
+            step=np.where(kind == 3, 100, 1))
+
+        ks, ps, ws, parts, nums, dens, pcts, ts = (kind.tolist(), p.tolist(), whole.tolist(), part.tolist(),
+                                                   a.tolist(), b.tolist(), percent.tolist(), thousandths.tolist())
+
+        def render(i):
+            num, den = nums[i], dens[i]
+            if ks[i] == 0:
+                return (f"What is {ps[i]}% of {ws[i]}?",
+                        f"{ps[i]}% means {ps[i]} per 100, so {ps[i]}% of {ws[i]} = {ps[i]}/100 × {ws[i]} = {parts[i]}.",
+                        LATEX['percent_of'])
+            if ks[i] == 1:
+                return (f"What is {num}/{den} written as a percent?",
+                        f"Rewrite with a denominator of 100: {num}/{den} = {num * (100 // den)}/100 = {pcts[i]}%.",
+                        LATEX['fraction_percent'])
+            decimal = f"{ts[i] / 1000:g}"
+            if ks[i] == 2:
+                simplest = (f"and {num} and 100 have no common factor, so it is already in simplest form"
+                            if den == 100 else
+                            f"and dividing both by their greatest common factor, {100 // den}, gives {num}/{den}")
+                return (f"What is {decimal} written as a fraction in simplest form?",
+                        f"{decimal} = {pcts[i]}/100, {simplest}.", LATEX['decimal_fraction'])
+            return (f"What is {num}/{den} written as a decimal?",
+                    f"Divide the numerator by the denominator: {num} ÷ {den} = {decimal}.",
+                    LATEX['fraction_decimal'])
+
+        texts, explanations, formulas = _render_distinct(np.ravel_multi_index(
+            (kind, np.where(kind == 0, p, a), np.where(kind == 0, whole, b)), (4, 501, 501)), render)
+        return self._assemble(topic, levels, texts, explanations, formulas, options, position)
+
+    def number_theory_batch(self, topic: str, levels: np.ndarray) -> List[Dict]:
+        n = len(levels)
+        pair = COPRIME_PAIRS[self.rng.integers(0, len(COPRIME_PAIRS), n)]
+        m, k = pair[:, 0], pair[:, 1]
+        g = self.rng.integers(np.array([2, 2, 6])[levels], np.array([6, 12, 20])[levels] + 1)
+        a, b = g * m, g * k
+        lcm = g * m * k
+        gcf = self.rng.random(n) < 0.5
+        options, position = self._integer_options(
+            np.where(gcf, g, lcm),
+            np.where(gcf, lcm, a * b),
+            np.where(gcf, a, g),
+            np.where(gcf, b - a, a + b),
+            np.where(gcf, 2 * g, b),
+            np.where(gcf, 1, 2 * lcm))
+
+        gcfs, xs, ys, fs, ps, qs, multiples = (gcf.tolist(), a.tolist(), b.tolist(), g.tolist(),
+                                               m.tolist(), k.tolist(), lcm.tolist())
+
+        def render(i):
+            x, y, f, p, q = xs[i], ys[i], fs[i], ps[i], qs[i]
+            factors = f"{x} = {f} × {p} and {y} = {f} × {q}, and {p} and {q} have no common factor"
+            if gcfs[i]:
+                return (f"What is the greatest common factor of {x} and {y}?",
+                        f"{factors}, so the greatest common factor is {f}.", LATEX['gcd_lcm'])
+            return (f"What is the least common multiple of {x} and {y}?",
+                    f"{factors}, so the least common multiple is {f} × {p} × {q} = {multiples[i]}.", LATEX['gcd_lcm'])
+
+        texts, explanations, formulas = _render_distinct(
+            np.ravel_multi_index((gcf, m, k, g), (2, 10, 10, 21)), render)
+        return self._assemble(topic, levels, texts, explanations, formulas, options, position)
+
+
+def benchmark(count: int = 100000, repeat: int = 1) -> Dict:
+    """Questions per second for the batch generators and the per-question path, best of repeat runs"""
+    import time
+
+    def rate(generate, n):
+        best = 0.0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            generate(n)
+            best = max(best, n / (time.perf_counter() - start))
+        return best
+
+    generator = MathQuestionGenerator()
+    per_question_rate = rate(lambda n: [generator.generate_counting_question() if i % 2 == 0
+                                        else generator.generate_geometry_question() for i in range(n)], count // 10)
+    batch = BatchQuestionGenerator(seed=0)
+    rates = {topic: rate(functools.partial(batch.generate, topic), count) for topic in batch.TOPIC_GENERATORS}
+    # The per-question path's own topics, for a like-for-like comparison
+    same_topics_rate = rate(functools.partial(batch.generate_mixed, topics=list(MathQuestionGenerator.TOPIC_GENERATORS)),
+                            count)
+    return {'per_question_rate': per_question_rate, 'batch_rates': rates, 'same_topics_rate': same_topics_rate,
+            'mixed_rate': rate(batch.generate_mixed, count)}
+
+
+if __name__ == "__main__":
+    result = benchmark()
+    print(f"[BENCHMARK] Per-question generator: {result['per_question_rate']:,.0f} questions/s")
+    for topic, rate in result['batch_rates'].items():
+        print(f"  {topic}: {rate:,.0f} questions/s ({rate / result['per_question_rate']:.0f}x)")
+    print(f"  Counting and solid figures: {result['same_topics_rate']:,.0f} questions/s "
+          f"({result['same_topics_rate'] / result['per_question_rate']:.0f}x)")
+    print(f"  Mixed: {result['mixed_rate']:,.0f} questions/s "
+          f"({result['mixed_rate'] / result['per_question_rate']:.0f}x)")
@@ -0,0 +1,357 @@
+"""
+Memory-mapped binary question bank (.mqb).
+
+Layout, all integers little-endian:
+
+    header    64 bytes: magic, version, field count, question count,
+              capacity, heap length, metadata offset and length
+    offsets   u8[capacity * FIELDS + 1], where field j of question i spans
+              heap[offsets[i*F + j]:offsets[i*F + j + 1]]
+    columns   curriculum u2[capacity], difficulty u1[capacity],
+              correct u1[capacity], flags u1[capacity]
+    heap      UTF-8 text of every field, in question order
+    metadata  JSON codebooks for the curriculum, difficulty and correct
+              columns
+
+Readers map the file and serve question i, a single field or a column
+filter without parsing the rest of the bank. Columns are reserved up to
+the capacity, so a bulk append writes the new rows in place and extends
+the heap; only when the capacity runs out is the file rewritten with
+double the room.
+
+An in-place append never overwrites bytes the current header refers to.
+It first copies the live metadata past everything the append will write
+and points the header at the copy, then extends the heap over the old
+metadata and writes the new metadata after it, and rewrites the header
+once more. Each header write follows an fsync, so a crash or a
+concurrent reader sees either the old bank or the new one.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+MAGIC = b'MQBANK\x00\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQQQQ8x')
+
+# Variable-length fields kept in the heap; options and extras are JSON
+FIELDS = ('question', 'table', 'options', 'explanation', 'latex_formula', 'extras')
+FIELD_INDEX = {name: j for j, name in enumerate(FIELDS)}
+
+# Flag bits for optional keys, so an absent key and an empty string differ
+HAS_TABLE = 1
+HAS_LATEX = 2
+# latex_formula present but None, as generators with LaTeX off emit it
+NULL_LATEX = 4
+
+_CORE_KEYS = ('question', 'table', 'options', 'correct', 'explanation', 'latex_formula',
+              'subject', 'unit', 'topic', 'difficulty')
+
+
+def _layout(capacity: int) -> Dict[str, int]:
+    offsets_at = HEADER.size
+    curriculum_at = offsets_at + 8 * (capacity * len(FIELDS) + 1)
+    difficulty_at = curriculum_at + 2 * capacity
+    correct_at = difficulty_at + capacity
+    flags_at = correct_at + capacity
+    return {'offsets': offsets_at, 'curriculum': curriculum_at, 'difficulty': difficulty_at,
+            'correct': correct_at, 'flags': flags_at, 'heap': flags_at + capacity}
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _code(codebook: List, codes: Dict, value, limit: int) -> int:
+    key = tuple(value) if isinstance(value, list) else value
+    code = codes.get(key)
+    if code is None:
+        if len(codebook) >= limit:
+            raise ValueError(f"Too many distinct values for a binary bank column: {value!r}")
+        code = codes[key] = len(codebook)
+        codebook.append(value)
+    return code
+
+
+def _encode(questions: List[Dict], meta: Dict, heap_start: int) -> Dict:
+    """Encode questions as column rows, heap bytes and field end offsets"""
+    books = {name: (meta[name], {tuple(v) if isinstance(v, list) else v: i for i, v in enumerate(meta[name])})
+             for name in ('curriculum', 'difficulties', 'answers')}
+    ends = array('Q')
+    curriculum, difficulty, correct, flags = array('H'), array('B'), array('B'), array('B')
+    heap = bytearray()
+
+    for q in questions:
+        curriculum.append(_code(*books['curriculum'], [q['subject'], q['unit'], q['topic']], 1 << 16))
+        difficulty.append(_code(*books['difficulties'], q['difficulty'], 1 << 8))
+        correct.append(_code(*books['answers'], q['correct'], 1 << 8))
+        latex = q.get('latex_formula')
+        flags.append((HAS_TABLE if 'table' in q else 0) | (HAS_LATEX if latex is not None else 0)
+                     | (NULL_LATEX if latex is None and 'latex_formula' in q else 0))
+        extras = [[k, v] for k, v in q.items() if k not in _CORE_KEYS]
+        for text in (q['question'], q.get('table', ''),
+                     json.dumps([list(option) for option in q['options']], ensure_ascii=False),
+                     q['explanation'], latex or '',
+                     json.dumps(extras, ensure_ascii=False) if extras else ''):
+            heap += text.encode('utf-8')
+            ends.append(heap_start + len(heap))
+
+    return {'ends': ends, 'curriculum': curriculum, 'difficulty': difficulty,
+            'correct': correct, 'flags': flags, 'heap': heap}
+
+
+def _read_header(f) -> Dict:
+    f.seek(0)
+    magic, version, field_count, count, capacity, heap_length, meta_offset, meta_length = \
+        HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Not a binary question bank")
+    if version != VERSION or field_count != len(FIELDS):
+        raise ValueError(f"Unsupported binary question bank version {version}")
+    f.seek(meta_offset)
+    meta = json.loads(f.read(meta_length).decode('utf-8'))
+    return {'count': count, 'capacity': capacity, 'heap_length': heap_length,
+            'meta_offset': meta_offset, 'meta_length': meta_length, 'meta': meta}
+
+
+def _write_header(f, count: int, capacity: int, heap_length: int, meta_offset: int, meta_length: int):
+    """Durably write everything else, then the header that makes it live"""
+    f.flush()
+    os.fsync(f.fileno())
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, VERSION, len(FIELDS), count, capacity, heap_length,
+                        meta_offset, meta_length))
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _write_tail(f, layout: Dict, count: int, capacity: int, heap_length: int, meta: Dict):
+    """Write metadata after the heap, then the header"""
+    encoded = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    meta_offset = layout['heap'] + heap_length
+    f.seek(meta_offset)
+    f.write(encoded)
+    f.truncate()
+    _write_header(f, count, capacity, heap_length, meta_offset, len(encoded))
+
+
+def write_bank(questions: List[Dict], path: str, capacity: Optional[int] = None):
+    """Write a question bank in the binary format, replacing any existing file"""
+    capacity = max(len(questions), capacity or 0)
+    layout = _layout(capacity)
+    meta = {'curriculum': [], 'difficulties': [], 'answers': []}
+    encoded = _encode(questions, meta, 0)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w+b') as f:
+            f.truncate(layout['heap'])
+            f.seek(layout['offsets'])
+            f.write(_little_endian(array('Q', [0]) + encoded['ends']))
+            for column in ('curriculum', 'difficulty', 'correct', 'flags'):
+                f.seek(layout[column])
+                f.write(_little_endian(encoded[column]))
+            f.seek(layout['heap'])
+            f.write(encoded['heap'])
+            _write_tail(f, layout, len(questions), capacity, len(encoded['heap']), meta)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def append_bank(questions: List[Dict], path: str):
+    """Append questions to a binary bank, growing its capacity when needed.
+
+    Readers that already have the file open keep seeing the questions
+    that existed when they opened it, and an interrupted append leaves the
+    bank as it was.
+    """
+    with open(path, 'rb') as f:
+        header = _read_header(f)
+    count = header['count']
+    if count + len(questions) > header['capacity']:
+        # Rewrite with room to spare so repeated appends stay amortized O(1)
+        with BinaryBank(path) as bank:
+            existing = bank.questions()
+        write_bank(existing + list(questions), path, capacity=max(2 * header['capacity'], count + len(questions)))
+        return
+
+    layout = _layout(header['capacity'])
+    meta = header['meta']
+    live_meta = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    encoded = _encode(questions, meta, header['heap_length'])
+    heap_length = header['heap_length'] + len(encoded['heap'])
+    new_meta = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    meta_offset = layout['heap'] + heap_length
+    with open(path, 'r+b') as f:
+        # Move the live metadata clear of the heap growth and the new metadata
+        saved_offset = max(header['meta_offset'] + header['meta_length'], meta_offset + len(new_meta))
+        f.seek(saved_offset)
+        f.write(live_meta)
+        _write_header(f, count, header['capacity'], header['heap_length'], saved_offset, len(live_meta))
+
+        # Nothing live lies past the heap now; rows past the old count are unused
+        f.seek(layout['heap'] + header['heap_length'])
+        f.write(encoded['heap'])
+        f.write(new_meta)
+        f.seek(layout['offsets'] + 8 * (count * len(FIELDS) + 1))
+        f.write(_little_endian(encoded['ends']))
+        for column, width in (('curriculum', 2), ('difficulty', 1), ('correct', 1), ('flags', 1)):
+            f.seek(layout[column] + width * count)
+            f.write(_little_endian(encoded[column]))
+        # The stale copy past the new metadata is left for the next append
+        # to overwrite, so a reader that just read the previous header can
+        # still find it
+        _write_header(f, count + len(questions), header['capacity'], heap_length, meta_offset, len(new_meta))
+
+
+class BinaryBank:
+    """Read-only, memory-mapped view of a binary question bank.
+
+    Columns are numpy arrays over the mapping and text fields are read
+    straight from the heap, so opening the bank parses nothing but the
+    header and codebooks. Column arrays and raw() views taken from the bank
+    keep the mapping alive after close(); it is unmapped once the last of
+    them is dropped.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            header = _read_header(self._file)
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        self.count = header['count']
+        meta = header['meta']
+        self.curriculum = [tuple(entry) for entry in meta['curriculum']]
+        self.difficulties = meta['difficulties']
+        self.answers = meta['answers']
+
+        layout = _layout(header['capacity'])
+        self.offsets = np.frombuffer(self._mmap, dtype='<u8', count=self.count * len(FIELDS) + 1,
+                                     offset=layout['offsets'])
+        self.curriculum_codes = np.frombuffer(self._mmap, dtype='<u2', count=self.count, offset=layout['curriculum'])
+        self.difficulty_codes = np.frombuffer(self._mmap, dtype='u1', count=self.count, offset=layout['difficulty'])
+        self.correct_codes = np.frombuffer(self._mmap, dtype='u1', count=self.count, offset=layout['correct'])
+        self.flags = np.frombuffer(self._mmap, dtype='u1', count=self.count, offset=layout['flags'])
+        self.heap = memoryview(self._mmap)[layout['heap']:layout['heap'] + header['heap_length']]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> 'BinaryBank':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mmap is None:
+            return
+        # Views into the mapping must go before it can be closed
+        self.offsets = self.curriculum_codes = self.difficulty_codes = None
+        self.correct_codes = self.flags = None
+        self.heap.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a view; the mapping is freed along with it
+            pass
+        self._file.close()
+        self._mmap = None
+
+    def _position(self, i: int) -> int:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("question index out of range")
+        return i
+
+    def raw(self, i: int, field: str) -> memoryview:
+        """UTF-8 bytes of one field of question i, without copying"""
+        i = self._position(i)
+        start = i * len(FIELDS) + FIELD_INDEX[field]
+        return self.heap[int(self.offsets[start]):int(self.offsets[start + 1])]
+
+    def text(self, i: int, field: str) -> Optional[str]:
+        """One text field of question i, or None when the question has no such key"""
+        i = self._position(i)
+        flags = int(self.flags[i])
+        if (field == 'table' and not flags & HAS_TABLE) or (field == 'latex_formula' and not flags & HAS_LATEX):
+            return None
+        return str(self.raw(i, field), 'utf-8')
+
+    def __getitem__(self, i: int) -> Dict:
+        """Decode question i into the generator's dict shape"""
+        i = self._position(i)
+        F = len(FIELDS)
+        bounds = self.offsets[i * F:(i + 1) * F + 1].tolist()
+        question, table, options, explanation, latex, extras = (
+            str(self.heap[bounds[j]:bounds[j + 1]], 'utf-8') for j in range(F))
+        flags = int(self.flags[i])
+        subject, unit, topic = self.curriculum[self.curriculum_codes[i]]
+
+        q_data = {'question': question}
+        if flags & HAS_TABLE:
+            q_data['table'] = table
+        q_data['options'] = [tuple(option) for option in json.loads(options)]
+        q_data['correct'] = self.answers[self.correct_codes[i]]
+        q_data['explanation'] = explanation
+        if flags & HAS_LATEX:
+            q_data['latex_formula'] = latex
+        elif flags & NULL_LATEX:
+            q_data['latex_formula'] = None
+        q_data['subject'] = subject
+        q_data['unit'] = unit
+        q_data['topic'] = topic
+        q_data['difficulty'] = self.difficulties[self.difficulty_codes[i]]
+        if extras:
+            q_data.update((k, v) for k, v in json.loads(extras))
+        return q_data
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self.count):
+            yield self[i]
+
+    def select(self, topic: Optional[str] = None, difficulty: Optional[str] = None,
+               correct: Optional[str] = None, subject: Optional[str] = None) -> np.ndarray:
+        """Indices of the questions matching every given column value"""
+        mask = np.ones(self.count, dtype=bool)
+        if topic is not None or subject is not None:
+            codes = [code for code, (s, _, t) in enumerate(self.curriculum)
+                     if (topic is None or t == topic) and (subject is None or s == subject)]
+            mask &= np.isin(self.curriculum_codes, codes)
+        for value, book, column in ((difficulty, self.difficulties, self.difficulty_codes),
+                                    (correct, self.answers, self.correct_codes)):
+            if value is not None and value not in book:
+                mask[:] = False
+            elif value is not None:
+                mask &= column == book.index(value)
+        return np.flatnonzero(mask)
+
+    def questions(self, indices=None) -> List[Dict]:
+        """Decode all questions, or the ones at the given indices"""
+        if indices is None:
+            indices = range(self.count)
+        return [self[int(i)] for i in indices]
+
+
+def read_bank(path: str) -> List[Dict]:
+    """Load every question of a binary bank as dicts"""
+    with BinaryBank(path) as bank:
+        return bank.questions()
@@ -0,0 +1,42 @@
+"""
+Shared pytest setup for the test scripts
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# web_interface starts warming the formula cache when imported; formula
+# images aren't under test outside test_formula_renderer
+os.environ.setdefault('FORMULA_WARMING', '0')
+
+
+@contextmanager
+def web_app_charts(**chart_options):
+    """web_interface with charts rendered into a temporary directory, restored afterwards.
+
+    By default charts aren't under test: a zero-length queue skips rendering them.
+    """
+    import web_interface
+    from analytics_charts import ChartRenderer
+
+    original = web_interface.charts
+    with tempfile.TemporaryDirectory() as tmp:
+        web_interface.charts = ChartRenderer(tmp, **(chart_options or {'max_pending': 0}))
+        try:
+            yield web_interface
+        finally:
+            web_interface.charts.shutdown()
+            web_interface.charts = original
+
+
+@pytest.fixture
+def web_app():
+    """The web_interface module, with chart rendering switched off"""
+    try:
+        with web_app_charts() as web_interface:
+            yield web_interface
+    except ImportError as e:
+        pytest.skip(f"Web interface import failed: {e}")
@@ -0,0 +1,128 @@
+"""
+Server-side LaTeX formula rendering with a content-addressed cache.
+
+    python -m formula_renderer              # render every known formula ahead of time
+
+Each distinct formula is rendered once with matplotlib's mathtext, to SVG
+for the web UI and PNG for DOCX export, and stored under a hash of the
+formula and the render settings, so the web app, document generation and
+any other process sharing the cache directory reuse the same files.
+Formulas mathtext cannot parse are remembered as failed (only the latest
+max_failures of them); callers fall back to the raw LaTeX.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+FORMATS = ('svg', 'png')
+
+# Part of every key, so changing how formulas are drawn never serves stale images
+RENDER_SETTINGS = {'version': 1, 'fontsize': 14, 'dpi': 200}
+
+
+def formula_key(latex: str) -> str:
+    """Content hash identifying a formula's rendered images"""
+    encoded = json.dumps([latex, RENDER_SETTINGS], sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def to_mathtext(latex: str) -> str:
+    """Rewrite LaTeX that mathtext lacks: \\text{...} becomes upright text"""
+    return re.sub(r'\\text\{([^}]*)\}', lambda m: r'\mathrm{' + m.group(1).replace(' ', r'\ ') + '}', latex)
+
+
+def render_formula(latex: str, path: str, fmt: str):
+    """Render one formula to an image file"""
+    from matplotlib import mathtext
+    from matplotlib.font_manager import FontProperties
+
+    tmp_path = f"{path}.tmp.{fmt}"
+    try:
+        mathtext.math_to_image(f"${to_mathtext(latex)}$", tmp_path, format=fmt, dpi=RENDER_SETTINGS['dpi'],
+                               prop=FontProperties(size=RENDER_SETTINGS['fontsize']))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def known_formulas() -> List[str]:
+    """Every formula the question generators can attach to a question"""
+    from question_generator import MathQuestionGenerator
+
+    formulas = (list(MathQuestionGenerator.LATEX_FORMULAS.values())
+                + list(MathQuestionGenerator.BATCH_LATEX_FORMULAS.values()))
+    return sorted({f for f in formulas if f})
+
+
+class FormulaCache:
+    """Rendered formula images keyed by content hash, rendered on first use"""
+    # mathtext shares font and parser state process-wide, so renders run one
+    # at a time across every cache
+    lock = threading.Lock()
+
+    def __init__(self, cache_dir: str = 'formula_cache', max_failures: int = 256):
+        self.cache_dir = cache_dir
+        self.max_failures = max_failures
+        self.failed = OrderedDict()
+
+    def path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{fmt}")
+
+    def cached(self, key: str, fmt: str) -> Optional[str]:
+        """Path of a rendered image if it is in the cache"""
+        path = self.path(key, fmt)
+        return path if os.path.exists(path) else None
+
+    def render(self, latex: str) -> Optional[str]:
+        """Make sure a formula is rendered in every format; returns its key, or None if it can't be"""
+        key = formula_key(latex)
+        if all(self.cached(key, fmt) for fmt in FORMATS):
+            return key
+        if key in self.failed:
+            return None
+        with self.lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            try:
+                for fmt in FORMATS:
+                    if not self.cached(key, fmt):
+                        render_formula(latex, self.path(key, fmt), fmt)
+            except Exception as e:
+                self.failed[key] = str(e)
+                while len(self.failed) > self.max_failures:
+                    self.failed.popitem(last=False)
+                return None
+        return key
+
+    def image(self, latex: str, fmt: str = 'png') -> Optional[str]:
+        """Path of a formula's image, rendering it if needed; None if it can't be rendered"""
+        key = self.render(latex)
+        return self.path(key, fmt) if key else None
+
+    def urls(self, formulas: Iterable[Optional[str]], prefix: str = '/formulas') -> Dict[str, str]:
+        """SVG URL for each distinct formula already in the cache; never renders"""
+        urls = {}
+        for latex in set(formulas):
+            key = formula_key(latex) if latex else None
+            if key and self.cached(key, 'svg'):
+                urls[latex] = f"{prefix}/{key}.svg"
+        return urls
+
+    def warm(self, formulas: Optional[Iterable[str]] = None) -> Dict:
+        """Render every known formula (or the given ones) ahead of time"""
+        formulas = known_formulas() if formulas is None else list(formulas)
+        failed = [latex for latex in formulas if self.render(latex) is None]
+        return {'formulas': len(formulas), 'rendered': len(formulas) - len(failed), 'failed': failed}
+
+
+if __name__ == "__main__":
+    result = FormulaCache(sys.argv[1] if len(sys.argv) > 1 else 'formula_cache').warm()
+    print(f"[OK] {result['rendered']} of {result['formulas']} formulas rendered")
+    for latex in result['failed']:
+        print(f"[WARN] Could not render: {latex}")
@@ -5,25 +5,30 @@ import os
 from question_generator import MathQuestionGenerator
 from question_analytics import generate_analytics_report
 from similarity_checker import QuestionSimilarityChecker
+from answer_verifier import AnswerVerifier
+from analytics_charts import ChartRenderer, chart_payload
+from formula_renderer import FormulaCache
 import json
 
-def create_enhanced_word_document():
+def create_enhanced_word_document(questions=None, output_path='Enhanced_Math_Questions.docx'):
     """Create an enhanced Word document with analytics and quality checks"""
     generator = MathQuestionGenerator(difficulty_adaptive=True, latex_support=True)
     
-    # Generate multiple questions for better analysis
-    questions = []
-    for i in range(4):  # Generate 4 questions
-        if i % 2 == 0:
-            q = generator.generate_counting_question()
-        else:
-            q = generator.generate_geometry_question()
-        questions.append(q)
+    # Generate multiple questions for better analysis unless a bank was given
+    if questions is None:
+        questions = []
+        for i in range(4):  # Generate 4 questions
+            if i % 2 == 0:
+                q = generator.generate_counting_question()
+            else:
+                q = generator.generate_geometry_question()
+            questions.append(q)
     
     # Run analytics and similarity checks
     analytics = generate_analytics_report(questions)
     similarity_checker = QuestionSimilarityChecker()
     similarity_report = similarity_checker.batch_similarity_check(questions)
+    verification_report = AnswerVerifier().verify_batch(questions)
 
     # Create enhanced Word document
     doc = Document()
@@ -66,9 +71,28 @@ def create_enhanced_word_document():
     for rec in similarity_report['recommendations']:
         doc.add_paragraph(f"• {rec}", style='List Bullet')
     
+    # Answer verification
+    doc.add_heading('✅ Answer Verification', level=1)
+    doc.add_paragraph(f"Verified Questions: {verification_report['summary']['verified']}")
+    doc.add_paragraph(f"Flagged Questions: {verification_report['summary']['flagged']}")
+    for flag in verification_report['flagged_questions']:
+        doc.add_paragraph(f"• Question {flag['question']}: {'; '.join(flag['issues'])}", style='List Bullet')
+    
+    # Analytics charts
+    renderer = ChartRenderer()
+    try:
+        chart_paths = renderer.render(chart_payload(analytics, similarity_report))
+    finally:
+        renderer.shutdown()
+    if chart_paths:
+        doc.add_heading('📈 Analytics Charts', level=1)
+        for name in sorted(chart_paths):
+            doc.add_picture(chart_paths[name], width=Inches(5.5))
+    
     doc.add_page_break()
 
     # Add all questions with enhanced formatting
+    formula_cache = FormulaCache()
     for i, q in enumerate(questions, 1):
         doc.add_heading(f'Question {i}', level=1)
         
@@ -114,6 +138,16 @@ def create_enhanced_word_document():
             else:
                 para.add_run(f"({letter}) {option}")
         
+        # Formulas are embedded as images from the shared render cache
+        if q.get('latex_formula'):
+            formula_para = doc.add_paragraph()
+            formula_para.add_run("Formula: ").bold = True
+            image = formula_cache.image(q['latex_formula'], 'png')
+            if image:
+                formula_para.add_run().add_picture(image)
+            else:
+                formula_para.add_run(q['latex_formula'])
+
         # Enhanced explanation with formatting
         doc.add_paragraph("\nExplanation:", style='Heading 3')
         doc.add_paragraph(q['explanation'])
@@ -134,14 +168,15 @@ def create_enhanced_word_document():
         doc.add_paragraph("\n" + "="*50 + "\n")
 
     # Save enhanced document
-    doc.save('Enhanced_Math_Questions.docx')
-    print("Enhanced Word document created: Enhanced_Math_Questions.docx")
+    doc.save(output_path)
+    print(f"Enhanced Word document created: {output_path}")
     
     # Save analytics report
     with open('analytics_report.json', 'w') as f:
         json.dump({
             'analytics': analytics,
-            'similarity_report': similarity_report
+            'similarity_report': similarity_report,
+            'verification_report': verification_report
         }, f, indent=2)
     print("Analytics report saved: analytics_report.json")
     
@@ -0,0 +1,112 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from question_generator import MathQuestionGenerator
+
+
+class LearnerSession:
+    """Adaptive state for one learner: a generator and its bounded history"""
+    __slots__ = ('session_id', 'generator', 'last_seen', 'lock')
+
+    def __init__(self, session_id: str, generator: MathQuestionGenerator, last_seen: float):
+        self.session_id = session_id
+        self.generator = generator
+        self.last_seen = last_seen
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def generating(self, difficulty_adaptive: bool = True, latex_support: bool = True) -> Iterator[MathQuestionGenerator]:
+        """Hold the session's generator for one request.
+
+        Concurrent requests for the same learner take turns, so their
+        generation and difficulty history updates don't interleave.
+        Generation settings follow the latest request.
+        """
+        with self.lock:
+            self.generator.difficulty_adaptive = difficulty_adaptive
+            self.generator.latex_support = latex_support
+            yield self.generator
+
+
+class SessionStore:
+    """In-process store of learner sessions with LRU and TTL eviction.
+
+    Sessions are kept in access order, so the least recently used session
+    is always at the front. Expired sessions are therefore also at the
+    front and are dropped there on each access, keeping every operation O(1)
+    amortized no matter how many learners are active.
+    """
+    def __init__(self, max_sessions: int = 200000, ttl_seconds: float = 3600,
+                 history_size: int = 10, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.history_size = history_size
+        self.clock = clock
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+        self.evicted = {'lru': 0, 'ttl': 0}
+
+    def _expire(self, now: float):
+        while self.sessions:
+            oldest = next(iter(self.sessions.values()))
+            if now - oldest.last_seen < self.ttl_seconds:
+                break
+            self.sessions.popitem(last=False)
+            self.evicted['ttl'] += 1
+
+    def get(self, session_id: str) -> Optional[LearnerSession]:
+        """Return a live session and mark it as recently used"""
+        with self.lock:
+            now = self.clock()
+            self._expire(now)
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session.last_seen = now
+                self.sessions.move_to_end(session_id)
+            return session
+
+    def get_or_create(self, session_id: Optional[str] = None, difficulty_adaptive: bool = True,
+                      latex_support: bool = True) -> LearnerSession:
+        """Return the learner's session, starting a new one if needed.
+
+        The settings apply to a new session's generator; use
+        LearnerSession.generating to update them and generate. The
+        difficulty history carries over between requests.
+        """
+        with self.lock:
+            now = self.clock()
+            self._expire(now)
+            if session_id is None:
+                session_id = uuid.uuid4().hex
+            session = self.sessions.get(session_id)
+            if session is None:
+                generator = MathQuestionGenerator(difficulty_adaptive=difficulty_adaptive,
+                                                  latex_support=latex_support,
+                                                  history_size=self.history_size)
+                session = self.sessions[session_id] = LearnerSession(session_id, generator, now)
+                while len(self.sessions) > self.max_sessions:
+                    self.sessions.popitem(last=False)
+                    self.evicted['lru'] += 1
+            else:
+                session.last_seen = now
+                self.sessions.move_to_end(session_id)
+            return session
+
+    def end(self, session_id: str) -> bool:
+        """Discard a learner's session"""
+        with self.lock:
+            return self.sessions.pop(session_id, None) is not None
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                'active_sessions': len(self.sessions),
+                'max_sessions': self.max_sessions,
+                'ttl_seconds': self.ttl_seconds,
+                'evicted_lru': self.evicted['lru'],
+                'evicted_ttl': self.evicted['ttl']
+            }
@@ -0,0 +1,234 @@
+"""
+Local load-testing harness for the question web service.
+
+    python -m load_test --start-server --concurrency 8 --duration 20 -o report.json
+    python -m load_test --url http://127.0.0.1:5000 --rate 25 --duration 60
+
+Closed-loop mode (--concurrency) keeps N requests in flight and measures
+the sustainable throughput. Open-loop mode (--rate) sends requests on a
+fixed schedule and measures latency from each request's scheduled start,
+so queueing delay on an overloaded server is not hidden. --max-p95-ms and
+--max-error-rate turn a run into a regression check with a failing exit
+code.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+# DOCX export rewrites the output files in the server's working directory,
+# so it is off by default; give it a weight to include it in the mix
+DEFAULT_PROFILES = [
+    {'name': 'small_adaptive', 'weight': 5, 'method': 'POST', 'path': '/generate',
+     'json': {'count': 2, 'difficulty': 'adaptive', 'latex': True}},
+    {'name': 'medium_fixed_no_latex', 'weight': 3, 'method': 'POST', 'path': '/generate',
+     'json': {'count': 20, 'difficulty': 'moderate', 'latex': False}},
+    {'name': 'large_paginated', 'weight': 1, 'method': 'POST', 'path': '/generate',
+     'json': {'count': 200, 'difficulty': 'adaptive', 'latex': True, 'paginate': True, 'page_size': 20}},
+    {'name': 'download_txt', 'weight': 1, 'method': 'GET', 'path': '/download/txt'},
+    {'name': 'download_docx', 'weight': 0, 'method': 'GET', 'path': '/download/docx'}
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples: List[Dict], elapsed: float) -> Dict:
+    """Turn raw request samples into throughput, latency and error statistics"""
+    latencies = sorted(s['latency_ms'] for s in samples)
+    errors = sum(1 for s in samples if not s['ok'])
+    status_codes = {}
+    for s in samples:
+        status_codes[str(s['status'])] = status_codes.get(str(s['status']), 0) + 1
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': errors / len(samples) if samples else 0.0,
+        'throughput_rps': len(samples) / elapsed if elapsed > 0 else 0.0,
+        'latency_ms': {
+            'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else 0.0
+        },
+        'status_codes': status_codes
+    }
+
+
+class LoadTester:
+    def __init__(self, base_url: str, profiles: Optional[List[Dict]] = None,
+                 timeout: float = 60, seed: Optional[int] = None):
+        self.base_url = base_url.rstrip('/')
+        self.profiles = [p for p in (profiles or DEFAULT_PROFILES) if p.get('weight', 1) > 0]
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.samples = []
+        self.samples_lock = threading.Lock()
+
+    def pick_profile(self) -> Dict:
+        with self.rng_lock:
+            return self.rng.choices(self.profiles, weights=[p.get('weight', 1) for p in self.profiles])[0]
+
+    def send(self, profile: Dict, scheduled: Optional[float] = None):
+        """Issue one request and record its outcome"""
+        start = scheduled if scheduled is not None else time.perf_counter()
+        body = None
+        headers = {}
+        if 'json' in profile:
+            body = json.dumps(profile['json']).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        req = urllib.request.Request(self.base_url + profile['path'], data=body, headers=headers,
+                                     method=profile.get('method', 'GET'))
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                payload = response.read()
+                status = response.status
+            ok = 200 <= status < 300
+            # The app reports some failures as 200 with success: false
+            if ok and payload[:1] == b'{':
+                parsed = json.loads(payload)
+                ok = parsed.get('success', 'error' not in parsed) is not False
+        except urllib.error.HTTPError as e:
+            status, ok = e.code, False
+        except Exception:
+            status, ok = 'error', False
+        sample = {'profile': profile['name'], 'status': status, 'ok': ok,
+                  'latency_ms': (time.perf_counter() - start) * 1000}
+        with self.samples_lock:
+            self.samples.append(sample)
+
+    def run_closed_loop(self, concurrency: int, duration: float) -> float:
+        """Keep `concurrency` requests in flight for `duration` seconds"""
+        deadline = time.perf_counter() + duration
+
+        def worker():
+            while time.perf_counter() < deadline:
+                self.send(self.pick_profile())
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return time.perf_counter() - start
+
+    def run_open_loop(self, rate: float, duration: float, max_in_flight: int = 256) -> float:
+        """Send `rate` requests per second for `duration` seconds regardless of latency"""
+        interval = 1.0 / rate
+        total = int(rate * duration)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            for i in range(total):
+                scheduled = start + i * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self.send, self.pick_profile(), scheduled)
+        return time.perf_counter() - start
+
+    def report(self, mode: Dict, elapsed: float) -> Dict:
+        per_profile = {}
+        for profile in self.profiles:
+            samples = [s for s in self.samples if s['profile'] == profile['name']]
+            if samples:
+                per_profile[profile['name']] = summarize(samples, elapsed)
+        return dict(summarize(self.samples, elapsed), mode=mode, duration_s=elapsed,
+                    per_profile=per_profile)
+
+
+def start_local_server(host: str = '127.0.0.1', port: int = 0):
+    """Serve the web app in a background thread; returns (server, base_url)"""
+    from werkzeug.serving import make_server
+    from web_interface import app
+
+    server = make_server(host, port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def stop_local_server(server):
+    """Stop a server from start_local_server without waiting on queued chart renders"""
+    import web_interface
+
+    server.shutdown()
+    web_interface.charts.shutdown(cancel_pending=True)
+
+
+def run_load_test(base_url: str, concurrency: Optional[int] = None, rate: Optional[float] = None,
+                  duration: float = 10, profiles: Optional[List[Dict]] = None,
+                  seed: Optional[int] = None) -> Dict:
+    """Run one load test against base_url and return the JSON-ready report"""
+    tester = LoadTester(base_url, profiles, seed=seed)
+    if rate:
+        elapsed = tester.run_open_loop(rate, duration)
+        mode = {'type': 'open_loop', 'target_rps': rate}
+    else:
+        elapsed = tester.run_closed_loop(concurrency or 1, duration)
+        mode = {'type': 'closed_loop', 'concurrency': concurrency or 1}
+    return tester.report(mode, elapsed)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='load_test', description='Load test the question web service')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--url', help='base URL of a running server')
+    target.add_argument('--start-server', action='store_true', help='serve the app in-process')
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument('--concurrency', type=int, default=4, help='closed loop: requests in flight')
+    load.add_argument('--rate', type=float, help='open loop: requests per second')
+    parser.add_argument('--duration', type=float, default=10, help='seconds')
+    parser.add_argument('--profiles', help='JSON file with a list of request profiles')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('-o', '--output', help='write the JSON report here')
+    parser.add_argument('--max-p95-ms', type=float, help='fail if p95 latency exceeds this')
+    parser.add_argument('--max-error-rate', type=float, help='fail if the error rate exceeds this')
+    args = parser.parse_args(argv)
+
+    profiles = None
+    if args.profiles:
+        with open(args.profiles, encoding='utf-8') as f:
+            profiles = json.load(f)
+
+    server = None
+    base_url = args.url
+    if args.start_server:
+        server, base_url = start_local_server()
+    try:
+        report = run_load_test(base_url, args.concurrency, args.rate, args.duration, profiles, args.seed)
+    finally:
+        if server is not None:
+            stop_local_server(server)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+    failed = False
+    if args.max_p95_ms is not None and report['latency_ms']['p95'] > args.max_p95_ms:
+        print(f"[FAIL] p95 latency {report['latency_ms']['p95']:.1f} ms > {args.max_p95_ms} ms", file=sys.stderr)
+        failed = True
+    if args.max_error_rate is not None and report['error_rate'] > args.max_error_rate:
+        print(f"[FAIL] error rate {report['error_rate']:.3f} > {args.max_error_rate}", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,10 @@ from typing import Dict, List
 from datetime import datetime
 import statistics
 
+# Bump whenever a change here alters the analysis of an unchanged question;
+# persisted analyses from other versions are discarded
+ANALYTICS_VERSION = 1
+
 class QuestionAnalytics:
     def __init__(self):
         self.metrics = {
@@ -139,11 +143,18 @@ class QuestionAnalytics:
         bonus = len(engagement_factors) * 0.15
         return min(1.0, base_score + bonus)
 
-def generate_analytics_report(questions: List[Dict]) -> Dict:
-    """Generate comprehensive analytics report"""
-    analyzer = QuestionAnalytics()
+def generate_analytics_report(questions: List[Dict], analyses: List[Dict] = None, cache=None) -> Dict:
+    """Generate comprehensive analytics report
     
-    analyses = [analyzer.analyze_question_quality(q) for q in questions]
+    Per-question analyses computed earlier can be passed in to skip
+    re-analyzing the questions. With an AnalysisCache, only questions it
+    hasn't seen are analyzed.
+    """
+    if analyses is None and cache is not None:
+        analyses = cache.analyze_many(questions)
+    elif analyses is None:
+        analyzer = QuestionAnalytics()
+        analyses = [analyzer.analyze_question_quality(q) for q in questions]
     
     report = {
         'summary': {
@@ -172,10 +183,56 @@ def generate_analytics_report(questions: List[Dict]) -> Dict:
     report['summary']['quality_score'] = statistics.mean(quality_factors)
     
     # Generate recommendations
-    if report['summary']['avg_readability'] < 60:
-        report['recommendations'].append("Consider simplifying question language for better readability")
+    report['recommendations'] = analytics_recommendations(report['summary'])
+    
+    return report
+
+def analytics_recommendations(summary: Dict) -> List[str]:
+    """Recommendations for an analytics report summary"""
+    recommendations = []
+    if summary['avg_readability'] < 60:
+        recommendations.append("Consider simplifying question language for better readability")
+    
+    if summary['avg_engagement'] < 0.7:
+        recommendations.append("Add more real-world contexts and visual elements")
+    
+    return recommendations
+
+class RunningAnalytics:
+    """Builds the analytics report summary one question at a time
+    
+    Produces the report generate_analytics_report would, without the
+    per-question list, for streams too large to hold in memory.
+    """
+    def __init__(self):
+        self.total_questions = 0
+        self.readability = 0.0
+        self.engagement = 0.0
+        self.option_balance = 0.0
+        self.difficulty_distribution = {}
     
-    if report['summary']['avg_engagement'] < 0.7:
-        report['recommendations'].append("Add more real-world contexts and visual elements")
+    def add(self, question: Dict, analysis: Dict):
+        self.total_questions += 1
+        self.readability += analysis['readability_score']
+        self.engagement += analysis['engagement_score']
+        self.option_balance += analysis['option_balance']['score']
+        difficulty = question.get('difficulty', 'moderate')
+        self.difficulty_distribution[difficulty] = self.difficulty_distribution.get(difficulty, 0) + 1
     
-    return report
\ No newline at end of file
+    def report(self) -> Dict:
+        count = self.total_questions
+        if not count:
+            raise statistics.StatisticsError("no questions were added")
+        summary = {
+            'total_questions': count,
+            'avg_readability': self.readability / count,
+            'avg_engagement': self.engagement / count,
+            'difficulty_distribution': dict(self.difficulty_distribution),
+            'quality_score': statistics.mean([self.readability / count / 100, self.engagement / count,
+                                              self.option_balance / count])
+        }
+        return {
+            'summary': summary,
+            'recommendations': analytics_recommendations(summary),
+            'generated_at': datetime.now().isoformat()
+        }
\ No newline at end of file
@@ -0,0 +1,40 @@
+import json
+from typing import Dict, List
+
+from question_generator import MathQuestionGenerator
+
+
+def _normalize(q_data: Dict) -> Dict:
+    # JSON turns option tuples into lists; restore the generator's shape
+    if 'options' in q_data:
+        q_data['options'] = [tuple(option) for option in q_data['options']]
+    return q_data
+
+
+def load_questions(path: str) -> List[Dict]:
+    """Load a question bank from a .json array, a .jsonl or a binary .mqb file"""
+    if path.endswith('.mqb'):
+        from binary_bank import read_bank
+        return read_bank(path)
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            return [_normalize(json.loads(line)) for line in f if line.strip()]
+        return [_normalize(q) for q in json.load(f)]
+
+
+def save_questions(questions: List[Dict], path: str, title: str = "Math Assessment"):
+    """Save a question bank as .json, .jsonl, binary .mqb or @-tag formatted .txt"""
+    if path.endswith('.mqb'):
+        from binary_bank import write_bank
+        write_bank(questions, path)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for q in questions:
+                f.write(json.dumps(q, ensure_ascii=False) + '\n')
+        elif path.endswith('.txt'):
+            generator = MathQuestionGenerator()
+            for i, q in enumerate(questions, 1):
+                f.write(generator.format_question(q, i, title))
+        else:
+            json.dump(questions, f, ensure_ascii=False, indent=2)
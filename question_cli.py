@@ -0,0 +1,279 @@
+"""
+Command-line tool for bulk question generation and bank maintenance.
+
+    python -m question_cli generate -n 1000 -o bank.jsonl
+    python -m question_cli analyze bank.jsonl -o report.json
+    python -m question_cli similarity bank.jsonl
+    python -m question_cli verify bank.jsonl
+    python -m question_cli docx bank.jsonl -o bank.docx
+
+Sharded generation across machines:
+
+    python -m question_cli shard-plan shards/ -n 1000000 --shard-size 50000
+    python -m question_cli shard-run shards/ 7          # on any machine
+    python -m question_cli shard-local shards/ -w 4     # or all shards locally
+    python -m question_cli shard-merge shards/ -o bank.jsonl
+
+Streaming generate -> analyze -> dedupe -> export with per-stage stats:
+
+    python -m question_cli pipeline out/ -n 100000 -w 4
+
+Only the standard library and the lightweight core modules are imported at
+startup, so cron-driven batch jobs don't pay for imports they never use.
+python-docx is imported by `docx` alone; numpy by `verify`, `--batch`
+generation and reading or writing .mqb banks. `generate`, `analyze` and
+`similarity` on JSON banks stay numpy-free.
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+
+def _write_report(report, output: Optional[str]):
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved: {output}")
+
+
+def cmd_generate(args) -> int:
+    import random
+    from question_generator import MathQuestionGenerator
+    from question_bank import save_questions
+
+    if args.batch:
+        from batch_generators import BatchQuestionGenerator
+        difficulties = None
+        if not args.no_adaptive:
+            # Adaptive difficulty depends on the questions before it, so the labels are drawn in order up front
+            pacer = MathQuestionGenerator(rng=random.Random(args.seed))
+            difficulties = [pacer.next_difficulty() for _ in range(args.count)]
+        generator = BatchQuestionGenerator(latex_support=not args.no_latex, seed=args.seed)
+        questions = generator.generate_mixed(args.count, difficulties=difficulties)
+        save_questions(questions, args.output, args.title)
+        print(f"[SUCCESS] {len(questions)} questions written to {args.output}")
+        return 0
+
+    generator = MathQuestionGenerator(difficulty_adaptive=not args.no_adaptive,
+                                      latex_support=not args.no_latex, rng=random.Random(args.seed))
+    questions = []
+    for i in range(args.count):
+        if i % 2 == 0:
+            q = generator.generate_counting_question()
+        else:
+            q = generator.generate_geometry_question()
+        questions.append(q)
+
+    save_questions(questions, args.output, args.title)
+    print(f"[SUCCESS] {len(questions)} questions written to {args.output}")
+    return 0
+
+
+def cmd_analyze(args) -> int:
+    from question_analytics import generate_analytics_report
+    from question_bank import load_questions
+
+    questions = load_questions(args.bank)
+    if args.no_cache:
+        report = generate_analytics_report(questions)
+    else:
+        from analysis_cache import AnalysisCache
+        cache = AnalysisCache(args.cache)
+        try:
+            report = generate_analytics_report(questions, cache=cache)
+        finally:
+            cache.close()
+        print(f"[CACHE] {cache.hits} cached, {cache.misses} analyzed")
+    summary = report['summary']
+    print(f"[ANALYTICS] Questions: {summary['total_questions']}")
+    print(f"[ANALYTICS] Quality Score: {summary['quality_score']*100:.1f}%")
+    print(f"[ANALYTICS] Average Readability: {summary['avg_readability']:.1f}")
+    print(f"[ANALYTICS] Engagement Score: {summary['avg_engagement']*100:.1f}%")
+    for rec in report['recommendations']:
+        print(f"  - {rec}")
+    _write_report(report, args.output)
+    return 0
+
+
+def cmd_similarity(args) -> int:
+    from similarity_checker import QuestionSimilarityChecker
+    from question_bank import load_questions
+
+    report = QuestionSimilarityChecker().batch_similarity_check(load_questions(args.bank))
+    summary = report['summary']
+    print(f"[SIMILARITY] Comparisons: {summary['total_comparisons']}")
+    print(f"[SIMILARITY] Average Similarity: {summary['average_similarity']*100:.1f}%")
+    print(f"[SIMILARITY] High-Risk Pairs: {summary['high_risk_pairs']}")
+    for rec in report['recommendations']:
+        print(f"  - {rec}")
+    _write_report(report, args.output)
+    return 0
+
+
+def cmd_verify(args) -> int:
+    from answer_verifier import AnswerVerifier
+    from question_bank import load_questions
+
+    report = AnswerVerifier().verify_batch(load_questions(args.bank))
+    summary = report['summary']
+    print(f"[VERIFY] Verified: {summary['verified']}, Unverified: {summary['unverified']}, Flagged: {summary['flagged']}")
+    for flag in report['flagged_questions']:
+        print(f"  - Question {flag['question']}: {'; '.join(flag['issues'])}")
+    _write_report(report, args.output)
+    return 1 if summary['flagged'] else 0
+
+
+def cmd_docx(args) -> int:
+    from generate_document import create_enhanced_word_document
+    from question_bank import load_questions
+
+    create_enhanced_word_document(load_questions(args.bank), args.output)
+    return 0
+
+
+def cmd_shard_plan(args) -> int:
+    from sharded_generation import create_manifest
+
+    topic_mix = None
+    if args.topic_mix:
+        topic_mix = {}
+        for item in args.topic_mix:
+            topic, _, weight = item.rpartition('=')
+            topic_mix[topic] = float(weight)
+    manifest = create_manifest(args.directory, args.count, topic_mix, args.shard_size,
+                               args.seed, latex_support=not args.no_latex)
+    print(f"[SHARDS] {len(manifest['shards'])} shards planned in {args.directory}")
+    return 0
+
+
+def cmd_shard_run(args) -> int:
+    from sharded_generation import generate_shard
+
+    print(f"[SHARDS] Shard written: {generate_shard(args.directory, args.shard_id)}")
+    return 0
+
+
+def cmd_shard_local(args) -> int:
+    from sharded_generation import run_local
+
+    result = run_local(args.directory, args.workers)
+    print(f"[SHARDS] Generated: {len(result['generated'])}, Failed: {len(result['failed'])}")
+    for shard_id, error in result['failed'].items():
+        print(f"  - Shard {shard_id}: {error}")
+    return 1 if result['failed'] else 0
+
+
+def cmd_shard_merge(args) -> int:
+    from sharded_generation import merge_shards, shard_status
+
+    pending = shard_status(args.directory)['pending']
+    if pending:
+        print(f"[SHARDS] Cannot merge, shards still pending: {pending}")
+        return 1
+    result = merge_shards(args.directory, args.output, args.chunk_size)
+    print(f"[SHARDS] {result['unique_questions']} unique questions written to {result['output']} "
+          f"({result['duplicates_dropped']} duplicates dropped)")
+    return 0
+
+
+def cmd_pipeline(args) -> int:
+    from question_pipeline import run_question_pipeline
+
+    stats = run_question_pipeline(args.count, args.directory, args.batch_size, args.workers, args.queue_size,
+                                  args.seed, latex_support=not args.no_latex,
+                                  difficulty_adaptive=not args.no_adaptive, use_processes=not args.threads)
+    print(f"[PIPELINE] {stats['exported']} questions exported to {args.directory} "
+          f"({stats['duplicates_dropped']} duplicates dropped) in {stats['elapsed_seconds']:.1f}s")
+    for name, stage in stats['stages'].items():
+        print(f"  - {name}: {stage['throughput_per_s']:.0f} items/s, utilization {stage['utilization']*100:.0f}%, "
+              f"queue {stage['queue']['mean_occupancy']:.1f}/{stage['queue']['capacity']}")
+    print(f"[PIPELINE] Bottleneck: {stats['bottleneck']}")
+    _write_report(stats, args.output)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='question_cli', description='Math question bank tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate = subparsers.add_parser('generate', help='generate N questions to a file')
+    generate.add_argument('-n', '--count', type=int, default=10)
+    generate.add_argument('-o', '--output', required=True, help='.json, .jsonl, .mqb or .txt')
+    generate.add_argument('--title', default='Math Assessment')
+    generate.add_argument('--seed', type=int)
+    generate.add_argument('--no-latex', action='store_true')
+    generate.add_argument('--no-adaptive', action='store_true')
+    generate.add_argument('--batch', action='store_true',
+                          help='vectorized generation cycling through every curriculum topic')
+    generate.set_defaults(func=cmd_generate)
+
+    commands = {}
+    for name, func, help_text in (
+        ('analyze', cmd_analyze, 'quality analytics for a bank'),
+        ('similarity', cmd_similarity, 'pairwise similarity check for a bank'),
+        ('verify', cmd_verify, 're-solve and verify every answer in a bank'),
+    ):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument('bank', help='.json, .jsonl or .mqb question bank')
+        command.add_argument('-o', '--output', help='write the full JSON report here')
+        command.set_defaults(func=func)
+        commands[name] = command
+    commands['analyze'].add_argument('--cache', default='analysis_cache.sqlite',
+                                     help='persistent per-question analysis cache')
+    commands['analyze'].add_argument('--no-cache', action='store_true')
+
+    docx = subparsers.add_parser('docx', help='render a bank as a Word document')
+    docx.add_argument('bank', help='.json, .jsonl or .mqb question bank')
+    docx.add_argument('-o', '--output', default='Enhanced_Math_Questions.docx')
+    docx.set_defaults(func=cmd_docx)
+
+    plan = subparsers.add_parser('shard-plan', help='split a bank into shards and write the manifest')
+    plan.add_argument('directory')
+    plan.add_argument('-n', '--count', type=int, required=True)
+    plan.add_argument('--shard-size', type=int, default=10000)
+    plan.add_argument('--topic-mix', nargs='*', metavar='TOPIC=WEIGHT')
+    plan.add_argument('--seed', type=int, default=0)
+    plan.add_argument('--no-latex', action='store_true')
+    plan.set_defaults(func=cmd_shard_plan)
+
+    run = subparsers.add_parser('shard-run', help='generate one shard of a manifest')
+    run.add_argument('directory')
+    run.add_argument('shard_id', type=int)
+    run.set_defaults(func=cmd_shard_run)
+
+    local = subparsers.add_parser('shard-local', help='generate all pending shards on this machine')
+    local.add_argument('directory')
+    local.add_argument('-w', '--workers', type=int, default=2)
+    local.set_defaults(func=cmd_shard_local)
+
+    merge = subparsers.add_parser('shard-merge', help='merge shards and drop duplicate questions')
+    merge.add_argument('directory')
+    merge.add_argument('-o', '--output', required=True, help='.jsonl bank')
+    merge.add_argument('--chunk-size', type=int, default=100000)
+    merge.set_defaults(func=cmd_shard_merge)
+
+    pipeline = subparsers.add_parser('pipeline', help='streaming generate, analyze, dedupe and export')
+    pipeline.add_argument('directory', help='output directory')
+    pipeline.add_argument('-n', '--count', type=int, default=1000)
+    pipeline.add_argument('--batch-size', type=int, default=100)
+    pipeline.add_argument('-w', '--workers', type=int, default=2, help='workers for generate and analyze')
+    pipeline.add_argument('--queue-size', type=int, default=4, help='batches buffered between stages')
+    pipeline.add_argument('--seed', type=int, default=0)
+    pipeline.add_argument('--no-latex', action='store_true')
+    pipeline.add_argument('--no-adaptive', action='store_true')
+    pipeline.add_argument('--threads', action='store_true', help='use threads instead of worker processes')
+    pipeline.add_argument('-o', '--output', help='write the pipeline stats here')
+    pipeline.set_defaults(func=cmd_pipeline)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,54 +4,129 @@ import math
 from typing import List, Dict, Tuple
 from datetime import datetime
 
+class RingBuffer:
+    """Fixed-size history that overwrites its oldest entry once full"""
+    __slots__ = ('items', 'start', 'size')
+    
+    def __init__(self, capacity: int):
+        self.items = [None] * capacity
+        self.start = 0
+        self.size = 0
+    
+    def append(self, item):
+        capacity = len(self.items)
+        if self.size < capacity:
+            self.items[(self.start + self.size) % capacity] = item
+            self.size += 1
+        else:
+            self.items[self.start] = item
+            self.start = (self.start + 1) % capacity
+    
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('history index out of range')
+        return self.items[(self.start + index) % len(self.items)]
+    
+    def __iter__(self):
+        for i in range(self.size):
+            yield self[i]
+
 class MathQuestionGenerator:
-    def __init__(self, difficulty_adaptive=True, latex_support=True):
+    # Shared by every instance so per-learner generators stay small
+    CURRICULUM = {
+        "Quantitative Math": {
+            "Data Analysis & Probability": [
+                "Counting & Arrangement Problems",
+                "Probability (Basic, Compound Events)",
+                "Mean, Median, Mode, & Range"
+            ],
+            "Geometry and Measurement": [
+                "Area & Volume",
+                "Solid Figures (Volume of Cubes)",
+                "Coordinate Geometry"
+            ],
+            "Numbers and Operations": [
+                "Fractions, Decimals, & Percents",
+                "Basic Number Theory"
+            ]
+        }
+    }
+    
+    # Topics that have a question generator, mapped to the generating method
+    TOPIC_GENERATORS = {
+        "Counting & Arrangement Problems": "generate_counting_question",
+        "Solid Figures (Volume of Cubes)": "generate_geometry_question"
+    }
+    
+    # LaTeX attached to questions by formula type; formula_renderer pre-renders these
+    LATEX_FORMULAS = {
+        'combination': r'C(n,r) = \frac{n!}{r!(n-r)!}',
+        'permutation': r'P(n,r) = \frac{n!}{(n-r)!}',
+        'volume_sphere': r'V = \frac{4}{3}\pi r^3',
+        'volume_cylinder': r'V = \pi r^2 h',
+        'area_circle': r'A = \pi r^2'
+    }
+    
+    # LaTeX attached by batch_generators, kept here so formula_renderer can list it without NumPy
+    BATCH_LATEX_FORMULAS = {
+        'probability': r'P(A) = \frac{\text{favorable outcomes}}{\text{total outcomes}}',
+        'independent': r'P(A \cap B) = P(A) \cdot P(B)',
+        'mean': r'\bar{x} = \frac{1}{n}\sum_{i=1}^{n} x_i',
+        'range': r'R = x_{max} - x_{min}',
+        'area_rectangle': r'A = l \times w',
+        'area_triangle': r'A = \frac{1}{2}bh',
+        'volume_prism': r'V = l \times w \times h',
+        'distance': r'd = \sqrt{(x_2 - x_1)^2 + (y_2 - y_1)^2}',
+        'midpoint': r'M = \left(\frac{x_1 + x_2}{2}, \frac{y_1 + y_2}{2}\right)',
+        'percent_of': r'p\% \text{ of } n = \frac{p}{100} \times n',
+        'fraction_percent': r'\frac{a}{b} = \frac{a}{b} \times 100\%',
+        'decimal_fraction': r'0.d_1d_2 = \frac{d_1d_2}{100}',
+        'fraction_decimal': r'\frac{a}{b} = a \div b',
+        'gcd_lcm': r'\gcd(a,b) \cdot \operatorname{lcm}(a,b) = a \cdot b'
+    }
+    
+    def __init__(self, difficulty_adaptive=True, latex_support=True, history_size=10, rng=None):
         self.difficulty_adaptive = difficulty_adaptive
+        # A random.Random gives the generator its own reproducible stream;
+        # by default it shares the global random module
+        self.rng = rng if rng is not None else random
         self.latex_support = latex_support
-        self.question_history = []
+        # Ring buffer of recent difficulties; appends are O(1) and memory is bounded
+        self.question_history = RingBuffer(history_size)
         self.difficulty_weights = {'easy': 0.4, 'moderate': 0.4, 'hard': 0.2}
-        self.curriculum = {
-            "Quantitative Math": {
-                "Data Analysis & Probability": [
-                    "Counting & Arrangement Problems",
-                    "Probability (Basic, Compound Events)",
-                    "Mean, Median, Mode, & Range"
-                ],
-                "Geometry and Measurement": [
-                    "Area & Volume",
-                    "Solid Figures (Volume of Cubes)",
-                    "Coordinate Geometry"
-                ],
-                "Numbers and Operations": [
-                    "Fractions, Decimals, & Percents",
-                    "Basic Number Theory"
-                ]
-            }
-        }
+        self.curriculum = self.CURRICULUM
     
     def generate_latex_formula(self, formula_type: str) -> str:
         """Generate LaTeX formulas for enhanced questions"""
-        formulas = {
-            'combination': r'C(n,r) = \frac{n!}{r!(n-r)!}',
-            'permutation': r'P(n,r) = \frac{n!}{(n-r)!}',
-            'volume_sphere': r'V = \frac{4}{3}\pi r^3',
-            'volume_cylinder': r'V = \pi r^2 h',
-            'area_circle': r'A = \pi r^2'
-        }
-        return formulas.get(formula_type, '')
+        return self.LATEX_FORMULAS.get(formula_type, '')
     
     def adaptive_difficulty(self) -> str:
         """Dynamically adjust difficulty based on question history"""
         if not self.difficulty_adaptive or len(self.question_history) < 3:
-            return random.choices(['easy', 'moderate', 'hard'], 
+            return self.rng.choices(['easy', 'moderate', 'hard'], 
                                 weights=[0.4, 0.4, 0.2])[0]
         
-        recent_difficulties = [q.get('difficulty', 'moderate') for q in self.question_history[-3:]]
+        recent_difficulties = [self.question_history[i] for i in range(-3, 0)]
         if recent_difficulties.count('easy') >= 2:
-            return random.choice(['moderate', 'hard'])
+            return self.rng.choice(['moderate', 'hard'])
         elif recent_difficulties.count('hard') >= 2:
-            return random.choice(['easy', 'moderate'])
-        return random.choice(['easy', 'moderate', 'hard'])
+            return self.rng.choice(['easy', 'moderate'])
+        return self.rng.choice(['easy', 'moderate', 'hard'])
+    
+    def next_difficulty(self) -> str:
+        """Pick the difficulty for the next question and record it in the history"""
+        difficulty = self.adaptive_difficulty()
+        self.question_history.append(difficulty)
+        return difficulty
     
     def generate_counting_question(self) -> Dict:
         """Generate a counting/combination question similar to the uniform question"""
@@ -79,30 +154,30 @@ class MathQuestionGenerator:
             }
         ]
         
-        scenario = random.choice(scenarios)
+        scenario = self.rng.choice(scenarios)
         correct_answer = len(scenario["item1_options"]) * len(scenario["item2_options"])
         
         # Generate wrong answers
         options = [correct_answer]
         while len(options) < 5:
-            wrong = random.choice([
+            wrong = self.rng.choice([
                 len(scenario["item1_options"]) + len(scenario["item2_options"]),
                 len(scenario["item1_options"]),
                 len(scenario["item2_options"]),
-                correct_answer + random.randint(1, 5),
-                correct_answer - random.randint(1, 3) if correct_answer > 3 else correct_answer + 2
+                correct_answer + self.rng.randint(1, 5),
+                correct_answer - self.rng.randint(1, 3) if correct_answer > 3 else correct_answer + 2
             ])
             if wrong > 0 and wrong not in options:
                 options.append(wrong)
         
-        random.shuffle(options)
+        self.rng.shuffle(options)
         correct_index = options.index(correct_answer)
         
         return {
             "question": f"Each student choosing from the {scenario['context']} selects 1 {scenario['item1']} and 1 {scenario['item2']}. The table shows the options available. {scenario['question']}",
             "table": f"| {scenario['item1'].title()} | {scenario['item2'].title()} |\n|:---:|:---:|\n" + 
-                    "\n".join([f"| {opt} | {scenario['item2_options'][i] if i < len(scenario['item2_options']) else ''} |" 
-                              for i, opt in enumerate(scenario['item1_options'])]),
+                    "\n".join([f"| {scenario['item1_options'][i] if i < len(scenario['item1_options']) else ''} | {scenario['item2_options'][i] if i < len(scenario['item2_options']) else ''} |" 
+                              for i in range(max(len(scenario['item1_options']), len(scenario['item2_options'])))]),
             "options": [(chr(65+i), str(opt)) for i, opt in enumerate(options)],
             "correct": chr(65 + correct_index),
             "explanation": f"Using the multiplication principle: {len(scenario['item1_options'])} {scenario['item1']} options × {len(scenario['item2_options'])} {scenario['item2']} options = {correct_answer} total combinations.\n\n**Real-world application:** {scenario['real_world']}\n\n**Formula:** For independent choices, total combinations = n₁ × n₂",
@@ -110,7 +185,7 @@ class MathQuestionGenerator:
             "subject": "Quantitative Math",
             "unit": "Data Analysis & Probability", 
             "topic": "Counting & Arrangement Problems",
-            "difficulty": self.adaptive_difficulty(),
+            "difficulty": self.next_difficulty(),
             "cognitive_load": "low" if correct_answer <= 12 else "medium"
         }
     
@@ -140,42 +215,40 @@ class MathQuestionGenerator:
             }
         ]
         
-        scenario = random.choice(scenarios)
+        scenario = self.rng.choice(scenarios)
         r = scenario["radius"]
         
         if "2×2 grid" in scenario["arrangement"]:
             length = 4 * r
             width = 4 * r  
             height = 2 * r
-            correct = f"{int(length)} × {int(width)} × {int(height)}"
         elif "2×2×2" in scenario["arrangement"]:
             length = 4 * r
             width = 4 * r
-            height = 6 * r
-            correct = f"{int(length)} × {int(width)} × {int(height)}"
+            height = 4 * r
         else:  # 2×3×1
             length = 4 * r
             width = 6 * r
             height = 2 * r
-            correct = f"{int(length)} × {int(width)} × {int(height)}"
+        correct = self.format_dimensions(length, width, height)
         
         # Generate options
         options = [correct]
-        base_dims = [int(length), int(width), int(height)]
+        base_dims = [length, width, height]
         
         while len(options) < 5:
             # Create variations
             variation = [
-                f"{base_dims[0]//2} × {base_dims[1]} × {base_dims[2]}",
-                f"{base_dims[0]} × {base_dims[1]//2} × {base_dims[2]}",
-                f"{base_dims[0]+2} × {base_dims[1]+2} × {base_dims[2]+2}",
-                f"{base_dims[0]-1} × {base_dims[1]-1} × {base_dims[2]}"
+                self.format_dimensions(base_dims[0]/2, base_dims[1], base_dims[2]),
+                self.format_dimensions(base_dims[0], base_dims[1]/2, base_dims[2]),
+                self.format_dimensions(base_dims[0]+2, base_dims[1]+2, base_dims[2]+2),
+                self.format_dimensions(base_dims[0]-1, base_dims[1]-1, base_dims[2])
             ]
             for var in variation:
                 if var not in options and len(options) < 5:
                     options.append(var)
         
-        random.shuffle(options)
+        self.rng.shuffle(options)
         correct_index = options.index(correct)
         
         return {
@@ -187,10 +260,20 @@ class MathQuestionGenerator:
             "subject": "Quantitative Math",
             "unit": "Geometry and Measurement",
             "topic": "Solid Figures (Volume of Cubes)",
-            "difficulty": self.adaptive_difficulty(),
+            "difficulty": self.next_difficulty(),
             "spatial_reasoning": "high"
         }
     
+    def generate_question(self, topic: str) -> Dict:
+        """Generate a question for any topic that has a generator"""
+        if topic not in self.TOPIC_GENERATORS:
+            raise ValueError(f"No generator for topic: {topic}")
+        return getattr(self, self.TOPIC_GENERATORS[topic])()
+    
+    def format_dimensions(self, *dims: float) -> str:
+        """Format container dimensions without truncating fractional values"""
+        return " × ".join(f"{d:g}" for d in dims)
+    
     def format_question(self, q_data: Dict, question_num: int, title: str = "Math Assessment") -> str:
         """Format question according to specified output format"""
         if question_num == 1:
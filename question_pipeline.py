@@ -0,0 +1,268 @@
+"""
+Streaming generate -> analyze -> dedupe -> export pipeline.
+
+    python -m question_cli pipeline pipeline_out/ -n 100000 -w 4
+
+Every stage is a set of asyncio workers reading batches from a bounded
+queue and writing their results to the next stage's queue, so the stages
+overlap and at most a few batches per stage are in memory at once. A
+stage that falls behind fills its input queue, and the stages upstream
+block on put until it catches up. CPU-heavy stages run their function on
+an executor. The run reports each stage's throughput, utilization, time
+blocked on backpressure and input queue occupancy; the busiest stage is
+the bottleneck.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from question_analytics import QuestionAnalytics, RunningAnalytics
+from question_generator import MathQuestionGenerator
+from sharded_generation import question_fingerprint
+
+_DONE = object()
+
+
+class Stage:
+    """One pipeline step: fn maps an input batch to an output batch, or None to emit nothing"""
+    def __init__(self, name: str, fn: Callable, workers: int = 1,
+                 executor: Optional[Executor] = None, queue_size: int = 4):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.executor = executor
+        self.queue_size = queue_size
+        self.batches_in = 0
+        self.items_in = 0
+        self.items_out = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        # Running queue occupancy aggregates, so long runs don't keep samples
+        self.samples = 0
+        self.occupancy_total = 0
+        self.occupancy_max = 0
+        self.full_samples = 0
+
+    def sample(self, occupancy: int):
+        self.samples += 1
+        self.occupancy_total += occupancy
+        self.occupancy_max = max(self.occupancy_max, occupancy)
+        if occupancy >= self.queue_size:
+            self.full_samples += 1
+
+    def stats(self, elapsed: float) -> Dict:
+        samples = self.samples
+        return {
+            'workers': self.workers,
+            'batches_in': self.batches_in,
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'throughput_per_s': self.items_in / elapsed if elapsed > 0 else 0.0,
+            'busy_seconds': self.busy_seconds,
+            'utilization': self.busy_seconds / (elapsed * self.workers) if elapsed > 0 else 0.0,
+            'blocked_on_put_seconds': self.blocked_seconds,
+            'queue': {
+                'capacity': self.queue_size,
+                'mean_occupancy': self.occupancy_total / samples if samples else 0.0,
+                'max_occupancy': self.occupancy_max,
+                'full_fraction': self.full_samples / samples if samples else 0.0
+            }
+        }
+
+
+class Pipeline:
+    """Runs stages concurrently, each fed by a bounded queue"""
+    def __init__(self, stages: List[Stage], sample_interval: float = 0.01):
+        self.stages = stages
+        self.sample_interval = sample_interval
+
+    async def _worker(self, stage: Stage, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue]):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await inbox.get()
+            if batch is _DONE:
+                return
+            stage.batches_in += 1
+            stage.items_in += len(batch) if isinstance(batch, list) else 1
+            start = time.perf_counter()
+            if stage.executor is None:
+                result = stage.fn(batch)
+            else:
+                result = await loop.run_in_executor(stage.executor, stage.fn, batch)
+            stage.busy_seconds += time.perf_counter() - start
+            if result is None:
+                continue
+            stage.items_out += len(result) if isinstance(result, list) else 1
+            if outbox is not None:
+                start = time.perf_counter()
+                await outbox.put(result)
+                stage.blocked_seconds += time.perf_counter() - start
+
+    async def _run_stage(self, stage: Stage, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue],
+                         next_workers: int):
+        await asyncio.gather(*(self._worker(stage, inbox, outbox) for _ in range(stage.workers)))
+        if outbox is not None:
+            for _ in range(next_workers):
+                await outbox.put(_DONE)
+
+    async def _feed(self, items: Iterable, inbox: asyncio.Queue, workers: int):
+        for item in items:
+            await inbox.put(item)
+        for _ in range(workers):
+            await inbox.put(_DONE)
+
+    async def _sample(self, queues: List[asyncio.Queue]):
+        while True:
+            for stage, queue in zip(self.stages, queues):
+                stage.sample(queue.qsize())
+            await asyncio.sleep(self.sample_interval)
+
+    async def run(self, items: Iterable) -> Dict:
+        """Push items through every stage and return per-stage statistics"""
+        queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        start = time.perf_counter()
+        sampler = asyncio.ensure_future(self._sample(queues))
+        tasks = [asyncio.ensure_future(self._feed(items, queues[0], self.stages[0].workers))]
+        for i, stage in enumerate(self.stages):
+            last = i == len(self.stages) - 1
+            tasks.append(asyncio.ensure_future(self._run_stage(
+                stage, queues[i], None if last else queues[i + 1],
+                0 if last else self.stages[i + 1].workers)))
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            sampler.cancel()
+        elapsed = time.perf_counter() - start
+
+        stages = {stage.name: stage.stats(elapsed) for stage in self.stages}
+        return {
+            'elapsed_seconds': elapsed,
+            'stages': stages,
+            'bottleneck': max(stages, key=lambda name: stages[name]['utilization'])
+        }
+
+
+def generate_batch(spec: Tuple[int, int, int, bool, bool]) -> List[Dict]:
+    """Generate one batch of questions, reproducibly from its seed"""
+    batch_id, count, seed, latex_support, difficulty_adaptive = spec
+    # A batch-local RNG keeps concurrent thread workers from reseeding each
+    # other, or the host process, through the global random module
+    generator = MathQuestionGenerator(difficulty_adaptive=difficulty_adaptive, latex_support=latex_support,
+                                      rng=random.Random(seed))
+    return [generator.generate_counting_question() if i % 2 == 0 else generator.generate_geometry_question()
+            for i in range(count)]
+
+
+def analyze_batch(questions: List[Dict]) -> List[Tuple[Dict, Dict]]:
+    """Pair each question with its quality analysis"""
+    analyzer = QuestionAnalytics()
+    return [(q, analyzer.analyze_question_quality(q)) for q in questions]
+
+
+class Deduplicator:
+    """Drops questions whose content fingerprint has already been seen"""
+    def __init__(self):
+        self.seen = set()
+        self.duplicates = 0
+
+    def __call__(self, pairs: List[Tuple[Dict, Dict]]) -> Optional[List[Tuple[Dict, Dict]]]:
+        unique = []
+        for q, analysis in pairs:
+            # The raw digest keeps the seen-set at 32 bytes of key per question
+            fingerprint = bytes.fromhex(question_fingerprint(q))
+            if fingerprint in self.seen:
+                self.duplicates += 1
+                continue
+            self.seen.add(fingerprint)
+            unique.append((q, analysis))
+        return unique or None
+
+
+class BatchExporter:
+    """Appends each batch to the JSONL bank and formatted text, accumulating analytics"""
+    def __init__(self, out_dir: str, title: str = "Enhanced Mathematical Reasoning Assessment"):
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.title = title
+        self.formatter = MathQuestionGenerator()
+        self.analytics = RunningAnalytics()
+        self.written = 0
+        self.bank = open(os.path.join(out_dir, 'questions.jsonl'), 'w', encoding='utf-8')
+        self.text = open(os.path.join(out_dir, 'questions_formatted.txt'), 'w', encoding='utf-8')
+
+    def __call__(self, pairs: List[Tuple[Dict, Dict]]):
+        for q, analysis in pairs:
+            self.written += 1
+            self.bank.write(json.dumps(q, ensure_ascii=False) + '\n')
+            self.text.write(self.formatter.format_question(q, self.written, self.title if self.written == 1 else ""))
+            self.analytics.add(q, analysis)
+        return None
+
+    def close(self, extra: Optional[Dict] = None) -> Optional[str]:
+        """Close the outputs and write the analytics report; returns its path"""
+        self.bank.close()
+        self.text.close()
+        if not self.written:
+            return None
+        path = os.path.join(self.out_dir, 'analytics_report.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(dict(self.analytics.report(), **(extra or {})), f, indent=2)
+        return path
+
+
+def run_question_pipeline(count: int, out_dir: str, batch_size: int = 100, workers: int = 2,
+                          queue_size: int = 4, seed: int = 0, latex_support: bool = True,
+                          difficulty_adaptive: bool = True, use_processes: bool = True) -> Dict:
+    """Generate, analyze, dedupe and export count questions into out_dir.
+
+    Generation and analysis each get `workers` workers on their own
+    process pool (threads with use_processes=False); dedupe runs on the
+    event loop and export on a single writer thread. Batches may finish
+    out of order, so question numbering follows export order.
+    """
+    specs = [(batch_id, min(batch_size, count - start), seed * 1000003 + batch_id, latex_support, difficulty_adaptive)
+             for batch_id, start in enumerate(range(0, count, batch_size))]
+
+    def pool():
+        if use_processes:
+            return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return ThreadPoolExecutor(max_workers=workers)
+
+    generate_pool, analyze_pool = pool(), pool()
+    writer = ThreadPoolExecutor(max_workers=1)
+    deduplicator = Deduplicator()
+    exporter = BatchExporter(out_dir)
+    pipeline = Pipeline([
+        Stage('generate', generate_batch, workers, generate_pool, queue_size),
+        Stage('analyze', analyze_batch, workers, analyze_pool, queue_size),
+        Stage('dedupe', deduplicator, 1, None, queue_size),
+        Stage('export', exporter, 1, writer, queue_size)
+    ])
+    try:
+        stats = asyncio.run(pipeline.run(specs))
+    finally:
+        for executor in (generate_pool, analyze_pool, writer):
+            executor.shutdown(cancel_futures=True)
+        report_path = exporter.close({'pipeline': {'duplicates_dropped': deduplicator.duplicates}})
+
+    stats.update({
+        'requested': count,
+        'exported': exporter.written,
+        'duplicates_dropped': deduplicator.duplicates,
+        'outputs': {
+            'bank': exporter.bank.name,
+            'text': exporter.text.name,
+            'report': report_path
+        }
+    })
+    return stats
@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from question_analytics import QuestionAnalytics
+from question_generator import MathQuestionGenerator
+
+DIFFICULTY_LEVELS = ('easy', 'moderate', 'hard')
+
+
+class _FixedDifficultyGenerator(MathQuestionGenerator):
+    """Generator whose questions all carry one difficulty level"""
+    def __init__(self, difficulty: str, latex_support: bool):
+        super().__init__(difficulty_adaptive=False, latex_support=latex_support)
+        self.difficulty = difficulty
+
+    def next_difficulty(self) -> str:
+        return self.difficulty
+
+
+class QuestionPool:
+    """Pre-generated, pre-analyzed questions buffered per (difficulty, latex, topic).
+
+    Background threads top every buffer up to high_water. A request draws
+    its difficulty sequence from its own generator, exactly as inline
+    generation would, and then only pops matching questions; a buffer that
+    has run dry is served inline. Refill runs in small batches and backs
+    off whenever foreground_busy() reports request work in progress.
+    """
+    def __init__(self, high_water: int = 100, refill_batch: int = 10, workers: int = 1,
+                 foreground_busy: Optional[Callable[[], bool]] = None,
+                 throttle_delay: float = 0.05, refill_pause: float = 0.005,
+                 topics: Optional[List[str]] = None, clock=time.monotonic):
+        self.high_water = high_water
+        self.refill_batch = refill_batch
+        self.workers = workers
+        self.foreground_busy = foreground_busy or (lambda: False)
+        self.throttle_delay = throttle_delay
+        self.refill_pause = refill_pause
+        self.clock = clock
+        topics = topics or list(MathQuestionGenerator.TOPIC_GENERATORS)
+        self.buffers = {(difficulty, latex, topic): deque()
+                        for difficulty in DIFFICULTY_LEVELS for latex in (True, False) for topic in topics}
+        # When each buffer last dropped below high_water; absent while full
+        self.below_since = {key: clock() for key in self.buffers}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.threads = []
+        self.stopping = False
+        self.served = 0
+        self.misses = 0
+        self.generated = 0
+        self.throttled = 0
+
+    def _generate(self, key: Tuple, count: int) -> List[Tuple[Dict, Dict]]:
+        difficulty, latex, topic = key
+        generator = _FixedDifficultyGenerator(difficulty, latex)
+        analyzer = QuestionAnalytics()
+        entries = []
+        for _ in range(count):
+            q = generator.generate_question(topic)
+            entries.append((q, analyzer.analyze_question_quality(q)))
+        return entries
+
+    def _neediest(self) -> Optional[Tuple]:
+        """The buffer furthest below high_water, or None when all are full"""
+        key = max(self.buffers, key=lambda k: self.high_water - len(self.buffers[k]))
+        return key if len(self.buffers[key]) < self.high_water else None
+
+    def refill_once(self) -> int:
+        """Generate one batch for the neediest buffer; returns how many were added"""
+        with self.lock:
+            key = self._neediest()
+            if key is None:
+                return 0
+            count = min(self.refill_batch, self.high_water - len(self.buffers[key]))
+        entries = self._generate(key, count)
+        with self.lock:
+            buffer = self.buffers[key]
+            buffer.extend(entries[:max(0, self.high_water - len(buffer))])
+            self.generated += len(entries)
+            if len(buffer) >= self.high_water:
+                self.below_since.pop(key, None)
+        return len(entries)
+
+    def fill(self):
+        """Fill every buffer to high_water on the calling thread"""
+        while self.refill_once():
+            pass
+
+    def _run(self):
+        while True:
+            with self.lock:
+                while not self.stopping and self._neediest() is None:
+                    self.wakeup.wait()
+                if self.stopping:
+                    return
+            if self.foreground_busy():
+                with self.lock:
+                    self.throttled += 1
+                time.sleep(self.throttle_delay)
+                continue
+            self.refill_once()
+            time.sleep(self.refill_pause)
+
+    def start(self):
+        """Start the background refill threads"""
+        with self.lock:
+            self.stopping = False
+        for i in range(self.workers - len(self.threads)):
+            thread = threading.Thread(target=self._run, name=f'question-pool-{i}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        with self.lock:
+            self.stopping = True
+            self.wakeup.notify_all()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def draw(self, generator: MathQuestionGenerator, topics: List[str]) -> Tuple[List[Dict], List[Dict]]:
+        """Questions and their analyses for each topic, in order.
+
+        Difficulties come from generator.next_difficulty(), so adaptive
+        and session generators keep their usual sequence and history.
+        """
+        keys = [(generator.next_difficulty(), generator.latex_support, topic) for topic in topics]
+        entries = [None] * len(keys)
+        now = self.clock()
+        with self.lock:
+            for i, key in enumerate(keys):
+                buffer = self.buffers.get(key)
+                if buffer:
+                    entries[i] = buffer.popleft()
+                    self.below_since.setdefault(key, now)
+            hits = sum(1 for entry in entries if entry is not None)
+            self.served += hits
+            self.misses += len(keys) - hits
+            self.wakeup.notify_all()
+
+        for i, key in enumerate(keys):
+            if entries[i] is None:
+                entries[i] = self._generate(key, 1)[0]
+        return [q for q, _ in entries], [analysis for _, analysis in entries]
+
+    def stats(self) -> Dict:
+        with self.lock:
+            now = self.clock()
+            buffers = {}
+            for key, buffer in self.buffers.items():
+                difficulty, latex, topic = key
+                since = self.below_since.get(key)
+                buffers[f"{difficulty}|{'latex' if latex else 'plain'}|{topic}"] = {
+                    'depth': len(buffer),
+                    'refill_lag_seconds': now - since if since is not None else 0.0
+                }
+            return {
+                'high_water': self.high_water,
+                'total_depth': sum(len(buffer) for buffer in self.buffers.values()),
+                'max_refill_lag_seconds': max((b['refill_lag_seconds'] for b in buffers.values()), default=0.0),
+                'buffers': buffers,
+                'served': self.served,
+                'misses': self.misses,
+                'generated': self.generated,
+                'throttled': self.throttled,
+                'running': bool(self.threads)
+            }
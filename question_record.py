@@ -0,0 +1,207 @@
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from question_generator import MathQuestionGenerator
+
+# Marks optional keys that were absent from the source dict
+_MISSING = object()
+
+# Keys stored in dedicated slots; everything else travels in ``extras``
+_CORE_KEYS = ('question', 'table', 'options', 'correct', 'explanation', 'latex_formula',
+              'subject', 'unit', 'topic', 'difficulty')
+
+
+class _Codebook:
+    """Maps repeated values to small integer codes"""
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def value(self, code: int):
+        return self.values[code]
+
+
+class RecordPool:
+    """Interning tables shared by the records of one bank.
+
+    Text, packed option and extras tuples, curriculum and difficulty
+    repeat across a bank, so records packed into the same pool keep one
+    copy of each. The tables live only as long as the pool and its
+    records, rather than for the life of the process.
+    """
+    __slots__ = ('strings', 'tuples', 'curriculum', 'difficulties')
+
+    def __init__(self):
+        self.strings = {}
+        self.tuples = {}
+        self.curriculum = _Codebook(
+            (subject, unit, topic)
+            for subject, units in MathQuestionGenerator.CURRICULUM.items()
+            for unit, topics in units.items()
+            for topic in topics
+        )
+        self.difficulties = _Codebook(('easy', 'moderate', 'hard'))
+
+    def intern(self, value):
+        if type(value) is str:
+            return self.strings.setdefault(value, value)
+        return value
+
+    def share(self, value: Tuple) -> Tuple:
+        try:
+            return self.tuples.setdefault(value, value)
+        except TypeError:  # unhashable extras are kept per record
+            return value
+
+
+class QuestionRecord:
+    """Compact in-memory form of a generated question dict.
+
+    Curriculum and difficulty are stored as codes into the pool's
+    codebooks, options are packed into a tuple of tuples and every text
+    field is interned in the pool, so the scenario text and option sets
+    repeated across a large bank are kept once. Records are always packed
+    into a pool the caller owns; pack_questions makes one per bank.
+    ``to_dict`` returns exactly the dict ``from_dict`` was given.
+    """
+    __slots__ = ('question', 'table', 'options', 'correct', 'explanation',
+                 'latex_formula', 'curriculum_code', 'difficulty_code', 'extras', 'pool')
+
+    def __init__(self, question: str, options: Tuple, correct: str, explanation: str,
+                 subject: str, unit: str, topic: str, difficulty: str,
+                 table=_MISSING, latex_formula=_MISSING, extras: Tuple = (), *, pool: RecordPool):
+        intern = pool.intern
+        self.pool = pool
+        self.question = intern(question)
+        self.table = intern(table)
+        self.options = pool.share(tuple((intern(letter), intern(option)) for letter, option in options))
+        self.correct = intern(correct)
+        self.explanation = intern(explanation)
+        self.latex_formula = intern(latex_formula)
+        self.curriculum_code = pool.curriculum.code((intern(subject), intern(unit), intern(topic)))
+        self.difficulty_code = pool.difficulties.code(intern(difficulty))
+        self.extras = pool.share(tuple((intern(k), intern(v)) for k, v in extras)) or None
+
+    @property
+    def subject(self) -> str:
+        return self.pool.curriculum.value(self.curriculum_code)[0]
+
+    @property
+    def unit(self) -> str:
+        return self.pool.curriculum.value(self.curriculum_code)[1]
+
+    @property
+    def topic(self) -> str:
+        return self.pool.curriculum.value(self.curriculum_code)[2]
+
+    @property
+    def difficulty(self) -> str:
+        return self.pool.difficulties.value(self.difficulty_code)
+
+    @classmethod
+    def from_dict(cls, q_data: Dict, pool: RecordPool) -> 'QuestionRecord':
+        """Pack a question dict as produced by MathQuestionGenerator into pool"""
+        return cls(
+            question=q_data['question'],
+            options=q_data['options'],
+            correct=q_data['correct'],
+            explanation=q_data['explanation'],
+            subject=q_data['subject'],
+            unit=q_data['unit'],
+            topic=q_data['topic'],
+            difficulty=q_data['difficulty'],
+            table=q_data.get('table', _MISSING),
+            latex_formula=q_data.get('latex_formula', _MISSING),
+            extras=tuple((k, v) for k, v in q_data.items() if k not in _CORE_KEYS),
+            pool=pool
+        )
+
+    def to_dict(self) -> Dict:
+        """Unpack into the dict shape used by format_question, analytics and the web JSON"""
+        subject, unit, topic = self.pool.curriculum.value(self.curriculum_code)
+        q_data = {'question': self.question}
+        if self.table is not _MISSING:
+            q_data['table'] = self.table
+        q_data['options'] = list(self.options)
+        q_data['correct'] = self.correct
+        q_data['explanation'] = self.explanation
+        if self.latex_formula is not _MISSING:
+            q_data['latex_formula'] = self.latex_formula
+        q_data['subject'] = subject
+        q_data['unit'] = unit
+        q_data['topic'] = topic
+        q_data['difficulty'] = self.difficulty
+        if self.extras:
+            q_data.update(self.extras)
+        return q_data
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, QuestionRecord):
+            return NotImplemented
+        # Codes are only comparable within a pool, so compare decoded fields
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"QuestionRecord(topic={self.topic!r}, difficulty={self.difficulty!r}, correct={self.correct!r})"
+
+
+def pack_questions(questions: List[Dict]) -> List[QuestionRecord]:
+    """Convert a list of question dicts into compact records sharing one pool"""
+    pool = RecordPool()
+    return [QuestionRecord.from_dict(q, pool) for q in questions]
+
+
+def unpack_questions(records: List[QuestionRecord]) -> List[Dict]:
+    """Convert compact records back into question dicts"""
+    return [r.to_dict() for r in records]
+
+
+def benchmark_memory(count: int = 100000) -> Dict:
+    """Compare the memory held by a bank of dicts and the same bank as records"""
+    generator = MathQuestionGenerator()
+
+    def generate(i):
+        if i % 2 == 0:
+            return generator.generate_counting_question()
+        return generator.generate_geometry_question()
+
+    def measure(build):
+        tracemalloc.start()
+        bank = build()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del bank
+        return size
+
+    def build_records():
+        pool = RecordPool()
+        return [QuestionRecord.from_dict(generate(i), pool) for i in range(count)]
+
+    dict_bytes = measure(lambda: [generate(i) for i in range(count)])
+    record_bytes = measure(build_records)
+
+    return {
+        'question_count': count,
+        'dict_bytes': dict_bytes,
+        'record_bytes': record_bytes,
+        'dict_bytes_per_question': dict_bytes / count,
+        'record_bytes_per_question': record_bytes / count,
+        'reduction': 1 - record_bytes / dict_bytes if dict_bytes else 0
+    }
+
+
+if __name__ == "__main__":
+    result = benchmark_memory()
+    print(f"[BENCHMARK] {result['question_count']} questions")
+    print(f"Dict bank:   {result['dict_bytes'] / 1e6:.1f} MB ({result['dict_bytes_per_question']:.0f} B/question)")
+    print(f"Record bank: {result['record_bytes'] / 1e6:.1f} MB ({result['record_bytes_per_question']:.0f} B/question)")
+    print(f"Reduction:   {result['reduction'] * 100:.1f}%")
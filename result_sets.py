@@ -0,0 +1,130 @@
+import base64
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from question_analytics import QuestionAnalytics, generate_analytics_report
+from question_record import pack_questions
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"o:{offset}".encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Return the offset a cursor points at; a missing cursor is the first page"""
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        prefix, _, offset = base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii').partition(':')
+        if prefix != 'o' or not offset.isdigit():
+            raise ValueError(cursor)
+        return int(offset)
+    except (ValueError, UnicodeError):
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+
+
+class ResultSet:
+    """A generated batch held server-side for paging.
+
+    Questions are kept as compact records. Per-question analyses are
+    computed only for the pages a client fetches, and the batch summary
+    only when it is first requested.
+    """
+    __slots__ = ('handle', 'records', 'analyses', 'summary', 'last_seen', 'lock')
+
+    def __init__(self, handle: str, questions: List[Dict], last_seen: float,
+                 analyses: Optional[List[Dict]] = None):
+        self.handle = handle
+        # The records' interning pool is freed along with the result set
+        self.records = pack_questions(questions)
+        self.analyses = list(analyses) if analyses is not None else [None] * len(questions)
+        self.summary = None
+        self.last_seen = last_seen
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _analyze(self, offset: int, questions: List[Dict]):
+        """Fill in the analyses still missing for questions starting at offset; call under the lock"""
+        analyzer = QuestionAnalytics()
+        for i, q in enumerate(questions, offset):
+            if self.analyses[i] is None:
+                self.analyses[i] = analyzer.analyze_question_quality(q)
+
+    def page(self, cursor: Optional[str], page_size: int) -> Dict:
+        offset = decode_cursor(cursor)
+        end = min(offset + page_size, len(self.records))
+        questions = [r.to_dict() for r in self.records[offset:end]]
+
+        with self.lock:
+            self._analyze(offset, questions)
+            analyses = self.analyses[offset:end]
+
+        return {
+            'result_set': self.handle,
+            'total': len(self.records),
+            'offset': offset,
+            'questions': questions,
+            'analyses': analyses,
+            'next_cursor': encode_cursor(end) if end < len(self.records) else None
+        }
+
+    def questions(self) -> List[Dict]:
+        return [r.to_dict() for r in self.records]
+
+    def get_summary(self) -> Dict:
+        """Return the batch analytics without the per-question list"""
+        with self.lock:
+            if self.summary is None:
+                # Pages already served keep their analyses; only the rest are computed
+                questions = self.questions()
+                self._analyze(0, questions)
+                report = generate_analytics_report(questions, analyses=self.analyses)
+                del report['individual_analyses']
+                self.summary = report
+            return self.summary
+
+
+class ResultSetStore:
+    """Short-lived result sets with LRU and TTL eviction"""
+    def __init__(self, ttl_seconds: float = 600, max_sets: int = 1000, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_sets = max_sets
+        self.clock = clock
+        self.result_sets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _expire(self, now: float):
+        while self.result_sets:
+            oldest = next(iter(self.result_sets.values()))
+            if now - oldest.last_seen < self.ttl_seconds:
+                break
+            self.result_sets.popitem(last=False)
+
+    def create(self, questions: List[Dict], analyses: Optional[List[Dict]] = None) -> ResultSet:
+        result_set = ResultSet(uuid.uuid4().hex, questions, self.clock(), analyses)
+        with self.lock:
+            self._expire(result_set.last_seen)
+            self.result_sets[result_set.handle] = result_set
+            while len(self.result_sets) > self.max_sets:
+                self.result_sets.popitem(last=False)
+        return result_set
+
+    def get(self, handle: str) -> Optional[ResultSet]:
+        with self.lock:
+            now = self.clock()
+            self._expire(now)
+            result_set = self.result_sets.get(handle)
+            if result_set is not None:
+                result_set.last_seen = now
+                self.result_sets.move_to_end(handle)
+            return result_set
@@ -0,0 +1,212 @@
+import hashlib
+import heapq
+import json
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from question_generator import MathQuestionGenerator
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def question_fingerprint(q_data: Dict) -> str:
+    """Content fingerprint of a question, independent of option order and difficulty"""
+    answers = dict(q_data.get('options', []))
+    content = {
+        'topic': q_data.get('topic'),
+        'question': q_data.get('question'),
+        'table': q_data.get('table'),
+        'options': sorted(answers.values()),
+        'answer': answers.get(q_data.get('correct'))
+    }
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _allocate(count: int, weights: Dict[str, float]) -> Dict[str, int]:
+    """Split count across keys in proportion to weights (largest remainder)"""
+    total = sum(weights.values())
+    if total <= 0:
+        return {key: 0 for key in weights}
+    exact = {key: count * w / total for key, w in weights.items()}
+    allocation = {key: int(v) for key, v in exact.items()}
+    leftover = count - sum(allocation.values())
+    for key in sorted(exact, key=lambda k: exact[k] - allocation[k], reverse=True)[:leftover]:
+        allocation[key] += 1
+    return allocation
+
+
+def create_manifest(out_dir: str, total: int, topic_mix: Optional[Dict[str, float]] = None,
+                    shard_size: int = 10000, seed: int = 0, latex_support: bool = True) -> Dict:
+    """Split a target count and topic mix into independently generated shards"""
+    if topic_mix is None:
+        topic_mix = {topic: 1 for topic in MathQuestionGenerator.TOPIC_GENERATORS}
+    unknown = [t for t in topic_mix if t not in MathQuestionGenerator.TOPIC_GENERATORS]
+    if unknown:
+        raise ValueError(f"No generator for topics: {', '.join(unknown)}")
+
+    remaining = _allocate(total, topic_mix)
+    shards = []
+    shard_id = 0
+    left = total
+    while left > 0:
+        size = min(shard_size, left)
+        # Allocating against what is left keeps the global totals exact
+        topic_counts = _allocate(size, remaining)
+        for topic, n in topic_counts.items():
+            remaining[topic] -= n
+        shards.append({
+            'shard_id': shard_id,
+            'count': size,
+            'topic_counts': {t: n for t, n in topic_counts.items() if n},
+            'seed': seed * 1000003 + shard_id,
+            'output': f'shard-{shard_id:05d}.jsonl'
+        })
+        shard_id += 1
+        left -= size
+
+    manifest = {
+        'total': total,
+        'topic_mix': topic_mix,
+        'shard_size': shard_size,
+        'latex_support': latex_support,
+        'shards': shards
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(out_dir: str) -> Dict:
+    with open(os.path.join(out_dir, MANIFEST_NAME), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def generate_shard(out_dir: str, shard_id: int) -> str:
+    """Generate one shard into its JSONL file; safe to re-run after a failure.
+
+    The file only appears under its final name once it is complete, so a
+    crashed worker leaves nothing behind that the merge could mistake for
+    a finished shard.
+    """
+    manifest = load_manifest(out_dir)
+    shard = manifest['shards'][shard_id]
+    path = os.path.join(out_dir, shard['output'])
+    if os.path.exists(path):
+        return path
+
+    # A shard-local RNG makes a re-run of a failed shard reproduce the same
+    # questions without reseeding the caller's global random module
+    rng = random.Random(shard['seed'])
+    generator = MathQuestionGenerator(latex_support=manifest['latex_support'], rng=rng)
+    topics = [t for t, n in shard['topic_counts'].items() for _ in range(n)]
+    rng.shuffle(topics)
+
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, prefix=f".shard-{shard_id:05d}-", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for topic in topics:
+                q = generator.generate_question(topic)
+                f.write(json.dumps({'fingerprint': question_fingerprint(q), 'question': q},
+                                   ensure_ascii=False) + '\n')
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def shard_status(out_dir: str) -> Dict:
+    """Report which shards are complete and which still need to run"""
+    manifest = load_manifest(out_dir)
+    done, pending = [], []
+    for shard in manifest['shards']:
+        exists = os.path.exists(os.path.join(out_dir, shard['output']))
+        (done if exists else pending).append(shard['shard_id'])
+    return {'total_shards': len(manifest['shards']), 'complete': done, 'pending': pending}
+
+
+def run_local(out_dir: str, workers: int = 2) -> Dict:
+    """Stand-in for a cluster: run every pending shard in local worker processes"""
+    pending = shard_status(out_dir)['pending']
+    failed = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {shard_id: executor.submit(generate_shard, out_dir, shard_id) for shard_id in pending}
+        for shard_id, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                failed[shard_id] = str(e)
+    return {'generated': [s for s in pending if s not in failed], 'failed': failed}
+
+
+def _write_run(lines: List[str], run_dir: str, index: int) -> str:
+    lines.sort()
+    path = os.path.join(run_dir, f'run-{index:05d}.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    return path
+
+
+def merge_shards(out_dir: str, output: str, chunk_size: int = 100000) -> Dict:
+    """Combine complete shards into one JSONL bank, dropping duplicate fingerprints.
+
+    Shards are cut into sorted runs of at most chunk_size questions on
+    disk, and the runs are k-way merged on fingerprint, so memory stays
+    bounded by the chunk size rather than the bank size. Among duplicates
+    the copy from the lowest shard and line wins, so the result does not
+    depend on which machine finished first.
+    """
+    status = shard_status(out_dir)
+    if status['pending']:
+        raise RuntimeError(f"Shards not complete: {status['pending']}")
+    manifest = load_manifest(out_dir)
+
+    with tempfile.TemporaryDirectory(dir=out_dir, prefix='.merge-') as run_dir:
+        runs = []
+        chunk = []
+        total_in = 0
+        for shard in manifest['shards']:
+            with open(os.path.join(out_dir, shard['output']), encoding='utf-8') as f:
+                for line_no, line in enumerate(f):
+                    record = json.loads(line)
+                    question = json.dumps(record['question'], ensure_ascii=False)
+                    chunk.append(f"{record['fingerprint']}\t{shard['shard_id']:08d}\t{line_no:012d}\t{question}\n")
+                    total_in += 1
+                    if len(chunk) >= chunk_size:
+                        runs.append(_write_run(chunk, run_dir, len(runs)))
+                        chunk = []
+        if chunk:
+            runs.append(_write_run(chunk, run_dir, len(runs)))
+
+        files = [open(path, encoding='utf-8') for path in runs]
+        unique = 0
+        tmp_output = output + '.tmp'
+        try:
+            with open(tmp_output, 'w', encoding='utf-8') as out:
+                previous = None
+                for entry in heapq.merge(*files):
+                    fingerprint, _, _, line = entry.split('\t', 3)
+                    if fingerprint == previous:
+                        continue
+                    previous = fingerprint
+                    out.write(line)
+                    unique += 1
+            os.replace(tmp_output, output)
+        finally:
+            for f in files:
+                f.close()
+            if os.path.exists(tmp_output):
+                os.remove(tmp_output)
+
+    return {
+        'shards': len(manifest['shards']),
+        'input_questions': total_in,
+        'unique_questions': unique,
+        'duplicates_dropped': total_in - unique,
+        'output': output
+    }
@@ -1,10 +1,132 @@
 import re
 import math
-from typing import List, Dict, Tuple
+from array import array
+from typing import List, Dict, Optional, Tuple
 from collections import Counter
 
+class SimilarityIndex:
+    """Token inverted index over a question bank for nearest-neighbour queries.
+    
+    Questions with the same token counts and the same structural fields
+    score identically against any query, and generated banks repeat them
+    heavily, so the index stores each distinct profile once along with
+    the bank positions that share it. Each token maps to a posting list
+    of (profile id, term frequency) arrays, and profile norms, distinct
+    token counts and structural fields are precomputed as columns, so a
+    query only touches the postings of its own tokens.
+    """
+    def __init__(self, checker: 'QuestionSimilarityChecker', questions: List[Dict]):
+        import numpy as np
+
+        self.questions = questions
+        self.vocabulary = {}
+        self.codes = {}
+        profile_ids = {}
+        docs, tfs = [], []
+        norms, sizes, has_table, difficulties, topics, option_counts = [], [], [], [], [], []
+        members = array('i')
+        for q in questions:
+            counts = Counter(checker.preprocess_text(q.get('question', '')))
+            # Equal codes mean equal values, as detect_similarity compares them
+            structure = ('table' in q, self._code('difficulty', q.get('difficulty')),
+                         self._code('topic', q.get('topic')), len(q.get('options', [])))
+            key = (tuple(sorted(counts.items())), structure)
+            profile_id = profile_ids.get(key)
+            if profile_id is None:
+                profile_id = profile_ids[key] = len(profile_ids)
+                for token, tf in counts.items():
+                    token_id = self.vocabulary.get(token)
+                    if token_id is None:
+                        token_id = self.vocabulary[token] = len(docs)
+                        docs.append(array('i'))
+                        tfs.append(array('i'))
+                    docs[token_id].append(profile_id)
+                    tfs[token_id].append(tf)
+                norms.append(math.sqrt(sum(tf * tf for tf in counts.values())))
+                sizes.append(len(counts))
+                has_table.append(structure[0])
+                difficulties.append(structure[1])
+                topics.append(structure[2])
+                option_counts.append(structure[3])
+            members.append(profile_id)
+        
+        self.postings = [(np.frombuffer(d, dtype=np.int32), np.frombuffer(t, dtype=np.int32).astype(np.float64))
+                         for d, t in zip(docs, tfs)]
+        self.norms = np.array(norms)
+        self.sizes = np.array(sizes, dtype=np.int32)
+        self.has_table = np.array(has_table, dtype=bool)
+        self.difficulties = np.array(difficulties, dtype=np.int32)
+        self.topics = np.array(topics, dtype=np.int32)
+        self.option_counts = np.array(option_counts, dtype=np.int32)
+        # Bank positions grouped by profile, ascending within each group
+        members = np.frombuffer(members, dtype=np.int32)
+        self.member_order = np.argsort(members, kind='stable').astype(np.int32)
+        self.member_offsets = np.concatenate(([0], np.cumsum(np.bincount(members, minlength=len(norms)))))
+    
+    def __len__(self) -> int:
+        return len(self.questions)
+    
+    @property
+    def profile_count(self) -> int:
+        return len(self.norms)
+    
+    def _code(self, field: str, value, add: bool = True) -> int:
+        codes = self.codes.setdefault(field, {})
+        code = codes.get(value)
+        if code is None:
+            if not add:
+                return -1
+            code = codes[value] = len(codes)
+        return code
+    
+    def members(self, profile_id: int) -> 'np.ndarray':
+        """Bank positions of the questions sharing a profile"""
+        return self.member_order[self.member_offsets[profile_id]:self.member_offsets[profile_id + 1]]
+    
+    def structural_scores(self, question: Dict, profiles: 'np.ndarray') -> 'np.ndarray':
+        """check_structural_similarity of question against each profile, vectorized"""
+        import numpy as np
+
+        has_table = self.has_table[profiles]
+        scores = np.where(has_table, 0.3, 0.0) if 'table' in question else np.where(has_table, 0.0, 0.1)
+        scores = scores + np.where(self.difficulties[profiles] == self._code('difficulty', question.get('difficulty'), add=False), 0.2, 0.0)
+        scores = scores + np.where(self.topics[profiles] == self._code('topic', question.get('topic'), add=False), 0.3, 0.0)
+        scores = scores + np.where(self.option_counts[profiles] == len(question.get('options', [])), 0.2, 0.0)
+        return np.minimum(1.0, scores)
+    
+    def score(self, checker: 'QuestionSimilarityChecker', question: Dict) -> Tuple['np.ndarray', ...]:
+        """Score every profile sharing a token with the query.
+        
+        Returns (profiles, cosine, jaccard, structural, overall) arrays,
+        with the same values detect_similarity would compute pair by pair.
+        """
+        import numpy as np
+
+        counts = Counter(checker.preprocess_text(question.get('question', '')))
+        dot = np.zeros(self.profile_count)
+        shared = np.zeros(self.profile_count, dtype=np.int32)
+        # Accumulate one posting list at a time; ids within a list are unique
+        for token, tf in counts.items():
+            token_id = self.vocabulary.get(token)
+            if token_id is None:
+                continue
+            profile_ids, profile_tfs = self.postings[token_id]
+            dot[profile_ids] += profile_tfs * tf
+            shared[profile_ids] += 1
+        
+        profiles = np.flatnonzero(shared)
+        norm = math.sqrt(sum(tf * tf for tf in counts.values()))
+        cosine = dot[profiles] / (norm * self.norms[profiles])
+        common = shared[profiles]
+        jaccard = common / (len(counts) + self.sizes[profiles] - common)
+        structural = self.structural_scores(question, profiles)
+        overall = cosine * 0.4 + jaccard * 0.4 + structural * 0.2
+        return profiles, cosine, jaccard, structural, overall
+
+
 class QuestionSimilarityChecker:
     def __init__(self):
+        self.index = None
         self.stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'}
         
     def preprocess_text(self, text: str) -> List[str]:
@@ -17,9 +139,10 @@ class QuestionSimilarityChecker:
     
     def calculate_cosine_similarity(self, text1: str, text2: str) -> float:
         """Calculate cosine similarity between two texts"""
-        words1 = self.preprocess_text(text1)
-        words2 = self.preprocess_text(text2)
-        
+        return self.cosine_from_words(self.preprocess_text(text1), self.preprocess_text(text2))
+    
+    def cosine_from_words(self, words1: List[str], words2: List[str]) -> float:
+        """Calculate cosine similarity between two preprocessed word lists"""
         # Create word frequency vectors
         all_words = set(words1 + words2)
         vector1 = [words1.count(word) for word in all_words]
@@ -37,9 +160,10 @@ class QuestionSimilarityChecker:
     
     def calculate_jaccard_similarity(self, text1: str, text2: str) -> float:
         """Calculate Jaccard similarity between two texts"""
-        words1 = set(self.preprocess_text(text1))
-        words2 = set(self.preprocess_text(text2))
-        
+        return self.jaccard_from_sets(set(self.preprocess_text(text1)), set(self.preprocess_text(text2)))
+    
+    def jaccard_from_sets(self, words1: set, words2: set) -> float:
+        """Calculate Jaccard similarity between two preprocessed word sets"""
         intersection = len(words1.intersection(words2))
         union = len(words1.union(words2))
         
@@ -69,15 +193,59 @@ class QuestionSimilarityChecker:
         
         return min(1.0, structure_score)
     
-    def detect_similarity(self, question1: Dict, question2: Dict) -> Dict:
-        """Comprehensive similarity detection"""
+    def detect_similarity(self, question1: Dict, question2: Dict, threshold: float = None) -> Dict:
+        """Comprehensive similarity detection
+        
+        With a threshold, scoring stops as soon as the pair provably cannot
+        reach it; the result is then flagged pruned, carries the stage it was
+        pruned at, and its overall_similarity is an upper bound (below the
+        threshold) instead of the full score.
+        """
         text1 = question1.get('question', '')
         text2 = question2.get('question', '')
+        if threshold is not None:
+            words1 = self.preprocess_text(text1)
+            words2 = self.preprocess_text(text2)
+            return self.cascade_similarity(question1, question2, words1, set(words1),
+                                           words2, set(words2), threshold)
         
         cosine_sim = self.calculate_cosine_similarity(text1, text2)
         jaccard_sim = self.calculate_jaccard_similarity(text1, text2)
         structural_sim = self.check_structural_similarity(question1, question2)
+        return self.build_similarity_result(cosine_sim, jaccard_sim, structural_sim)
+    
+    def cascade_similarity(self, question1: Dict, question2: Dict, words1: List[str], set1: set,
+                           words2: List[str], set2: set, threshold: float) -> Dict:
+        """Score a pair cheapest-first, stopping once it cannot reach the threshold"""
+        # Bounds must fall clearly below the threshold, so float rounding
+        # can never prune a pair that full scoring would flag
+        cutoff = threshold - 1e-9
+        structural_sim = self.check_structural_similarity(question1, question2)
+        
+        # Stage 1: Jaccard can be at most min/max of the set sizes, cosine at most 1
+        larger = max(len(set1), len(set2))
+        jaccard_bound = min(len(set1), len(set2)) / larger if larger else 0.0
+        bound = 0.4 + jaccard_bound * 0.4 + structural_sim * 0.2
+        if bound < cutoff:
+            return {'structural_similarity': structural_sim, 'overall_similarity': bound,
+                    'pruned': True, 'pruned_at': 'size_bound'}
         
+        # Stage 2: exact Jaccard, cosine still bounded by 1
+        jaccard_sim = self.jaccard_from_sets(set1, set2)
+        bound = 0.4 + jaccard_sim * 0.4 + structural_sim * 0.2
+        if bound < cutoff:
+            return {'jaccard_similarity': jaccard_sim, 'structural_similarity': structural_sim,
+                    'overall_similarity': bound, 'pruned': True, 'pruned_at': 'jaccard_bound'}
+        
+        # Stage 3: full score
+        cosine_sim = self.cosine_from_words(words1, words2)
+        result = self.build_similarity_result(cosine_sim, jaccard_sim, structural_sim)
+        result['pruned'] = False
+        result['pruned_at'] = None
+        return result
+    
+    def build_similarity_result(self, cosine_sim: float, jaccard_sim: float, structural_sim: float) -> Dict:
+        """Combine the individual scores into a similarity report"""
         # Weighted average
         overall_similarity = (cosine_sim * 0.4 + jaccard_sim * 0.4 + structural_sim * 0.2)
         
@@ -147,6 +315,90 @@ class QuestionSimilarityChecker:
             'recommendations': self.generate_batch_recommendations(results)
         }
     
+    def screen_similarity(self, questions: List[Dict], threshold: float = 0.6) -> Dict:
+        """Find every pair at or above the threshold, pruning pairs that cannot reach it
+        
+        Flags exactly the pairs batch_similarity_check would count as
+        high-risk, but skips the cosine step for pairs whose cheaper scores
+        already rule them out. Each question is tokenized once.
+        """
+        words = [self.preprocess_text(q.get('question', '')) for q in questions]
+        sets = [set(w) for w in words]
+        
+        flagged = []
+        pruned = {'size_bound': 0, 'jaccard_bound': 0}
+        scored = 0
+        for i in range(len(questions)):
+            for j in range(i + 1, len(questions)):
+                result = self.cascade_similarity(questions[i], questions[j], words[i], sets[i],
+                                                 words[j], sets[j], threshold)
+                if result['pruned']:
+                    pruned[result['pruned_at']] += 1
+                    continue
+                scored += 1
+                if result['overall_similarity'] >= threshold:
+                    result['question_pair'] = (i + 1, j + 1)
+                    flagged.append(result)
+        
+        return {
+            'flagged_pairs': flagged,
+            'summary': {
+                'threshold': threshold,
+                'total_comparisons': scored + sum(pruned.values()),
+                'flagged_pairs': len(flagged),
+                'fully_scored': scored,
+                'pruned': pruned
+            }
+        }
+    
+    def build_index(self, questions: List[Dict]) -> SimilarityIndex:
+        """Index a question bank for find_similar; the list is referenced, not copied"""
+        self.index = SimilarityIndex(self, questions)
+        return self.index
+    
+    def find_similar(self, question: Dict, k: int = 10, index: Optional[SimilarityIndex] = None) -> List[Dict]:
+        """Return the k indexed questions most similar to question, most similar first
+        
+        Only questions sharing at least one token with the query are
+        scored; any other question scores at most 0.2 overall. Each match
+        carries the detect_similarity breakdown plus its 'index' in the
+        bank and the 'question' itself.
+        """
+        import numpy as np
+
+        index = index or self.index
+        if index is None:
+            raise ValueError("No index built; call build_index(questions) first")
+        if k <= 0:
+            return []
+        
+        profiles, cosine, jaccard, structural, overall = index.score(self, question)
+        # Walk profiles from the highest score down; questions tied on a
+        # score are returned in bank order
+        order = np.arange(len(profiles))
+        if len(order) > k:
+            # Every profile holds at least one question, so the top k lie
+            # within the profiles scoring at least the k-th best profile
+            kth = np.partition(overall, len(overall) - k)[len(overall) - k]
+            order = np.flatnonzero(overall >= kth)
+        order = order[np.argsort(-overall[order], kind='stable')]
+        matches = []
+        start = 0
+        while start < len(order) and len(matches) < k:
+            end = start + 1
+            while end < len(order) and overall[order[end]] == overall[order[start]]:
+                end += 1
+            needed = k - len(matches)
+            tied = [(int(position), i) for i in order[start:end]
+                    for position in index.members(profiles[i])[:needed]]
+            for position, i in sorted(tied)[:needed]:
+                result = self.build_similarity_result(float(cosine[i]), float(jaccard[i]), float(structural[i]))
+                result['index'] = position
+                result['question'] = index.questions[position]
+                matches.append(result)
+            start = end
+        return matches
+    
     def generate_batch_recommendations(self, results: List[Dict]) -> List[str]:
         """Generate recommendations for the entire question set"""
         recommendations = []
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for admission control and load shedding
+"""
+
+import threading
+
+from admission_control import AdmissionController, RejectedRequest, estimate_cost
+from conftest import web_app_charts
+
+def _occupy(controller, endpoint, cost):
+    """Start a request that holds a worker until released"""
+    started, release = threading.Event(), threading.Event()
+
+    def work():
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=controller.run, args=(endpoint, cost, work))
+    thread.start()
+    started.wait(5)
+    return release, thread
+
+def test_cost_estimates():
+    """Cost grows with the number of questions"""
+    assert estimate_cost('generate', 100) > estimate_cost('generate', 10) > 0
+    print("[OK] Cost estimate scales with count")
+
+def test_endpoint_concurrency_limit():
+    """An endpoint at its limit sheds new requests"""
+    controller = AdmissionController(max_workers=2, endpoint_limits={'docx': 1})
+    release, thread = _occupy(controller, 'docx', 1)
+    try:
+        controller.run('docx', 1, lambda: None)
+        assert False, "request should have been shed"
+    except RejectedRequest as e:
+        assert e.retry_after >= 1
+    assert controller.run('generate', 1, lambda: 'ok') == 'ok'
+    release.set()
+    thread.join()
+    assert controller.run('docx', 1, lambda: 'ok') == 'ok'
+    assert controller.stats()['rejected'] == {'docx': 1}
+    print("[OK] Per-endpoint limit sheds excess requests")
+
+def test_queue_depth_shedding():
+    """Work beyond the pending cost budget is rejected rather than queued"""
+    controller = AdmissionController(max_workers=1, max_pending_cost=100)
+    release, thread = _occupy(controller, 'generate', 80)
+    try:
+        controller.run('generate', 30, lambda: None)
+        assert False, "request should have been shed"
+    except RejectedRequest:
+        pass
+    release.set()
+    thread.join()
+    # A lone request larger than the budget still runs on an idle server
+    assert controller.run('generate', 500, lambda: 'ok') == 'ok'
+    print("[OK] Pending cost budget sheds load")
+
+def test_web_returns_429(web_app):
+    """Overloaded endpoints answer 429 with Retry-After; oversize counts are refused"""
+    client = web_app.app.test_client()
+    assert client.post('/generate', json={'count': 10 ** 6}).status_code == 400
+
+    original = web_app.admission
+    web_app.admission = AdmissionController(max_workers=1, endpoint_limits={'generate': 1})
+    release, thread = _occupy(web_app.admission, 'generate', 1)
+    try:
+        response = client.post('/generate', json={'count': 2})
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) >= 1
+    finally:
+        release.set()
+        thread.join()
+        web_app.admission = original
+    assert client.post('/generate', json={'count': 2}).get_json()['success']
+    print("[OK] Web endpoints shed load with 429 and Retry-After")
+
+if __name__ == "__main__":
+    test_cost_estimates()
+    test_endpoint_concurrency_limit()
+    test_queue_depth_shedding()
+    with web_app_charts() as web_interface:
+        test_web_returns_429(web_interface)
+    print("ALL ADMISSION CONTROL TESTS PASSED! [SUCCESS]")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent per-question analysis cache
+"""
+
+import os
+import tempfile
+import time
+
+from analysis_cache import AnalysisCache, analysis_key
+from batch_generators import BatchQuestionGenerator
+from question_analytics import ANALYTICS_VERSION, QuestionAnalytics, generate_analytics_report
+from question_generator import MathQuestionGenerator
+
+# A warm re-run only hashes and looks up; the floor leaves room for a noisy machine
+MIN_SPEEDUP = 3
+
+def _strip(analysis):
+    return {k: v for k, v in analysis.items() if k != 'timestamp'}
+
+def test_analysis_key():
+    """Keys follow question content and ignore timestamps"""
+    q = MathQuestionGenerator().generate_counting_question()
+    assert analysis_key(q) == analysis_key(dict(q, timestamp='2024-01-01T00:00:00'))
+    assert analysis_key(q) == analysis_key(dict(reversed(list(q.items()))))
+    assert analysis_key(q) != analysis_key(dict(q, question=q['question'] + ' '))
+    assert analysis_key(q) != analysis_key(dict(q, difficulty='hard' if q['difficulty'] != 'hard' else 'easy'))
+    print("[OK] Analysis keys are content hashes")
+
+def test_matches_uncached_analysis():
+    """Cached and fresh analyses agree, and reports are unchanged"""
+    questions = BatchQuestionGenerator(seed=2).generate_mixed(40)
+    analyzer = QuestionAnalytics()
+    expected = [_strip(analyzer.analyze_question_quality(q)) for q in questions]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cache.sqlite')
+        cache = AnalysisCache(path)
+        first = cache.analyze_many(questions)
+        assert [_strip(a) for a in first] == expected
+        assert all('timestamp' in a for a in first)
+        assert (cache.hits, cache.misses) == (0, 40)
+        cache.close()
+
+        cache = AnalysisCache(path)
+        report = generate_analytics_report(questions, cache=cache)
+        assert (cache.hits, cache.misses) == (40, 0)
+        assert [_strip(a) for a in report['individual_analyses']] == expected
+        assert report['summary'] == generate_analytics_report(questions)['summary']
+
+        # Callers may modify what they get back without touching the cache
+        cache.analyze(questions[0])['option_balance']['score'] = -1
+        assert _strip(cache.analyze(questions[0])) == expected[0]
+        cache.close()
+    print("[OK] Cached analyses match fresh ones")
+
+def test_only_changed_questions_recomputed():
+    """Edited and new questions miss; the rest of the bank hits"""
+    questions = BatchQuestionGenerator(seed=4).generate_mixed(30)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AnalysisCache(os.path.join(tmp, 'cache.sqlite'))
+        cache.analyze_many(questions)
+        edited = dict(questions[5], question=questions[5]['question'] + ' Show your work.')
+        bank = questions[:5] + [edited] + questions[6:] + BatchQuestionGenerator(seed=5).generate_mixed(3)
+        cache.hits = cache.misses = 0
+        cache.analyze_many(bank)
+        assert (cache.hits, cache.misses) == (29, 4)
+        assert len(cache) == 34
+
+        cache.hits = cache.misses = 0
+        cache.analyze_many([questions[0], questions[0], edited])
+        assert (cache.hits, cache.misses) == (3, 0)
+        cache.close()
+    print("[OK] Only new and edited questions are re-analyzed")
+
+def test_version_invalidation():
+    """Opening the cache under a new analytics version discards old analyses"""
+    questions = BatchQuestionGenerator(seed=6).generate_mixed(10)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cache.sqlite')
+        cache = AnalysisCache(path)
+        cache.analyze_many(questions)
+        cache.close()
+
+        cache = AnalysisCache(path, version=ANALYTICS_VERSION + 1)
+        assert len(cache) == 0
+        cache.analyze_many(questions)
+        assert (cache.hits, cache.misses) == (0, 10)
+        cache.close()
+    print("[OK] Analyses from other versions are discarded")
+
+def test_warm_rerun_is_fast():
+    """Re-analyzing an unchanged bank is much cheaper than the first pass"""
+    questions = BatchQuestionGenerator(seed=8).generate_mixed(5000)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AnalysisCache(os.path.join(tmp, 'cache.sqlite'))
+        start = time.perf_counter()
+        cache.analyze_many(questions)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        cache.analyze_many(questions)
+        warm = time.perf_counter() - start
+        cache.close()
+    print(f"[OK] Cold {cold * 1000:.0f} ms, warm {warm * 1000:.0f} ms ({cold / warm:.1f}x)")
+    assert cold > MIN_SPEEDUP * warm
+
+if __name__ == "__main__":
+    test_analysis_key()
+    test_matches_uncached_analysis()
+    test_only_changed_questions_recomputed()
+    test_version_invalidation()
+    test_warm_rerun_is_fast()
+    print("ALL ANALYSIS CACHE TESTS PASSED! [SUCCESS]")
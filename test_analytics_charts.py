@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for analytics chart rendering and caching
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import Future
+
+from question_generator import MathQuestionGenerator
+from question_analytics import generate_analytics_report
+from similarity_checker import QuestionSimilarityChecker
+from analytics_charts import ChartQueueFull, ChartRenderer, chart_payload, payload_key, render_chart_set
+from conftest import web_app_charts
+
+def _sample_questions(count=6):
+    generator = MathQuestionGenerator()
+    return [generator.generate_counting_question() if i % 2 == 0 else generator.generate_geometry_question()
+            for i in range(count)]
+
+def test_payload_key_ignores_timestamps():
+    """Re-analyzing an unchanged bank should map to the same chart set"""
+    questions = _sample_questions()
+    first = payload_key(chart_payload(generate_analytics_report(questions)))
+    second = payload_key(chart_payload(generate_analytics_report(questions)))
+    assert first == second
+    print("[OK] Chart key is stable across report timestamps")
+
+def test_render_chart_set():
+    """All four charts are written as PNG files"""
+    questions = _sample_questions()
+    analytics = generate_analytics_report(questions)
+    similarity = QuestionSimilarityChecker().batch_similarity_check(questions)
+    with tempfile.TemporaryDirectory() as tmp:
+        charts = render_chart_set(chart_payload(analytics, similarity), tmp)
+        assert set(charts) == {'similarity_heatmap', 'readability_histogram',
+                               'engagement_histogram', 'difficulty_distribution'}
+        for path in charts.values():
+            with open(path, 'rb') as f:
+                assert f.read(4) == b'\x89PNG'
+    print("[OK] Heatmap, histograms and difficulty chart rendered")
+
+def test_renderer_cache():
+    """A second request for the same content is served from the cache"""
+    questions = _sample_questions()
+    payload = chart_payload(generate_analytics_report(questions), questions=questions)
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = ChartRenderer(tmp, max_workers=1)
+        try:
+            charts = renderer.render(payload)
+            assert 'similarity_heatmap' in charts
+            start = time.perf_counter()
+            key = renderer.submit(payload)
+            assert renderer.status(key) == 'ready'
+            assert time.perf_counter() - start < 0.05
+        finally:
+            renderer.shutdown()
+    print("[OK] Repeat views hit the chart cache")
+
+def test_renderer_bounds():
+    """Old chart sets are evicted, failures are capped and the queue is bounded"""
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = ChartRenderer(tmp, max_cached_sets=3, max_pending=0, max_failures=2)
+        keys = []
+        for i in range(5):
+            key = payload_key({'set': i})
+            os.makedirs(renderer.chart_dir(key))
+            manifest = os.path.join(renderer.chart_dir(key), 'charts.json')
+            with open(manifest, 'w') as f:
+                f.write('[]')
+            os.utime(manifest, (1000 + i, 1000 + i))
+            keys.append(key)
+
+        # Viewing the oldest set makes it the most recently used
+        assert renderer.submit({'set': 0}) == keys[0]
+        renderer._evict()
+        assert sorted(os.listdir(tmp)) == sorted([keys[0], keys[3], keys[4]])
+
+        try:
+            renderer.submit({'set': 9})
+            assert False, "queue should be full"
+        except ChartQueueFull:
+            pass
+
+        for i in range(4):
+            future = Future()
+            future.set_exception(RuntimeError(f"render {i} failed"))
+            renderer._finished(str(i), future)
+        assert list(renderer.failed) == ['2', '3']
+    print("[OK] Chart cache, failures and queue stay bounded")
+
+def test_generate_does_not_wait_for_charts():
+    """/generate returns a chart key immediately; charts arrive later"""
+    try:
+        import web_interface
+    except ImportError as e:
+        print(f"[WARNING] Web interface import failed: {e}")
+        return
+
+    with web_app_charts(max_workers=1):
+        client = web_interface.app.test_client()
+        data = client.post('/generate', json={'count': 4}).get_json()
+        status_url = data['charts']['status_url']
+        for _ in range(60):
+            status = client.get(status_url).get_json()
+            if status['status'] != 'pending':
+                break
+            time.sleep(0.5)
+        assert status['status'] == 'ready'
+        image = client.get(status['charts']['readability_histogram'])
+        assert image.status_code == 200 and image.mimetype == 'image/png'
+    print("[OK] Charts served by the web UI after /generate returns")
+
+if __name__ == "__main__":
+    test_payload_key_ignores_timestamps()
+    test_render_chart_set()
+    test_renderer_cache()
+    test_renderer_bounds()
+    test_generate_does_not_wait_for_charts()
+    print("ALL CHART TESTS PASSED! [SUCCESS]")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch answer-verification stage
+"""
+
+import json
+import subprocess
+import sys
+
+from question_generator import MathQuestionGenerator
+from answer_verifier import AnswerVerifier
+from batch_generators import BatchQuestionGenerator
+
+# A million questions verified within this many seconds
+MILLION_BUDGET_SECONDS = 10
+
+def test_generated_questions_verify():
+    """Freshly generated questions should all pass verification"""
+    generator = MathQuestionGenerator()
+    verifier = AnswerVerifier()
+
+    questions = []
+    for i in range(60):
+        if i % 2 == 0:
+            questions.append(generator.generate_counting_question())
+        else:
+            questions.append(generator.generate_geometry_question())
+
+    report = verifier.verify_batch(questions)
+    print(f"[OK] Verified {report['summary']['verified']} questions")
+    assert report['summary']['verified'] == 60
+    assert report['summary']['flagged'] == 0, report['flagged_questions']
+
+def test_wrong_answers_flagged():
+    """Wrong marked options, distractors and explanations should be flagged"""
+    generator = MathQuestionGenerator()
+    verifier = AnswerVerifier()
+
+    q = generator.generate_counting_question()
+    wrong_letter = next(letter for letter, _ in q['options'] if letter != q['correct'])
+    wrong = dict(q, correct=wrong_letter)
+    assert 'marked option disagrees with computed answer' in verifier.verify_question(wrong)
+
+    correct_value = dict(q['options'])[q['correct']]
+    duplicated = dict(q, options=q['options'] + [('F', correct_value)])
+    assert 'distractor equals computed answer' in verifier.verify_question(duplicated)
+
+    g = generator.generate_geometry_question()
+    g_answer = dict(g['options'])[g['correct']]
+    bad_explanation = dict(g, explanation=g['explanation'].replace(f"requires {g_answer} cm", "requires 1 × 1 × 1 cm"))
+    assert 'explanation disagrees with computed answer' in verifier.verify_question(bad_explanation)
+    print("[OK] Incorrect answers are flagged")
+
+def test_every_topic_verifies():
+    """Every batch topic has a solver, and its questions pass"""
+    generator = BatchQuestionGenerator(seed=9)
+    verifier = AnswerVerifier()
+    assert set(verifier.solvers) == set(generator.TOPIC_GENERATORS)
+
+    report = verifier.verify_batch(generator.generate_mixed(4000))
+    assert report['summary']['verified'] == 4000
+    assert report['summary']['flagged'] == 0, report['flagged_questions'][:5]
+    print(f"[OK] {len(verifier.solvers)} topics verified")
+
+def test_wrong_batch_answers_flagged():
+    """Each topic's solver catches a wrong mark, a duplicated answer and a wrong explanation"""
+    verifier = AnswerVerifier()
+    generator = BatchQuestionGenerator(seed=10)
+    for topic in generator.TOPIC_GENERATORS:
+        for q in generator.generate(topic, 20):
+            wrong_letter = next(letter for letter, _ in q['options'] if letter != q['correct'])
+            assert 'marked option disagrees with computed answer' in verifier.verify_question(
+                dict(q, correct=wrong_letter)), q
+            answer = dict(q['options'])[q['correct']]
+            assert 'distractor equals computed answer' in verifier.verify_question(
+                dict(q, options=q['options'] + [('F', answer)])), q
+            if verifier.solvers[topic].explanation_values(q) is not None:
+                # The explanation states the answer last; swap in the wrong option
+                head, _, tail = q['explanation'].rpartition(answer)
+                wrong = dict(q, explanation=head + dict(q['options'])[wrong_letter] + tail)
+                assert 'explanation disagrees with computed answer' in verifier.verify_question(wrong), q
+    print("[OK] Wrong answers flagged on every topic")
+
+def test_verification_throughput():
+    """A million questions verify within the budget"""
+    # A fresh interpreter, so the collector doesn't also scan what earlier tests left behind
+    code = "import json, answer_verifier; print(json.dumps(answer_verifier.benchmark(200000)))"
+    result = json.loads(subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                       check=True).stdout)
+    million = 1000000 / result['rate']
+    print(f"[OK] {result['rate']:,.0f} questions/s, a million in {million:.1f} s")
+    assert result['flagged'] == 0
+    assert million < MILLION_BUDGET_SECONDS
+
+def test_unknown_topic_unverified():
+    """Topics without a solver are reported as unverified, not flagged"""
+    verifier = AnswerVerifier()
+    report = verifier.verify_batch([{'question': 'What is 2 + 2?', 'topic': 'Mental Arithmetic',
+                                     'options': [('A', '4')], 'correct': 'A'}])
+    assert report['summary']['unverified'] == 1
+    assert report['summary']['flagged'] == 0
+    print("[OK] Unknown topics are left unverified")
+
+if __name__ == "__main__":
+    test_generated_questions_verify()
+    test_wrong_answers_flagged()
+    test_every_topic_verifies()
+    test_wrong_batch_answers_flagged()
+    test_verification_throughput()
+    test_unknown_topic_unverified()
+    print("ALL ANSWER VERIFICATION TESTS PASSED! [SUCCESS]")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized batch generators
+"""
+
+import json
+import math
+import re
+import statistics
+import subprocess
+import sys
+from fractions import Fraction
+
+from answer_verifier import AnswerVerifier
+from batch_generators import BatchQuestionGenerator
+from question_generator import MathQuestionGenerator
+
+# On the per-question path's own topics the batch path must be 10x faster.
+# Over every topic it is held to 5x: text-heavy topics such as statistics
+# and coordinate geometry still build each question's dict, options and
+# strings in Python, about 3 µs a question.
+MIN_SPEEDUP = 10
+MIN_MIXED_SPEEDUP = 5
+
+def numbers(text):
+    return [int(n) for n in re.findall(r'-?\d+', text)]
+
+def expected_answer(q):
+    """Solve a generated question from its text alone"""
+    text = q['question']
+    if q['topic'] == "Probability (Basic, Compound Events)":
+        red, blue, green = numbers(text)[:3]
+        total = red + blue + green
+        p = Fraction(red, total) * Fraction(blue, total) if 'second is blue' in text else Fraction(red, total)
+        return str(p)
+    if q['topic'] == "Mean, Median, Mode, & Range":
+        data = numbers(text.split(':')[1].split('.')[0])
+        if 'mean' in text:
+            value = round(statistics.mean(data), 1)
+        elif 'median' in text:
+            value = statistics.median(data)
+        elif 'mode' in text:
+            value = statistics.mode(data)
+        else:
+            value = max(data) - min(data)
+        return f"{value:g}"
+    if q['topic'] == "Area & Volume":
+        values = numbers(text)
+        if 'triangular' in text:
+            return str(values[0] * values[1] // 2)
+        return str(math.prod(values))
+    if q['topic'] == "Coordinate Geometry":
+        x1, y1, x2, y2 = numbers(text)
+        if 'midpoint' in text:
+            assert (x1, y1) != (x2, y2), text
+            return f"({(x1 + x2) // 2}, {(y1 + y2) // 2})"
+        return f"{math.hypot(x2 - x1, y2 - y1):g}"
+    if q['topic'] == "Fractions, Decimals, & Percents":
+        if 'as a fraction' in text:
+            value = Fraction(re.search(r'\d*\.\d+', text).group())
+            return f"{value.numerator}/{value.denominator}"
+        a, b = numbers(text)
+        if 'as a decimal' in text:
+            assert math.gcd(a, b) == 1
+            return f"{a / b:g}"
+        return f"{a * 100 // b}%" if 'as a percent' in text else str(a * b // 100)
+    if q['topic'] == "Basic Number Theory":
+        a, b = numbers(text)
+        return str(math.gcd(a, b) if 'greatest common factor' in text else math.lcm(a, b))
+    return None
+
+def test_every_topic_generates():
+    """Every curriculum topic yields well-formed questions"""
+    generator = BatchQuestionGenerator(seed=7)
+    formatter = MathQuestionGenerator()
+    curriculum_topics = [t for units in MathQuestionGenerator.CURRICULUM.values()
+                         for topics in units.values() for t in topics]
+    assert sorted(generator.TOPIC_GENERATORS) == sorted(curriculum_topics)
+
+    for topic in curriculum_topics:
+        questions = generator.generate(topic, 300)
+        assert len(questions) == 300
+        for q in questions:
+            assert q['topic'] == topic
+            assert [letter for letter, _ in q['options']] == ['A', 'B', 'C', 'D', 'E']
+            assert len({text for _, text in q['options']}) == 5, q['options']
+            assert q['correct'] in 'ABCDE'
+            assert q['difficulty'] in ('easy', 'moderate', 'hard')
+        assert '@question' in formatter.format_question(questions[0], 1)
+        print(f"[OK] {topic}: {len(questions)} questions")
+
+def test_answers_are_correct():
+    """Marked answers match an independent solve of the question text"""
+    generator = BatchQuestionGenerator(seed=11)
+    for topic in generator.TOPIC_GENERATORS:
+        for q in generator.generate(topic, 500):
+            expected = expected_answer(q)
+            if expected is None:
+                continue
+            options = dict(q['options'])
+            assert options[q['correct']] == expected, (q['question'], q['options'], q['correct'])
+            assert list(options.values()).count(expected) == 1
+    print("[OK] Answers match independent solutions")
+
+def test_existing_topics_verify():
+    """Batch counting and solid figure questions pass the answer verifier"""
+    questions = BatchQuestionGenerator(seed=3).generate_mixed(
+        400, topics=list(MathQuestionGenerator.TOPIC_GENERATORS))
+    report = AnswerVerifier().verify_batch(questions)
+    assert report['summary']['verified'] == 400
+    assert report['summary']['flagged'] == 0, report['flagged_questions'][:3]
+    print("[OK] Batch questions pass answer verification")
+
+def test_options_and_reproducibility():
+    """Seeds reproduce batches; difficulties and LaTeX settings are honored"""
+    topic = "Basic Number Theory"
+    assert BatchQuestionGenerator(seed=5).generate(topic, 50) == BatchQuestionGenerator(seed=5).generate(topic, 50)
+
+    generator = BatchQuestionGenerator(latex_support=False, seed=1)
+    questions = generator.generate("Coordinate Geometry", 3, difficulties=['hard', 'easy', 'hard'])
+    assert [q['difficulty'] for q in questions] == ['hard', 'easy', 'hard']
+    assert all(q['latex_formula'] is None for q in questions)
+
+    mixed = generator.generate_mixed(20)
+    assert len(mixed) == 20
+    assert len({q['topic'] for q in mixed}) == 8
+    assert generator.generate("Area & Volume", 0) == []
+    print("[OK] Seeds, difficulties and LaTeX options honored")
+
+def test_batch_throughput():
+    """Batch generation beats the per-question path, on the same topics and on every topic"""
+    # A fresh interpreter, so the collector doesn't also scan what earlier tests left behind
+    code = "import json, batch_generators; print(json.dumps(batch_generators.benchmark(20000, repeat=3)))"
+    result = json.loads(subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                       check=True).stdout)
+    per_question, same_topics, mixed = (result['per_question_rate'], result['same_topics_rate'],
+                                        result['mixed_rate'])
+    print(f"[OK] {per_question:,.0f}/s per question, {same_topics:,.0f}/s batched on the same topics "
+          f"({same_topics / per_question:.1f}x), {mixed:,.0f}/s over every topic ({mixed / per_question:.1f}x)")
+    assert same_topics > MIN_SPEEDUP * per_question
+    assert mixed > MIN_MIXED_SPEEDUP * per_question
+
+if __name__ == "__main__":
+    test_every_topic_generates()
+    test_answers_are_correct()
+    test_existing_topics_verify()
+    test_options_and_reproducibility()
+    test_batch_throughput()
+    print("ALL BATCH GENERATOR TESTS PASSED! [SUCCESS]")
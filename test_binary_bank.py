@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the memory-mapped binary question bank
+"""
+
+import os
+import tempfile
+
+from question_generator import MathQuestionGenerator
+import binary_bank
+from binary_bank import BinaryBank, append_bank, read_bank, write_bank
+from question_bank import load_questions, save_questions
+
+def _bank(count):
+    generator = MathQuestionGenerator()
+    return [generator.generate_counting_question() if i % 2 == 0 else generator.generate_geometry_question()
+            for i in range(count)]
+
+def test_round_trip_and_append():
+    """Bulk writes and appends read back as the original dicts"""
+    questions = _bank(12)
+    questions.append({'question': 'Custom?', 'table': '', 'options': [('A', '1')], 'correct': 'A',
+                      'explanation': 'Because.', 'subject': 'Custom Subject', 'unit': 'Custom Unit',
+                      'topic': 'Custom Topic', 'difficulty': 'expert', 'tags': ['manual']})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bank.mqb')
+        write_bank(questions[:4], path)
+        reader = BinaryBank(path)
+        append_bank(questions[4:6], path)   # grows the capacity
+        append_bank(questions[6:7], path)   # fits in place
+        append_bank(questions[7:], path)
+        assert len(reader) == 4 and reader[3] == questions[3]
+        reader.close()
+
+        restored = read_bank(path)
+        assert restored == questions
+        assert [list(q) for q in restored] == [list(q) for q in questions]
+        print(f"[OK] {len(restored)} questions round-trip through bulk appends")
+
+        save_questions(questions, path)
+        assert load_questions(path) == questions
+        print("[OK] question_bank reads and writes .mqb files")
+
+def test_latex_off_round_trip():
+    """Questions generated without LaTeX keep latex_formula None"""
+    from batch_generators import BatchQuestionGenerator
+
+    generator = MathQuestionGenerator(latex_support=False)
+    questions = [generator.generate_counting_question(), generator.generate_geometry_question()]
+    questions += BatchQuestionGenerator(latex_support=False, seed=1).generate_mixed(20)
+    questions.append(dict(questions[0], latex_formula=''))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bank.mqb')
+        write_bank(questions[:10], path)
+        append_bank(questions[10:], path)
+        assert read_bank(path) == questions
+        with BinaryBank(path) as bank:
+            assert bank.text(0, 'latex_formula') is None
+            assert bank.text(len(questions) - 1, 'latex_formula') == ''
+    print(f"[OK] {len(questions)} LaTeX-free questions round-trip")
+
+def test_interrupted_append():
+    """A crash at either header write leaves a readable bank; a retry completes it"""
+    questions = _bank(8)
+    for crash_at in (1, 2):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bank.mqb')
+            write_bank(questions[:3], path, capacity=10)
+            reader = BinaryBank(path)
+
+            original = binary_bank._write_header
+            calls = []
+
+            def crashing_write_header(*args):
+                calls.append(args)
+                if len(calls) == crash_at:
+                    raise OSError("simulated crash")
+                original(*args)
+
+            binary_bank._write_header = crashing_write_header
+            try:
+                append_bank(questions[3:6], path)
+                assert False, "append should have crashed"
+            except OSError:
+                pass
+            finally:
+                binary_bank._write_header = original
+
+            assert reader.questions() == questions[:3]
+            assert read_bank(path) == questions[:3]
+            append_bank(questions[3:], path)
+            assert reader.questions() == questions[:3]
+            assert read_bank(path) == questions
+            reader.close()
+    print("[OK] Interrupted appends leave the bank readable and unchanged")
+
+def test_close_with_views_held():
+    """Closing a bank while callers hold column or heap views is safe"""
+    questions = _bank(4)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bank.mqb')
+        write_bank(questions, path)
+        bank = BinaryBank(path)
+        difficulties = bank.difficulty_codes
+        text = bank.raw(1, 'question')
+        bank.close()
+        assert str(text, 'utf-8') == questions[1]['question']
+        assert len(difficulties) == 4
+        del difficulties, text
+    print("[OK] Views outlive close()")
+
+def test_random_access_and_filters():
+    """Single questions, fields and column filters come straight from the mapping"""
+    questions = _bank(40)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bank.mqb')
+        write_bank(questions, path)
+        with BinaryBank(path) as bank:
+            assert bank[17] == questions[17]
+            assert bank[-1] == questions[-1]
+            assert bank.text(0, 'question') == questions[0]['question']
+            assert bytes(bank.raw(1, 'explanation')) == questions[1]['explanation'].encode('utf-8')
+            assert bank.text(1, 'table') is None
+
+            topic = 'Solid Figures (Volume of Cubes)'
+            expected = [i for i, q in enumerate(questions) if q['topic'] == topic and q['correct'] == 'B']
+            assert bank.select(topic=topic, correct='B').tolist() == expected
+            assert len(bank.select(difficulty='impossible')) == 0
+            print(f"[OK] Random access and filters match, {len(expected)} questions selected")
+
+if __name__ == "__main__":
+    print("[TEST] Binary Question Bank")
+    test_round_trip_and_append()
+    test_latex_off_round_trip()
+    test_interrupted_append()
+    test_close_with_views_held()
+    test_random_access_and_filters()
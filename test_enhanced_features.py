@@ -6,6 +6,7 @@ Test script for enhanced features
 from question_generator import MathQuestionGenerator
 from question_analytics import QuestionAnalytics, generate_analytics_report
 from similarity_checker import QuestionSimilarityChecker
+import conftest  # shared test setup: importing the app doesn't warm the formula cache
 import json
 
 def test_enhanced_generator():
@@ -89,6 +90,67 @@ def test_similarity_checker():
     
     print("[PASS] Similarity checker tests passed!\n")
 
+def test_similarity_screening():
+    """Test threshold-aware similarity screening against full scoring"""
+    print("[TEST] Testing Similarity Screening...")
+    
+    checker = QuestionSimilarityChecker()
+    generator = MathQuestionGenerator()
+    questions = [generator.generate_counting_question() if i % 2 == 0 else generator.generate_geometry_question()
+                 for i in range(20)]
+    
+    full = checker.batch_similarity_check(questions)
+    screened = checker.screen_similarity(questions, threshold=0.6)
+    
+    expected = sorted(r['question_pair'] for r in full['individual_comparisons'] if r['overall_similarity'] >= 0.6)
+    flagged = sorted(r['question_pair'] for r in screened['flagged_pairs'])
+    assert flagged == expected
+    assert screened['summary']['total_comparisons'] == full['summary']['total_comparisons']
+    print(f"[OK] Same {len(flagged)} pairs flagged, pruned: {screened['summary']['pruned']}")
+    
+    # Unrelated questions are pruned before the cosine step
+    unrelated = {'question': 'Find the prime factors of 84.', 'options': []}
+    result = checker.detect_similarity(questions[0], unrelated, threshold=0.6)
+    assert result['pruned'] and result['pruned_at'] in ('size_bound', 'jaccard_bound')
+    # A pruned score is an upper bound that stays below the threshold
+    full_score = checker.detect_similarity(questions[0], unrelated)['overall_similarity']
+    assert full_score <= result['overall_similarity'] < 0.6
+    assert checker.detect_similarity(questions[0], questions[0], threshold=0.6)['pruned'] is False
+    print(f"[OK] Dissimilar pair pruned at: {result['pruned_at']}")
+    
+    print("[PASS] Similarity screening tests passed!\n")
+
+def test_find_similar():
+    """Test indexed nearest-neighbour search against pairwise scoring"""
+    print("[TEST] Testing Nearest-Neighbour Search...")
+    
+    checker = QuestionSimilarityChecker()
+    generator = MathQuestionGenerator()
+    bank = [generator.generate_counting_question() if i % 2 == 0 else generator.generate_geometry_question()
+            for i in range(60)]
+    checker.build_index(bank)
+    
+    # Geometry queries have no table; counting queries do
+    for query in (generator.generate_geometry_question(), generator.generate_counting_question()):
+        matches = checker.find_similar(query, k=5)
+        expected = sorted(range(len(bank)), key=lambda i: (-checker.detect_similarity(query, bank[i])['overall_similarity'], i))[:5]
+        assert [m['index'] for m in matches] == expected
+        for match in matches:
+            full = checker.detect_similarity(query, bank[match['index']])
+            assert all(match[key] == value for key, value in full.items())
+        
+        profiles, _, _, structural, overall = checker.index.score(checker, query)
+        for profile, structural_sim, overall_sim in zip(profiles, structural, overall):
+            pair = checker.detect_similarity(query, bank[checker.index.members(profile)[0]])
+            assert structural_sim == pair['structural_similarity']
+            assert abs(overall_sim - pair['overall_similarity']) < 1e-12
+        print(f"[OK] Top match {matches[0]['overall_similarity']*100:.1f}% similar, same scores and ranking as pairwise scoring")
+    
+    assert checker.find_similar({'question': 'Zebra xylophone quartz.'}, k=5) == []
+    print("[OK] Query sharing no tokens has no matches")
+    
+    print("[PASS] Nearest-neighbour search tests passed!\n")
+
 def test_web_interface_components():
     """Test web interface components"""
     print("[TEST] Testing Web Interface Components...")
@@ -140,6 +202,8 @@ def run_comprehensive_test():
     test_enhanced_generator()
     test_analytics_system()
     test_similarity_checker()
+    test_similarity_screening()
+    test_find_similar()
     test_web_interface_components()
     test_document_generation()
     
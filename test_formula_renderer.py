@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for server-side formula rendering and its cache
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from formula_renderer import FORMATS, FormulaCache, formula_key, known_formulas, to_mathtext
+from question_generator import MathQuestionGenerator
+from conftest import web_app_charts
+
+def test_formula_key():
+    """Keys depend only on the formula content"""
+    formula = MathQuestionGenerator.LATEX_FORMULAS['combination']
+    assert formula_key(formula) == formula_key(str(formula))
+    assert formula_key(formula) != formula_key(formula + ' ')
+    assert to_mathtext(r'\frac{\text{total outcomes}}{n}') == r'\frac{\mathrm{total\ outcomes}}{n}'
+    print("[OK] Formula keys are content hashes")
+
+def test_warm_and_reuse():
+    """Warming renders every known formula once; later lookups reuse the files"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FormulaCache(tmp)
+        result = cache.warm()
+        assert result['failed'] == []
+        assert result['rendered'] == len(known_formulas())
+        formula = MathQuestionGenerator.LATEX_FORMULAS['volume_sphere']
+        key = formula_key(formula)
+        with open(cache.cached(key, 'svg'), 'rb') as f:
+            assert b'<svg' in f.read()
+        with open(cache.image(formula, 'png'), 'rb') as f:
+            assert f.read(4) == b'\x89PNG'
+
+        mtime = os.path.getmtime(cache.path(key, 'png'))
+        assert FormulaCache(tmp).render(formula) == key
+        assert os.path.getmtime(cache.path(key, 'png')) == mtime
+    print(f"[OK] {result['rendered']} formulas rendered and reused")
+
+def test_unrenderable_formula():
+    """Formulas mathtext can't parse fall back to None instead of raising"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FormulaCache(tmp)
+        assert cache.image(r'\frac{1}{') is None
+        assert cache.urls([r'\frac{1}{', None, '']) == {}
+        assert formula_key(r'\frac{1}{') in cache.failed
+    print("[OK] Unrenderable formulas fall back to raw LaTeX")
+
+def test_failures_bounded():
+    """Only the latest max_failures unrenderable formulas are remembered"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FormulaCache(tmp, max_failures=2)
+        bad = [r'\frac{%d}{' % i for i in range(3)]
+        for latex in bad:
+            assert cache.render(latex) is None
+        assert list(cache.failed) == [formula_key(latex) for latex in bad[1:]]
+    print("[OK] Failure map keeps the latest max_failures entries")
+
+def test_web_serves_formulas(web_app):
+    """Requests only link cached formula images, never rendering them"""
+    web_interface, app = web_app, web_app.app
+    with tempfile.TemporaryDirectory() as tmp:
+        original, warming = web_interface.formulas, web_interface.formula_warming
+        web_interface.formulas = FormulaCache(tmp)
+        web_interface.formula_warming = None
+        try:
+            client = app.test_client()
+            # A cold cache links nothing and renders nothing; the UI falls back to MathJax
+            data = client.post('/generate', json={'count': 2, 'paginate': True}).get_json()
+            assert data['page']['formulas'] == {}
+            assert os.listdir(tmp) == []
+
+            web_interface.start_formula_warming().join()
+            assert web_interface.formulas.failed == {}
+
+            page = client.post('/generate', json={'count': 2, 'paginate': True}).get_json()['page']
+            formula = page['questions'][0]['latex_formula']
+            url = page['formulas'][formula]
+            image = client.get(url)
+            assert image.status_code == 200 and image.mimetype == 'image/svg+xml'
+            assert client.get('/formulas/' + '0' * 64 + '.svg').status_code == 404
+            assert client.get(url.replace('.svg', '.gif')).status_code == 404
+        finally:
+            web_interface.formulas, web_interface.formula_warming = original, warming
+    print("[OK] Warmed formula images served by the web UI")
+
+def test_web_warms_at_startup():
+    """Importing the app starts warming unless FORMULA_WARMING=0"""
+    check = ("import web_interface as w\n"
+             "if w.formula_warming: w.formula_warming.join()\n"
+             "print(w.formula_warming is not None, len(w.formulas.failed))")
+    with tempfile.TemporaryDirectory() as tmp:
+        for flag, expected in (('1', 'True 0'), ('0', 'False 0')):
+            env = dict(os.environ, FORMULA_WARMING=flag, FORMULA_CACHE_DIR=tmp)
+            result = subprocess.run([sys.executable, '-c', check], env=env, capture_output=True, text=True,
+                                    cwd=os.path.dirname(os.path.abspath(__file__)))
+            if 'ImportError' in result.stderr or 'ModuleNotFoundError' in result.stderr:
+                print(f"[WARNING] Web interface import failed: {result.stderr.strip().splitlines()[-1]}")
+                return
+            assert result.stdout.strip().splitlines()[-1] == expected, result.stderr
+        assert len(os.listdir(tmp)) == len(FORMATS) * len(known_formulas())
+    print("[OK] Formula cache warmed in the background at startup")
+
+if __name__ == "__main__":
+    test_formula_key()
+    test_warm_and_reuse()
+    test_unrenderable_formula()
+    test_failures_bounded()
+    with web_app_charts() as web_interface:
+        test_web_serves_formulas(web_interface)
+    test_web_warms_at_startup()
+    print("ALL FORMULA RENDERER TESTS PASSED! [SUCCESS]")
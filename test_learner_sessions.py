@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for per-learner adaptive sessions
+"""
+
+import threading
+import time
+
+from question_generator import MathQuestionGenerator
+from learner_sessions import SessionStore
+from conftest import web_app_charts
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_history_is_bounded():
+    """Generated questions should feed a bounded difficulty history"""
+    generator = MathQuestionGenerator(history_size=5)
+    difficulties = [generator.generate_counting_question()['difficulty'] for _ in range(20)]
+    assert len(generator.question_history) == 5
+    assert list(generator.question_history) == difficulties[-5:]
+    print(f"[OK] History holds the last {len(generator.question_history)} difficulties")
+
+def test_adaptive_history_takes_effect():
+    """Two easy questions in a row should never be followed by another easy one"""
+    generator = MathQuestionGenerator()
+    generator.question_history.extend(['hard', 'easy', 'easy'])
+    for _ in range(20):
+        assert generator.adaptive_difficulty() in ('moderate', 'hard')
+    print("[OK] Adaptive difficulty reads the recorded history")
+
+def test_session_store_lru_and_ttl():
+    """Sessions are evicted when the store is full or they expire"""
+    clock = FakeClock()
+    store = SessionStore(max_sessions=2, ttl_seconds=60, clock=clock)
+
+    first = store.get_or_create('learner-1')
+    first.generator.generate_counting_question()
+    store.get_or_create('learner-2')
+    assert store.get_or_create('learner-1') is first
+    assert len(first.generator.question_history) == 1
+
+    store.get_or_create('learner-3')
+    assert store.get('learner-2') is None
+    assert store.get('learner-1') is first
+    print("[OK] Least recently used session evicted")
+
+    clock.now = 61
+    assert store.get('learner-1') is None
+    stats = store.stats()
+    assert stats['active_sessions'] == 0
+    assert stats['evicted_lru'] == 1 and stats['evicted_ttl'] == 2
+    print("[OK] Expired sessions evicted")
+
+def test_concurrent_requests_take_turns():
+    """Requests for the same learner never use its generator at the same time"""
+    store = SessionStore()
+    session_id = store.get_or_create().session_id
+    active = []
+    overlaps = []
+
+    def request(latex):
+        session = store.get_or_create(session_id)
+        with session.generating(latex_support=latex) as generator:
+            active.append(1)
+            overlaps.append(len(active))
+            time.sleep(0.005)
+            for _ in range(10):
+                q = generator.generate_counting_question()
+                assert (q['latex_formula'] is not None) == latex
+            active.pop()
+
+    threads = [threading.Thread(target=request, args=(i % 2 == 0,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(overlaps) == 1
+    assert len(store.get(session_id).generator.question_history) == 10
+    print("[OK] Concurrent requests for one session are serialized")
+
+def test_web_session_endpoint(web_app):
+    """The /generate endpoint keeps history for a session ID"""
+    client = web_app.app.test_client()
+    data = client.post('/generate', json={'count': 2, 'session_id': None}).get_json()
+    assert data['success'] and data['session_id']
+    session_id = data['session_id']
+    client.post('/generate', json={'count': 3, 'session_id': session_id})
+    assert len(web_app.sessions.get(session_id).generator.question_history) == 5
+    print("[OK] Web session keeps adaptive history across requests")
+
+if __name__ == "__main__":
+    test_history_is_bounded()
+    test_adaptive_history_takes_effect()
+    test_session_store_lru_and_ttl()
+    test_concurrent_requests_take_turns()
+    with web_app_charts() as web_interface:
+        test_web_session_endpoint(web_interface)
+    print("ALL LEARNER SESSION TESTS PASSED! [SUCCESS]")
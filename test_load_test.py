@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test script for the load-testing harness
+"""
+
+from conftest import web_app_charts
+from load_test import percentile, run_load_test, start_local_server, stop_local_server
+
+def test_percentile():
+    """Nearest-rank percentiles of a sorted sample"""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 95) == 0.0
+    print("[OK] Percentiles computed")
+
+def test_closed_loop_run(web_app):
+    """A short run against the in-process server reports latency and no errors"""
+    profiles = [
+        {'name': 'small', 'weight': 3, 'method': 'POST', 'path': '/generate',
+         'json': {'count': 2, 'difficulty': 'adaptive', 'latex': True}},
+        {'name': 'txt', 'weight': 1, 'method': 'GET', 'path': '/download/txt'}
+    ]
+    server, base_url = start_local_server()
+    try:
+        report = run_load_test(base_url, concurrency=2, duration=1, profiles=profiles, seed=1)
+    finally:
+        stop_local_server(server)
+
+    assert report['requests'] > 0
+    assert report['error_rate'] == 0.0
+    assert report['mode'] == {'type': 'closed_loop', 'concurrency': 2}
+    latency = report['latency_ms']
+    assert 0 < latency['p50'] <= latency['p95'] <= latency['p99'] <= latency['max']
+    assert set(report['per_profile']) <= {'small', 'txt'}
+    print(f"[OK] {report['requests']} requests, p95 {latency['p95']:.1f} ms")
+
+if __name__ == "__main__":
+    print("[TEST] Load Test Harness")
+    test_percentile()
+    with web_app_charts() as web_interface:
+        test_closed_loop_run(web_interface)
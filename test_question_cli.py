@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the command-line tool and its startup budget
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from question_cli import main
+from question_bank import load_questions
+from question_generator import MathQuestionGenerator
+
+HEAVY_MODULES = ('docx', 'numpy', 'matplotlib', 'flask')
+
+# Extra wall time the CLI may add on top of a bare interpreter start
+STARTUP_BUDGET_SECONDS = 0.25
+
+def test_generate_and_analyze():
+    """Generate a bank, then analyze, similarity-check and verify it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = os.path.join(tmp, 'bank.jsonl')
+        assert main(['generate', '-n', '6', '-o', bank, '--seed', '1']) == 0
+        questions = load_questions(bank)
+        assert len(questions) == 6
+        assert isinstance(questions[0]['options'][0], tuple)
+
+        report = os.path.join(tmp, 'report.json')
+        cache = os.path.join(tmp, 'analysis_cache.sqlite')
+        assert main(['analyze', bank, '-o', report, '--cache', cache]) == 0
+        assert os.path.exists(report) and os.path.exists(cache)
+        assert main(['analyze', bank, '--no-cache']) == 0
+        assert main(['similarity', bank]) == 0
+        assert main(['verify', bank]) == 0
+
+        text = os.path.join(tmp, 'bank.txt')
+        assert main(['generate', '-n', '2', '-o', text]) == 0
+        with open(text, encoding='utf-8') as f:
+            assert '@@option' in f.read()
+    print("[OK] CLI subcommands run end to end")
+
+def test_seeded_generate_is_local():
+    """--seed reproduces a bank without reseeding the global RNG"""
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = os.path.join(tmp, 'first.jsonl'), os.path.join(tmp, 'second.jsonl')
+        state = random.getstate()
+        assert main(['generate', '-n', '6', '-o', first, '--seed', '4']) == 0
+        assert random.getstate() == state
+        assert main(['generate', '-n', '6', '-o', second, '--seed', '4']) == 0
+        assert load_questions(first) == load_questions(second)
+    print("[OK] --seed uses a generator-local RNG")
+
+def test_batch_generate_difficulties():
+    """--batch follows the adaptive difficulty sequence unless --no-adaptive is given"""
+    from batch_generators import BatchQuestionGenerator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = os.path.join(tmp, 'bank.jsonl')
+        assert main(['generate', '-n', '40', '-o', bank, '--seed', '3', '--batch']) == 0
+        pacer = MathQuestionGenerator(rng=random.Random(3))
+        assert [q['difficulty'] for q in load_questions(bank)] == [pacer.next_difficulty() for _ in range(40)]
+
+        assert main(['generate', '-n', '40', '-o', bank, '--seed', '3', '--batch', '--no-adaptive']) == 0
+        expected = BatchQuestionGenerator(seed=3).generate_mixed(40)
+        assert [q['difficulty'] for q in load_questions(bank)] == [q['difficulty'] for q in expected]
+    print("[OK] --batch honors --no-adaptive")
+
+def test_generate_binary_without_latex():
+    """--no-latex banks write to .mqb on both generation paths"""
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = os.path.join(tmp, 'bank.mqb')
+        for batch in ([], ['--batch']):
+            assert main(['generate', '-n', '6', '-o', bank, '--seed', '2', '--no-latex'] + batch) == 0
+            assert [q['latex_formula'] for q in load_questions(bank)] == [None] * 6
+    print("[OK] --no-latex questions saved as .mqb")
+
+def test_heavy_imports_are_lazy():
+    """Startup, generate and similarity must not import heavy dependencies"""
+    code = ("import sys, question_cli; "
+            "question_cli.main(['generate', '-n', '2', '-o', sys.argv[1]]); "
+            "question_cli.main(['similarity', sys.argv[1]]); "
+            f"print('loaded=' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run([sys.executable, '-c', code, os.path.join(tmp, 'bank.json')],
+                                capture_output=True, text=True, check=True)
+    loaded = result.stdout.strip().splitlines()[-1][len('loaded='):]
+    assert loaded == '', f"Heavy modules imported: {loaded}"
+    print("[OK] No heavy modules imported by generate or similarity")
+
+def test_startup_time_budget():
+    """`python -m question_cli --help` should start nearly as fast as bare Python"""
+    def best_of(cmd, runs=5):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(cmd, capture_output=True, check=True)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    baseline = best_of([sys.executable, '-c', 'pass'])
+    cli = best_of([sys.executable, '-m', 'question_cli', '--help'])
+    print(f"[OK] CLI startup overhead: {(cli - baseline)*1000:.0f} ms")
+    assert cli - baseline < STARTUP_BUDGET_SECONDS
+
+if __name__ == "__main__":
+    test_generate_and_analyze()
+    test_seeded_generate_is_local()
+    test_batch_generate_difficulties()
+    test_generate_binary_without_latex()
+    test_heavy_imports_are_lazy()
+    test_startup_time_budget()
+    print("ALL CLI TESTS PASSED! [SUCCESS]")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the staged question pipeline
+"""
+
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from question_generator import MathQuestionGenerator
+from question_analytics import RunningAnalytics, QuestionAnalytics, generate_analytics_report
+from question_pipeline import Pipeline, Stage, generate_batch, run_question_pipeline
+from sharded_generation import question_fingerprint
+
+def test_pipeline_exports_unique_questions():
+    """Every generated question is exported once or dropped as a duplicate"""
+    with tempfile.TemporaryDirectory() as tmp:
+        stats = run_question_pipeline(300, tmp, batch_size=40, workers=2, use_processes=False)
+        assert stats['exported'] + stats['duplicates_dropped'] == 300
+        with open(stats['outputs']['bank'], encoding='utf-8') as f:
+            bank = [json.loads(line) for line in f]
+        assert len(bank) == stats['exported']
+        with open(stats['outputs']['report'], encoding='utf-8') as f:
+            report = json.load(f)
+        assert report['summary']['total_questions'] == stats['exported']
+        assert os.path.getsize(stats['outputs']['text']) > 0
+        assert set(stats['stages']) == {'generate', 'analyze', 'dedupe', 'export'}
+        assert stats['stages']['analyze']['items_in'] == 300
+        assert stats['bottleneck'] in stats['stages']
+    print(f"[OK] {stats['exported']} unique questions exported, bottleneck: {stats['bottleneck']}")
+
+def test_thread_mode_is_reproducible():
+    """Thread workers neither reseed each other nor the host's global RNG"""
+    def exported(tmp):
+        stats = run_question_pipeline(200, tmp, batch_size=20, workers=3, seed=5, use_processes=False)
+        # Which copy of a duplicate survives depends on batch finishing order,
+        # and copies can differ in option order, so compare by content
+        with open(stats['outputs']['bank'], encoding='utf-8') as f:
+            return sorted(question_fingerprint(json.loads(line)) for line in f)
+
+    state = random.getstate()
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        assert exported(first) == exported(second)
+    assert random.getstate() == state
+    assert generate_batch((0, 10, 9, True, True)) == generate_batch((0, 10, 9, True, True))
+    print("[OK] Thread-mode runs are reproducible per seed")
+
+def test_backpressure_bounds_queues():
+    """A slow stage fills its queue and blocks the stage upstream"""
+    def slow_sink(batch):
+        time.sleep(0.01)
+
+    pipeline = Pipeline([Stage('source', lambda n: [n], queue_size=2),
+                         Stage('sink', slow_sink, queue_size=2)], sample_interval=0.002)
+    stats = asyncio.run(pipeline.run(range(30)))
+    sink = stats['stages']['sink']
+    assert sink['items_in'] == 30
+    assert sink['queue']['max_occupancy'] <= 2
+    assert stats['stages']['source']['blocked_on_put_seconds'] > 0
+    assert stats['bottleneck'] == 'sink'
+    print(f"[OK] Sink queue full {sink['queue']['full_fraction']*100:.0f}% of the time, source blocked upstream")
+
+def test_running_analytics_matches_report():
+    """The streaming summary agrees with the batch analytics report"""
+    generator = MathQuestionGenerator()
+    questions = [generator.generate_counting_question() for _ in range(5)] + \
+                [generator.generate_geometry_question() for _ in range(5)]
+    analyses = [QuestionAnalytics().analyze_question_quality(q) for q in questions]
+    running = RunningAnalytics()
+    for q, analysis in zip(questions, analyses):
+        running.add(q, analysis)
+    streamed = running.report()
+    batch = generate_analytics_report(questions, analyses)
+    assert streamed['summary']['difficulty_distribution'] == batch['summary']['difficulty_distribution']
+    for key in ('avg_readability', 'avg_engagement', 'quality_score'):
+        assert abs(streamed['summary'][key] - batch['summary'][key]) < 1e-9
+    assert streamed['recommendations'] == batch['recommendations']
+    print("[OK] Running analytics match the batch report")
+
+if __name__ == "__main__":
+    print("[TEST] Question Pipeline")
+    test_pipeline_exports_unique_questions()
+    test_thread_mode_is_reproducible()
+    test_backpressure_bounds_queues()
+    test_running_analytics_matches_report()
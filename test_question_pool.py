@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the pre-generated warm question pool
+"""
+
+import random
+import time
+
+from conftest import web_app_charts
+from question_generator import MathQuestionGenerator
+from question_pool import QuestionPool
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_draw_serves_from_buffers():
+    """Filled buffers serve a batch with the generator's own difficulty sequence"""
+    pool = QuestionPool(high_water=12)
+    pool.fill()
+    assert pool.stats()['total_depth'] == 12 * len(pool.buffers)
+
+    topics = list(MathQuestionGenerator.TOPIC_GENERATORS)
+    random.seed(7)
+    questions, analyses = pool.draw(MathQuestionGenerator(latex_support=False), [topics[i % 2] for i in range(10)])
+    random.seed(7)
+    reference = MathQuestionGenerator(latex_support=False)
+    expected = [reference.next_difficulty() for _ in range(10)]
+
+    assert [q['difficulty'] for q in questions] == expected
+    assert [q['topic'] for q in questions] == [topics[i % 2] for i in range(10)]
+    assert all(q['latex_formula'] is None for q in questions)
+    assert len(analyses) == 10 and 'readability_score' in analyses[0]
+    stats = pool.stats()
+    assert stats['served'] == 10 and stats['misses'] == 0
+    assert stats['max_refill_lag_seconds'] >= 0
+    print(f"[OK] Served 10 questions from buffers, depth now {stats['total_depth']}")
+
+    empty = QuestionPool(high_water=5)
+    questions, _ = empty.draw(MathQuestionGenerator(), topics)
+    assert len(questions) == 2 and empty.stats()['misses'] == 2
+    print("[OK] Empty buffers fall back to inline generation")
+
+def test_refill_yields_to_foreground():
+    """Background refill waits while foreground work is in progress"""
+    busy = [True]
+    pool = QuestionPool(high_water=4, foreground_busy=lambda: busy[0], throttle_delay=0.01)
+    pool.start()
+    try:
+        assert _wait_for(lambda: pool.stats()['throttled'] >= 3)
+        assert pool.stats()['generated'] == 0
+        busy[0] = False
+        assert _wait_for(lambda: pool.stats()['total_depth'] == 4 * len(pool.buffers))
+        assert pool.stats()['max_refill_lag_seconds'] == 0.0
+    finally:
+        pool.stop()
+    print("[OK] Refill throttled while busy, filled once idle")
+
+def test_web_generate_uses_pool(web_app):
+    """/generate draws from the warm pool and /pool reports it"""
+    client = web_app.app.test_client()
+    assert client.get('/pool').get_json() == {'enabled': False}
+    web_app.warm_pool = QuestionPool(high_water=4)
+    web_app.warm_pool.fill()
+    try:
+        data = client.post('/generate', json={'count': 4, 'difficulty': 'adaptive', 'latex': True}).get_json()
+        assert data['success'] and len(data['questions']) == 4
+        assert len(data['analytics']['individual_analyses']) == 4
+        status = client.get('/pool').get_json()
+        assert status['enabled'] and status['served'] + status['misses'] == 4
+    finally:
+        web_app.warm_pool = None
+    print("[OK] /generate served from the warm pool")
+
+if __name__ == "__main__":
+    print("[TEST] Warm Question Pool")
+    test_draw_serves_from_buffers()
+    test_refill_yields_to_foreground()
+    with web_app_charts() as web_interface:
+        test_web_generate_uses_pool(web_interface)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact question record
+"""
+
+from question_generator import MathQuestionGenerator
+from question_record import QuestionRecord, RecordPool, pack_questions, unpack_questions, benchmark_memory
+from question_analytics import generate_analytics_report
+
+def test_round_trip_lossless():
+    """Records should convert back to exactly the original dicts"""
+    generator = MathQuestionGenerator()
+    questions = [generator.generate_counting_question() for _ in range(5)]
+    questions += [generator.generate_geometry_question() for _ in range(5)]
+    questions.append({'question': 'Custom?', 'options': [('A', '1')], 'correct': 'A',
+                      'explanation': 'Because.', 'subject': 'Custom Subject', 'unit': 'Custom Unit',
+                      'topic': 'Custom Topic', 'difficulty': 'expert', 'tags': ['manual']})
+
+    restored = unpack_questions(pack_questions(questions))
+    for original, copy in zip(questions, restored):
+        assert copy == original
+        assert list(copy) == list(original)
+        assert generator.format_question(copy, 1) == generator.format_question(original, 1)
+    print(f"[OK] {len(questions)} questions round-trip losslessly")
+
+    report = generate_analytics_report(restored)
+    print(f"[OK] Analytics run on restored questions: {report['summary']['total_questions']} questions")
+
+def test_record_fields():
+    """Decoded attributes should match the source dict"""
+    generator = MathQuestionGenerator()
+    q = generator.generate_geometry_question()
+    record = QuestionRecord.from_dict(q, RecordPool())
+    assert record.topic == q['topic']
+    assert record.difficulty == q['difficulty']
+    assert record.options == tuple(q['options'])
+    assert 'table' not in record.to_dict()
+    assert not hasattr(record, '__dict__')
+    print("[OK] Record fields decode correctly")
+
+def test_pools_are_per_bank():
+    """Interning tables belong to one bank and are not shared process-wide"""
+    generator = MathQuestionGenerator()
+    questions = [generator.generate_counting_question() for _ in range(4)]
+    first, second = pack_questions(questions), pack_questions(questions)
+    assert len({id(r.pool) for r in first}) == 1
+    assert first[0].pool is not second[0].pool
+    assert first[0].question is first[0].pool.strings[questions[0]['question']]
+    assert first == second
+    custom = dict(questions[0], topic='Custom Topic', difficulty='expert')
+    pack_questions([custom])
+    assert 'expert' not in first[0].pool.difficulties.codes
+
+    # Records always intern into a pool the caller owns
+    try:
+        QuestionRecord.from_dict(questions[0])
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("from_dict without a pool should fail")
+    print("[OK] Interning pools are scoped to their bank")
+
+def test_memory_benchmark():
+    """Records should use substantially less memory than dicts"""
+    result = benchmark_memory(2000)
+    print(f"[OK] Memory reduction: {result['reduction'] * 100:.1f}%")
+    assert result['record_bytes'] < result['dict_bytes'] / 2
+
+if __name__ == "__main__":
+    test_round_trip_lossless()
+    test_record_fields()
+    test_pools_are_per_bank()
+    test_memory_benchmark()
+    print("ALL QUESTION RECORD TESTS PASSED! [SUCCESS]")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for cursor-paginated result sets
+"""
+
+import gzip
+import json
+
+from question_analytics import QuestionAnalytics, generate_analytics_report
+from question_generator import MathQuestionGenerator
+from result_sets import ResultSetStore, InvalidCursor, decode_cursor, encode_cursor
+from conftest import web_app_charts
+
+def _questions(count):
+    generator = MathQuestionGenerator()
+    return [generator.generate_counting_question() if i % 2 == 0 else generator.generate_geometry_question()
+            for i in range(count)]
+
+def test_pages_cover_result_set():
+    """Following cursors visits every question exactly once"""
+    questions = _questions(23)
+    result_set = ResultSetStore().create(questions)
+
+    seen = []
+    cursor = None
+    while True:
+        page = result_set.page(cursor, 10)
+        seen.extend(page['questions'])
+        assert len(page['analyses']) == len(page['questions'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert seen == questions
+    assert result_set.summary is None
+    print("[OK] Cursors page through all 23 questions; summary not computed")
+
+    summary = result_set.get_summary()
+    assert summary['summary']['total_questions'] == 23
+    assert 'individual_analyses' not in summary
+    print("[OK] Summary computed lazily on request")
+
+def test_summary_reuses_page_analyses():
+    """The summary analyzes only questions no page has analyzed yet"""
+    questions = _questions(12)
+    result_set = ResultSetStore().create(questions)
+    served = result_set.page(None, 5)['analyses']
+
+    calls = []
+    analyze = QuestionAnalytics.analyze_question_quality
+    QuestionAnalytics.analyze_question_quality = lambda self, q: calls.append(q) or analyze(self, q)
+    try:
+        summary = result_set.get_summary()
+    finally:
+        QuestionAnalytics.analyze_question_quality = analyze
+    assert calls == questions[5:]
+    assert result_set.analyses[:5] == served
+    expected = generate_analytics_report(questions, analyses=result_set.analyses)
+    assert summary['summary'] == expected['summary']
+    print("[OK] Summary built from the analyses pages already computed")
+
+def test_cursor_validation():
+    """Cursors round-trip and garbage is rejected"""
+    assert decode_cursor(encode_cursor(40)) == 40
+    assert decode_cursor(None) == 0
+    try:
+        decode_cursor('not-a-cursor')
+        assert False, "invalid cursor accepted"
+    except InvalidCursor:
+        pass
+    print("[OK] Cursor validation works")
+
+def test_expiry():
+    """Result sets are short-lived"""
+    now = [0.0]
+    store = ResultSetStore(ttl_seconds=10, clock=lambda: now[0])
+    handle = store.create(_questions(2)).handle
+    assert store.get(handle) is not None
+    now[0] = 11
+    assert store.get(handle) is None
+    print("[OK] Result sets expire after their TTL")
+
+def test_paginated_endpoints(web_app):
+    """/generate returns a first page; later pages and the summary are separate, gzipped requests"""
+    _check_paginated_endpoints(web_app.app.test_client())
+    print("[OK] Paginated endpoints serve pages, summary and gzip")
+
+def _check_paginated_endpoints(client):
+    data = client.post('/generate', json={'count': 30, 'paginate': True, 'page_size': 12}).get_json()
+    assert data['success'] and data['total'] == 30
+    assert len(data['page']['questions']) == 12 and 'analytics' not in data
+
+    handle = data['result_set']
+    response = client.get(f"/results/{handle}?cursor={data['page']['next_cursor']}&page_size=12",
+                          headers={'Accept-Encoding': 'gzip'})
+    assert response.headers.get('Content-Encoding') == 'gzip'
+    page = json.loads(gzip.decompress(response.data))
+    assert page['offset'] == 12 and len(page['questions']) == 12
+
+    summary = client.get(f"/results/{handle}/summary").get_json()
+    assert summary['analytics']['summary']['total_questions'] == 30
+    assert client.get(f"/results/{handle}?cursor=bogus").status_code == 400
+    assert client.get("/results/unknown").status_code == 404
+
+if __name__ == "__main__":
+    test_pages_cover_result_set()
+    test_summary_reuses_page_analyses()
+    test_cursor_validation()
+    test_expiry()
+    with web_app_charts() as web_interface:
+        test_paginated_endpoints(web_interface)
+    print("ALL RESULT SET TESTS PASSED! [SUCCESS]")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for sharded generation and the deduplicating merge
+"""
+
+import os
+import random
+import tempfile
+
+from question_bank import load_questions
+from question_cli import main
+from question_generator import MathQuestionGenerator
+from sharded_generation import (create_manifest, generate_shard, merge_shards, question_fingerprint,
+                                run_local, shard_status)
+
+COUNTING = "Counting & Arrangement Problems"
+GEOMETRY = "Solid Figures (Volume of Cubes)"
+
+def test_manifest_split():
+    """Shard counts and topic counts should add up to the targets exactly"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = create_manifest(tmp, 1001, {COUNTING: 2, GEOMETRY: 1}, shard_size=300)
+        shards = manifest['shards']
+        assert [s['count'] for s in shards] == [300, 300, 300, 101]
+        assert sum(s['topic_counts'].get(COUNTING, 0) for s in shards) == 667
+        assert sum(s['topic_counts'].get(GEOMETRY, 0) for s in shards) == 334
+    print("[OK] Manifest splits count and topic mix exactly")
+
+def test_merge_deduplicates_and_resumes():
+    """Merging drops duplicate fingerprints and waits for failed shards to be re-run"""
+    with tempfile.TemporaryDirectory() as tmp:
+        create_manifest(tmp, 400, shard_size=100, seed=7)
+        assert run_local(tmp, workers=2)['failed'] == {}
+        first = merge_shards(tmp, os.path.join(tmp, 'bank.jsonl'), chunk_size=50)
+        assert first['input_questions'] == 400
+        assert first['duplicates_dropped'] > 0
+
+        bank = load_questions(os.path.join(tmp, 'bank.jsonl'))
+        fingerprints = [question_fingerprint(q) for q in bank]
+        assert len(bank) == first['unique_questions'] == len(set(fingerprints))
+        print(f"[OK] Merge kept {len(bank)} unique of {first['input_questions']} questions")
+
+        # Simulate a failed shard: the merge refuses to run until it is regenerated
+        os.remove(os.path.join(tmp, 'shard-00002.jsonl'))
+        assert shard_status(tmp)['pending'] == [2]
+        try:
+            merge_shards(tmp, os.path.join(tmp, 'bank.jsonl'))
+            assert False, "merge should refuse incomplete shards"
+        except RuntimeError:
+            pass
+        state = random.getstate()
+        generate_shard(tmp, 2)
+        assert random.getstate() == state, "in-process shards must not reseed the global RNG"
+        second = merge_shards(tmp, os.path.join(tmp, 'bank2.jsonl'), chunk_size=50)
+        assert second == dict(first, output=os.path.join(tmp, 'bank2.jsonl'))
+        print("[OK] Re-running a failed shard reproduces the same merged bank")
+
+def test_failures_leave_no_temp_files():
+    """A shard or merge that raises removes its partial output"""
+    def leftovers(tmp):
+        return [name for name in os.listdir(tmp) if name.endswith('.tmp')]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        create_manifest(tmp, 20, shard_size=10, seed=3)
+        original = MathQuestionGenerator.generate_question
+        calls = []
+
+        def failing(self, topic):
+            calls.append(topic)
+            if len(calls) > 5:
+                raise RuntimeError("generator crashed")
+            return original(self, topic)
+
+        MathQuestionGenerator.generate_question = failing
+        try:
+            generate_shard(tmp, 0)
+            assert False, "a failing generator should fail the shard"
+        except RuntimeError:
+            pass
+        finally:
+            MathQuestionGenerator.generate_question = original
+        assert leftovers(tmp) == [] and shard_status(tmp)['pending'] == [0, 1]
+
+        generate_shard(tmp, 0)
+        generate_shard(tmp, 1)
+        # The output path is a directory, so the final rename fails
+        output = os.path.join(tmp, 'bank.jsonl')
+        os.mkdir(output)
+        try:
+            merge_shards(tmp, output)
+            assert False, "merge into a directory should fail"
+        except OSError:
+            pass
+        assert leftovers(tmp) == []
+    print("[OK] Failed shards and merges leave no temporary files")
+
+def test_cli_sharded_flow():
+    """The CLI drives plan, local run and merge"""
+    with tempfile.TemporaryDirectory() as tmp:
+        assert main(['shard-plan', tmp, '-n', '60', '--shard-size', '25',
+                     '--topic-mix', f'{COUNTING}=1', f'{GEOMETRY}=1']) == 0
+        assert main(['shard-local', tmp, '-w', '1']) == 0
+        assert main(['shard-merge', tmp, '-o', os.path.join(tmp, 'bank.jsonl')]) == 0
+    print("[OK] CLI sharded generation flow works")
+
+if __name__ == "__main__":
+    test_manifest_split()
+    test_merge_deduplicates_and_resumes()
+    test_failures_leave_no_temp_files()
+    test_cli_sharded_flow()
+    print("ALL SHARDED GENERATION TESTS PASSED! [SUCCESS]")
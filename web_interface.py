@@ -1,11 +1,87 @@
 from flask import Flask, render_template, request, jsonify, send_file
+import gzip
 import json
 import os
+import re
+import threading
+from contextlib import nullcontext
 from question_generator import MathQuestionGenerator
 from question_analytics import generate_analytics_report
-from generate_document import create_word_document
+from learner_sessions import SessionStore
+from analytics_charts import ChartRenderer, CHART_NAMES, chart_payload
+from result_sets import ResultSetStore, InvalidCursor
+from admission_control import AdmissionController, RejectedRequest, estimate_cost
+from question_pool import QuestionPool
+from formula_renderer import FORMATS, FormulaCache
 
 app = Flask(__name__)
+app.config.setdefault('RESULT_PAGE_SIZE', 20)
+app.config.setdefault('RESULT_MAX_PAGE_SIZE', 200)
+app.config.setdefault('GZIP_MIN_BYTES', 1024)
+app.config.setdefault('MAX_QUESTION_COUNT', 1000)
+# Questions buffered per (difficulty, latex, topic) by the warm pool; 0 disables it
+app.config.setdefault('WARM_POOL_HIGH_WATER', int(os.environ.get('WARM_POOL_HIGH_WATER', 0)))
+app.config.setdefault('CHART_CACHE_DIR', os.environ.get('CHART_CACHE_DIR', 'chart_cache'))
+app.config.setdefault('FORMULA_CACHE_DIR', os.environ.get('FORMULA_CACHE_DIR', 'formula_cache'))
+# Render every known formula on a background thread at startup; 0 leaves it to formula_renderer
+app.config.setdefault('FORMULA_WARMING', os.environ.get('FORMULA_WARMING', '1') != '0')
+sessions = SessionStore()
+charts = ChartRenderer(app.config['CHART_CACHE_DIR'])
+result_sets = ResultSetStore()
+admission = AdmissionController()
+formulas = FormulaCache(app.config['FORMULA_CACHE_DIR'])
+formula_warming = None
+formula_warming_lock = threading.Lock()
+warm_pool = None
+
+# /generate alternates between these topics
+GENERATE_TOPICS = list(MathQuestionGenerator.TOPIC_GENERATORS)
+
+def start_warm_pool(high_water=None):
+    """Serve /generate from pre-generated buffers, refilled while no requests are running"""
+    global warm_pool
+    if warm_pool is None:
+        warm_pool = QuestionPool(high_water or app.config['WARM_POOL_HIGH_WATER'],
+                                 foreground_busy=lambda: admission.busy())
+        warm_pool.start()
+    return warm_pool
+
+def start_formula_warming():
+    """Pre-render every known formula in the background so requests only hit the cache"""
+    global formula_warming
+    with formula_warming_lock:
+        if formula_warming is None:
+            formula_warming = threading.Thread(target=formulas.warm, name='formula-warming', daemon=True)
+            formula_warming.start()
+    return formula_warming
+
+if app.config['FORMULA_WARMING']:
+    start_formula_warming()
+
+def formula_urls(questions):
+    """Image URL per formula already rendered; the UI falls back to MathJax for the rest"""
+    return formulas.urls(q.get('latex_formula') for q in questions)
+
+@app.errorhandler(RejectedRequest)
+def shed_request(e):
+    response = jsonify({'success': False, 'error': e.reason})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
+def json_response(payload, status=200):
+    """JSON response, gzipped when the client accepts it and it is worth it"""
+    body = app.json.dumps(payload).encode('utf-8')
+    response = app.response_class(body, status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if len(body) >= app.config['GZIP_MIN_BYTES'] and 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response.set_data(gzip.compress(body, compresslevel=5))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def requested_page_size(value):
+    page_size = int(value or app.config['RESULT_PAGE_SIZE'])
+    return max(1, min(page_size, app.config['RESULT_MAX_PAGE_SIZE']))
 
 @app.route('/')
 def index():
@@ -16,46 +92,177 @@ def generate_questions():
     try:
         data = request.json
         count = data.get('count', 2)
-        difficulty = data.get('difficulty', 'adaptive')
-        include_latex = data.get('latex', True)
-        
-        generator = MathQuestionGenerator(
+        if not isinstance(count, int) or not 1 <= count <= app.config['MAX_QUESTION_COUNT']:
+            return jsonify({'success': False,
+                            'error': f"count must be between 1 and {app.config['MAX_QUESTION_COUNT']}"}), 400
+        response, paginated = admission.run('generate', estimate_cost('generate', count),
+                                            build_generate_response, data, count)
+        return json_response(response) if paginated else jsonify(response)
+    except RejectedRequest:
+        raise
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+def build_generate_response(data, count):
+    """Generate a batch and build the /generate response body (runs on the worker pool)
+    
+    Returns the body and whether it is a paginated response.
+    """
+    difficulty = data.get('difficulty', 'adaptive')
+    include_latex = data.get('latex', True)
+    
+    # Learners that send a session ID keep their adaptive history across requests
+    session_id = None
+    if 'session_id' in data:
+        session = sessions.get_or_create(
+            data['session_id'] or None,
             difficulty_adaptive=(difficulty == 'adaptive'),
             latex_support=include_latex
         )
-        
-        questions = []
-        for i in range(count):
-            if i % 2 == 0:
-                q = generator.generate_counting_question()
-            else:
-                q = generator.generate_geometry_question()
-            questions.append(q)
-        
-        # Generate analytics
-        analytics = generate_analytics_report(questions)
-        
-        return jsonify({
+        session_id = session.session_id
+        using_generator = session.generating(difficulty_adaptive=(difficulty == 'adaptive'),
+                                             latex_support=include_latex)
+    else:
+        using_generator = nullcontext(MathQuestionGenerator(
+            difficulty_adaptive=(difficulty == 'adaptive'),
+            latex_support=include_latex
+        ))
+    
+    analyses = None
+    with using_generator as generator:
+        if warm_pool is not None:
+            questions, analyses = warm_pool.draw(generator, [GENERATE_TOPICS[i % 2] for i in range(count)])
+        else:
+            questions = []
+            for i in range(count):
+                if i % 2 == 0:
+                    q = generator.generate_counting_question()
+                else:
+                    q = generator.generate_geometry_question()
+                questions.append(q)
+    
+    # Large batches are held server-side and fetched a page at a time
+    if data.get('paginate'):
+        result_set = result_sets.create(questions, analyses)
+        page = result_set.page(None, requested_page_size(data.get('page_size')))
+        page['formulas'] = formula_urls(page['questions'])
+        response = {
             'success': True,
-            'questions': questions,
-            'analytics': analytics
-        })
-        
+            'result_set': result_set.handle,
+            'total': len(result_set),
+            'page': page,
+            'summary_url': f'/results/{result_set.handle}/summary'
+        }
+        if session_id:
+            response['session_id'] = session_id
+        return response, True
+    
+    # Generate analytics
+    analytics = generate_analytics_report(questions, analyses)
+    
+    response = {
+        'success': True,
+        'questions': questions,
+        'analytics': analytics,
+        'formulas': formula_urls(questions)
+    }
+    
+    # Charts render in the background; the client polls for them
+    try:
+        chart_key = charts.submit(chart_payload(analytics, questions=questions))
+        response['charts'] = {'key': chart_key, 'status_url': f'/charts/{chart_key}'}
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        app.logger.warning(f"Chart rendering unavailable: {e}")
+    if session_id:
+        response['session_id'] = session_id
+    return response, False
+
+@app.route('/results/<handle>')
+def result_page(handle):
+    result_set = result_sets.get(handle)
+    if result_set is None:
+        return json_response({'success': False, 'error': 'Result set expired or not found'}, 404)
+    try:
+        page_size = requested_page_size(request.args.get('page_size'))
+        page = admission.run('page', estimate_cost('page', page_size),
+                             result_set.page, request.args.get('cursor'), page_size)
+    except (InvalidCursor, ValueError) as e:
+        return json_response({'success': False, 'error': str(e)}, 400)
+    return json_response(dict(page, success=True, formulas=formula_urls(page['questions'])))
+
+@app.route('/results/<handle>/summary')
+def result_summary(handle):
+    result_set = result_sets.get(handle)
+    if result_set is None:
+        return json_response({'success': False, 'error': 'Result set expired or not found'}, 404)
+    summary = admission.run('summary', estimate_cost('summary', len(result_set)), result_set.get_summary)
+    response = {'success': True, 'result_set': handle, 'analytics': summary}
+    try:
+        analytics = {'summary': summary['summary'], 'individual_analyses': result_set.analyses}
+        chart_key = charts.submit(chart_payload(analytics, questions=result_set.questions()))
+        response['charts'] = {'key': chart_key, 'status_url': f'/charts/{chart_key}'}
+    except Exception as e:
+        app.logger.warning(f"Chart rendering unavailable: {e}")
+    return json_response(response)
+
+@app.route('/charts/<key>')
+def chart_status(key):
+    if not re.fullmatch(r'[0-9a-f]{64}', key):
+        return jsonify({'error': 'Invalid chart key'}), 404
+    cached = charts.cached_charts(key) or {}
+    return jsonify({
+        'status': charts.status(key),
+        'charts': {name: f'/charts/{key}/{name}.png' for name in cached}
+    })
+
+@app.route('/charts/<key>/<name>.png')
+def chart_image(key, name):
+    if not re.fullmatch(r'[0-9a-f]{64}', key) or name not in CHART_NAMES:
+        return jsonify({'error': 'Invalid chart'}), 404
+    cached = charts.cached_charts(key) or {}
+    if name not in cached:
+        return jsonify({'error': 'Chart not ready'}), 404
+    return send_file(os.path.abspath(cached[name]), mimetype='image/png', max_age=86400)
+
+@app.route('/formulas/<key>.<fmt>')
+def formula_image(key, fmt):
+    if not re.fullmatch(r'[0-9a-f]{64}', key) or fmt not in FORMATS:
+        return jsonify({'error': 'Invalid formula'}), 404
+    path = formulas.cached(key, fmt)
+    if path is None:
+        return jsonify({'error': 'Formula not rendered'}), 404
+    # Keys are content hashes, so an image never changes
+    return send_file(os.path.abspath(path), mimetype='image/svg+xml' if fmt == 'svg' else 'image/png',
+                     max_age=31536000)
 
 @app.route('/download/<format>')
 def download_questions(format):
     try:
         if format == 'docx':
-            create_word_document()
+            # python-docx is only needed here, so keep it off the import path
+            from generate_document import create_word_document
+            admission.run('docx', estimate_cost('docx'), create_word_document)
             return send_file('Generated_Math_Questions.docx', as_attachment=True)
         elif format == 'txt':
             return send_file('questions_formatted.txt', as_attachment=True)
         else:
             return jsonify({'error': 'Invalid format'})
+    except RejectedRequest:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)})
 
+@app.route('/admission')
+def admission_status():
+    return jsonify(admission.stats())
+
+@app.route('/pool')
+def pool_status():
+    if warm_pool is None:
+        return jsonify({'enabled': False})
+    return jsonify(dict(warm_pool.stats(), enabled=True))
+
 if __name__ == '__main__':
+    if app.config['WARM_POOL_HIGH_WATER']:
+        start_warm_pool()
     app.run(debug=True)
\ No newline at end of file